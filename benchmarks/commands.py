@@ -0,0 +1,107 @@
+"""
+Benchmark de comandos do WebDriver por ação de alto nível da Interation.
+
+Executa cada ação contra uma página local e conta quantos comandos
+(round trips HTTP) ela enviou ao driver. Com --baseline, compara com um
+resultado anterior e termina com erro se alguma ação passou a usar mais comandos.
+
+Uso:
+    python -m benchmarks.commands --saida benchmarks/commands.json
+    python -m benchmarks.commands --baseline benchmarks/commands.json
+"""
+import argparse
+import json
+import sys
+from urllib.parse import quote
+
+from driver.driver import Driver
+from iterator.commands import CommandCounter
+from iterator.iteration import Interation
+
+PAGINA = """
+<html><body>
+<input id="campo" name="campo" value="inicial">
+<button id="botao" onclick="this.dataset.clicado = 1">Botão</button>
+<ul>""" + ''.join(f'<li class="item" data-id="{i}"><a href="#{i}">Item {i}</a></li>' for i in range(50)) + """</ul>
+</body></html>
+"""
+
+ACOES = {
+    'find': lambda i: i.find('//*[@id="botao"]'),
+    'find_presence': lambda i: i.find('//*[@id="botao"]', element_is='presence'),
+    'find_all': lambda i: i.find_all('li.item', metodo='css'),
+    'click': lambda i: i.click('//*[@id="botao"]'),
+    'click_js': lambda i: i.click_js('//*[@id="botao"]'),
+    'key': lambda i: i.key('campo', tecla='a', metodo='id'),
+    'write': lambda i: i.write('campo', 'texto', metodo='id'),
+    'fill_form': lambda i: i.fill_form({'campo': 'texto'}, metodo='id'),
+    'get_attribute': lambda i: i.get_attribute('campo', metodo='id'),
+    'get_attributes_50x2': lambda i: i.get_attributes('li.item', ['text', 'data-id'], metodo='css'),
+    'extract_50x2': lambda i: list(i.extract('li.item', {'texto': 'a', 'id': ('.', 'data-id')}, metodo='css')),
+    'find_all_50x2_por_elemento': lambda i: [(e.text, e.get_attribute('data-id')) for e in i.find_all('li.item', metodo='css')],
+}
+
+
+def medir(interacao: Interation):
+    """
+    Conta os comandos enviados por cada ação.
+
+    Args:
+        interacao (Interation): Interação ligada a um navegador.
+
+    Returns:
+        dict: Número de comandos por ação.
+    """
+    resultados = {}
+    for nome, acao in ACOES.items():
+        interacao.load_page('data:text/html;charset=utf-8,' + quote(PAGINA))
+        with CommandCounter(interacao.driver) as contador:
+            acao(interacao)
+        resultados[nome] = contador.total
+    return resultados
+
+
+def comparar(resultados, baseline):
+    """
+    Compara os resultados com um baseline.
+
+    Args:
+        resultados (dict): Comandos por ação medidos agora.
+        baseline (dict): Comandos por ação de referência.
+
+    Returns:
+        list: Ações que passaram a usar mais comandos.
+    """
+    return [nome for nome, total in resultados.items() if nome in baseline and total > baseline[nome]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Conta comandos do WebDriver por ação da Interation.')
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--saida', help='Arquivo JSON onde os resultados serão gravados.')
+    parser.add_argument('--baseline', help='Arquivo JSON de referência para detectar regressões.')
+    args = parser.parse_args()
+
+    interacao = Interation(Driver(browser=args.browser, headless=True).driver)
+    try:
+        resultados = medir(interacao)
+    finally:
+        interacao.quit()
+
+    for nome, total in resultados.items():
+        print(f'{nome:<30} {total:>4} comandos')
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as file:
+            json.dump(resultados, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressoes = comparar(resultados, json.load(file))
+        if regressoes:
+            print(f"Regressões: {', '.join(regressoes)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
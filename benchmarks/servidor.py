@@ -0,0 +1,109 @@
+"""
+Servidor HTTP local com as páginas de fixture dos benchmarks.
+
+Roda em uma thread do próprio processo, numa porta livre, e serve:
+    /tabela?linhas=N      tabela grande gerada no servidor
+    /formulario?campos=N  formulário com muitos campos de tipos variados
+    /atraso?ms=N          resposta lenta (usada pelos widgets de lento.html)
+    /scroll.html          lista com scroll infinito
+    /lento.html           widgets que aparecem com atraso
+"""
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def pagina_tabela(linhas=2000, colunas=8):
+    celulas = ''.join(f'<th>Coluna {c}</th>' for c in range(colunas))
+    corpo = ''.join(
+        f'<tr class="linha" data-id="{i}">' + ''.join(f'<td>{i}-{c}</td>' for c in range(colunas)) + '</tr>'
+        for i in range(linhas)
+    )
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Tabela</title></head><body>'
+            f'<table id="tabela"><thead><tr>{celulas}</tr></thead><tbody>{corpo}</tbody></table></body></html>')
+
+
+def pagina_formulario(campos=100):
+    html = []
+    for i in range(campos):
+        tipo = i % 4
+        if tipo == 0:
+            html.append(f'<label>Campo {i} <input type="text" id="campo-{i}" name="campo-{i}"></label>')
+        elif tipo == 1:
+            html.append(f'<label>Campo {i} <textarea id="campo-{i}" name="campo-{i}"></textarea></label>')
+        elif tipo == 2:
+            opcoes = ''.join(f'<option value="{o}">Opção {o}</option>' for o in range(10))
+            html.append(f'<label>Campo {i} <select id="campo-{i}" name="campo-{i}">{opcoes}</select></label>')
+        else:
+            html.append(f'<label>Campo {i} <input type="checkbox" id="campo-{i}" name="campo-{i}"></label>')
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Formulário</title></head><body>'
+            f'<form id="formulario">{"".join(html)}<button type="button" id="enviar" '
+            f'onclick="this.dataset.clicado = 1">Enviar</button></form></body></html>')
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Serve os arquivos de fixtures e as páginas geradas."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parametros = {chave: int(valor[0]) for chave, valor in parse_qs(url.query).items() if valor[0].isdigit()}
+        if url.path == '/tabela':
+            return self._responder(pagina_tabela(parametros.get('linhas', 2000), parametros.get('colunas', 8)))
+        if url.path == '/formulario':
+            return self._responder(pagina_formulario(parametros.get('campos', 100)))
+        if url.path == '/atraso':
+            time.sleep(parametros.get('ms', 500) / 1000)
+            return self._responder('ok', 'text/plain')
+        return super().do_GET()
+
+    def _responder(self, conteudo, tipo='text/html'):
+        corpo = conteudo.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'{tipo}; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServidorFixtures:
+    """Servidor HTTP das fixtures em uma thread em segundo plano."""
+
+    def __init__(self, host='127.0.0.1', porta=0):
+        """
+        Inicializa um objeto ServidorFixtures.
+
+        Args:
+            host (str): Endereço de escuta (padrão: '127.0.0.1').
+            porta (int): Porta de escuta; 0 escolhe uma porta livre (padrão: 0).
+        """
+        self._servidor = ThreadingHTTPServer((host, porta), partial(_Handler, directory=FIXTURES))
+        self._servidor.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address[:2]
+        return f'http://{host}:{porta}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,314 @@
+"""
+Suíte de benchmarks do Driver e da Interation contra as fixtures locais.
+
+Sobe o servidor de fixtures (benchmarks/servidor.py) e mede:
+    - tempo de inicialização do Driver;
+    - latência do load_page em cada fixture;
+    - latência e comandos do WebDriver de find/find_all/click/write/wait_for;
+    - memória por navegador (heap JS e RSS dos processos do navegador);
+    - páginas/minuto de ponta a ponta com o JobRunner.
+
+Com --baseline, compara com um resultado anterior e termina com erro se alguma
+métrica piorou além da tolerância.
+
+Uso:
+    python -m benchmarks.suite --saida benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --tolerancia 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.servidor import ServidorFixtures
+from driver.driver import Driver
+from iterator.instrumentation import Instrumentacao
+from iterator.iteration import Interation
+from src.runner import JobRunner
+
+FIXTURES = {
+    'tabela': ('/tabela?linhas=2000', None),
+    'formulario': ('/formulario?campos=200', None),
+    'scroll': ('/scroll.html', None),
+    'lento': ('/lento.html', 'networkidle'),
+}
+
+# Métricas comparadas com o baseline: caminho no resultado e se maior é pior
+METRICAS_REGRESSAO = [
+    (('inicializacao', 'media'), True),
+    *((('load_page', nome, 'total'), True) for nome in FIXTURES),
+    *((('acoes', acao, 'p50'), True) for acao in ('find', 'find_all', 'click', 'write', 'wait_for')),
+    *((('acoes', acao, 'comandos_por_acao'), True) for acao in ('find', 'find_all', 'click', 'write', 'wait_for')),
+    (('memoria', 'rss_mb'), True),
+    (('throughput', 'paginas_por_minuto'), False),
+]
+
+
+def _resumo(valores):
+    return {
+        'media': statistics.fmean(valores),
+        'min': min(valores),
+        'max': max(valores),
+        'p50': statistics.median(valores),
+    }
+
+
+def medir_inicializacao(browser, repeticoes, inicio_rapido=False):
+    """
+    Mede o tempo de criação do Driver (até o navegador aceitar comandos).
+
+    Args:
+        browser (str): Navegador usado.
+        repeticoes (int): Quantidade de navegadores iniciados.
+        inicio_rapido (bool): Reaproveita o processo do chromedriver entre os navegadores (padrão: False).
+
+    Returns:
+        dict: Resumo dos tempos em segundos e média de cada etapa (importação, driver, processo, sessão).
+    """
+    tempos, etapas = [], {}
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        navegador = Driver(browser=browser, headless=True, inicio_rapido=inicio_rapido)
+        tempos.append(time.perf_counter() - inicio)
+        for etapa, tempo in navegador.tempos_inicializacao.items():
+            etapas.setdefault(etapa, []).append(tempo)
+        navegador.driver.quit()
+    return dict(_resumo(tempos), etapas={etapa: statistics.fmean(valores) for etapa, valores in etapas.items()})
+
+
+def medir_load_page(interacao: Interation, base, repeticoes):
+    """
+    Mede o load_page em cada fixture.
+
+    Args:
+        interacao (Interation): Interação ligada a um navegador.
+        base (str): URL do servidor de fixtures.
+        repeticoes (int): Carregamentos por fixture.
+
+    Returns:
+        dict: Média dos tempos (ms) de navegação por fixture.
+    """
+    resultados = {}
+    for nome, (caminho, pronto) in FIXTURES.items():
+        medicoes = [interacao.load_page(base + caminho, pronto=pronto) for _ in range(repeticoes)]
+        resultados[nome] = {chave: statistics.fmean(m[chave] for m in medicoes if m.get(chave) is not None)
+                            for chave in medicoes[0] if any(m.get(chave) is not None for m in medicoes)}
+    return resultados
+
+
+def medir_acoes(interacao: Interation, base, repeticoes):
+    """
+    Executa as ações de alto nível nas fixtures; a latência e os comandos são coletados pela instrumentação.
+
+    Args:
+        interacao (Interation): Interação com instrumentação habilitada.
+        base (str): URL do servidor de fixtures.
+        repeticoes (int): Repetições de cada ação.
+
+    Returns:
+        dict: Resumo por ação (latências em segundos e comandos por ação).
+    """
+    instrumentacao = interacao.instrumentacao
+    instrumentacao.reset()
+
+    interacao.load_page(base + FIXTURES['tabela'][0])
+    for _ in range(repeticoes):
+        interacao.find('//tr[@data-id="1500"]', element_is='presence')
+        interacao.find_all('tr.linha', metodo='css')
+
+    interacao.load_page(base + FIXTURES['formulario'][0])
+    for i in range(repeticoes):
+        interacao.write('#campo-0', f'valor {i}', metodo='css')
+        interacao.click('#enviar', metodo='css')
+
+    for _ in range(repeticoes):
+        interacao.load_page(base + FIXTURES['lento'][0], pronto='domcontentloaded')
+        interacao.wait_for('#botao-3', metodo='css')
+
+    resultados = {acao: resumo for acao, resumo in instrumentacao.to_json()['acoes'].items() if acao != 'load_page'}
+    resultados['harvest_200_itens'] = _medir_harvest(interacao, base)
+    return resultados
+
+
+def _medir_harvest(interacao: Interation, base, itens=200):
+    interacao.load_page(base + FIXTURES['scroll'][0])
+    inicio = time.perf_counter()
+    coletados = sum(1 for _ in interacao.harvest('li.item', {'id': ('.', 'data-id')}, metodo='css', chave='id', max_itens=itens))
+    return {'media': time.perf_counter() - inicio, 'itens': coletados}
+
+
+def _rss_processos(pid):
+    """
+    Soma o RSS (MB) de um processo e de todos os seus descendentes, lido de /proc (somente Linux).
+
+    Args:
+        pid (int): Processo raiz (o driver do navegador).
+
+    Returns:
+        float | None: RSS total em MB, ou None fora do Linux.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    filhos = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat', 'r') as file:
+                # O nome do processo pode ter espaços; os campos seguintes vêm depois do ')'
+                ppid = int(file.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(entrada))
+
+    total, pendentes = 0, [pid]
+    pagina = os.sysconf('SC_PAGE_SIZE')
+    while pendentes:
+        atual = pendentes.pop()
+        pendentes.extend(filhos.get(atual, []))
+        try:
+            with open(f'/proc/{atual}/statm', 'r') as file:
+                total += int(file.read().split()[1]) * pagina
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / (1024 * 1024)
+
+
+def medir_memoria(interacao: Interation):
+    """
+    Mede a memória do navegador com a página atual carregada.
+
+    Args:
+        interacao (Interation): Interação ligada a um navegador local.
+
+    Returns:
+        dict: Heap JS usado (MB) e RSS dos processos do navegador (MB).
+    """
+    heap = interacao.driver.execute_script(
+        'return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;')
+    servico = getattr(interacao.driver, 'service', None)
+    processo = getattr(servico, 'process', None)
+    return {
+        'heap_js_mb': heap / (1024 * 1024) if heap else None,
+        'rss_mb': _rss_processos(processo.pid) if processo else None,
+    }
+
+
+def medir_throughput(base, browser, workers, paginas):
+    """
+    Mede páginas/minuto de ponta a ponta com o JobRunner.
+
+    Args:
+        base (str): URL do servidor de fixtures.
+        browser (str): Navegador usado.
+        workers (int): Navegadores em paralelo.
+        paginas (int): Quantidade de páginas carregadas.
+
+    Returns:
+        dict: Páginas/minuto, sucessos e falhas.
+    """
+    caminhos = [caminho for caminho, _ in FIXTURES.values()]
+    tarefas = [base + caminhos[i % len(caminhos)] for i in range(paginas)]
+    with tempfile.TemporaryDirectory() as diretorio:
+        runner = JobRunner(workers=workers, saida=os.path.join(diretorio, 'resultados.jsonl'), browser=browser, headless=True)
+        metricas = runner.run(tarefas)
+    return {chave: metricas[chave] for chave in ('paginas_por_minuto', 'sucessos', 'falhas', 'tempo_total')}
+
+
+def executar(browser='chrome', repeticoes=5, inicializacoes=3, workers=2, paginas=40):
+    """
+    Executa a suíte completa.
+
+    Args:
+        browser (str): Navegador usado (padrão: 'chrome').
+        repeticoes (int): Repetições de cada medição de página e ação (padrão: 5).
+        inicializacoes (int): Navegadores iniciados na medição de inicialização (padrão: 3).
+        workers (int): Navegadores em paralelo na medição de throughput (padrão: 2).
+        paginas (int): Páginas carregadas na medição de throughput (padrão: 40).
+
+    Returns:
+        dict: Resultados de todas as medições.
+    """
+    resultados = {
+        'ambiente': {'python': platform.python_version(), 'plataforma': platform.platform(), 'browser': browser},
+    }
+    with ServidorFixtures() as servidor:
+        resultados['inicializacao'] = medir_inicializacao(browser, inicializacoes)
+        resultados['inicializacao_rapida'] = medir_inicializacao(browser, inicializacoes, inicio_rapido=True)
+
+        interacao = Interation(Driver(browser=browser, headless=True).driver, instrumentacao=Instrumentacao())
+        try:
+            resultados['load_page'] = medir_load_page(interacao, servidor.url, repeticoes)
+            resultados['acoes'] = medir_acoes(interacao, servidor.url, repeticoes)
+            interacao.load_page(servidor.url + FIXTURES['tabela'][0])
+            resultados['memoria'] = medir_memoria(interacao)
+        finally:
+            interacao.quit()
+
+        resultados['throughput'] = medir_throughput(servidor.url, browser, workers, paginas)
+    return resultados
+
+
+def comparar(resultados, baseline, tolerancia=0.2):
+    """
+    Compara os resultados com um baseline.
+
+    Args:
+        resultados (dict): Resultados medidos agora.
+        baseline (dict): Resultados de referência.
+        tolerancia (float): Piora relativa aceita antes de acusar regressão (padrão: 0.2).
+
+    Returns:
+        list: Descrição das métricas que pioraram além da tolerância.
+    """
+    def valor(dados, caminho):
+        for chave in caminho:
+            if not isinstance(dados, dict) or dados.get(chave) is None:
+                return None
+            dados = dados[chave]
+        return dados
+
+    regressoes = []
+    for caminho, maior_pior in METRICAS_REGRESSAO:
+        atual, referencia = valor(resultados, caminho), valor(baseline, caminho)
+        if atual is None or not referencia:
+            continue
+        variacao = (atual - referencia) / referencia
+        if (variacao if maior_pior else -variacao) > tolerancia:
+            regressoes.append(f"{'.'.join(caminho)}: {referencia:.3f} -> {atual:.3f} ({variacao:+.0%})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do Driver e da Interation contra fixtures locais.')
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--inicializacoes', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--paginas', type=int, default=40)
+    parser.add_argument('--saida', help='Arquivo JSON onde os resultados serão gravados.')
+    parser.add_argument('--baseline', help='Arquivo JSON de referência para detectar regressões.')
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    args = parser.parse_args()
+
+    resultados = executar(args.browser, args.repeticoes, args.inicializacoes, args.workers, args.paginas)
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as file:
+            json.dump(resultados, file, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressoes = comparar(resultados, json.load(file), args.tolerancia)
+        if regressoes:
+            print('Regressões:\n' + '\n'.join(regressoes))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+Módulo com o cache dos executáveis de driver (chromedriver/geckodriver).
+
+O webdriver_manager consulta a internet a cada install() para descobrir a
+versão do driver. Aqui o executável resolvido é copiado para um cache em disco,
+indexado pela versão principal do navegador instalado, e as próximas execuções
+usam a cópia local sem importar o webdriver_manager nem acessar a rede. Se a
+versão do navegador não for detectada, nada é gravado no cache (uma atualização
+do navegador passaria despercebida). Em modo offline (DRIVER_OFFLINE=1) só o
+cache é usado.
+
+Também fornece o serviço compartilhado do chromedriver, que mantém um único
+processo atendendo várias sessões.
+"""
+import atexit
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from utils.logger_config import logger
+
+DIRETORIO_CACHE = os.environ.get('DRIVER_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'bot-drivers'))
+
+# Executáveis consultados com --version para descobrir a versão do navegador
+NAVEGADORES = {
+    'chrome': ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+               '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'],
+    'firefox': ['firefox', '/Applications/Firefox.app/Contents/MacOS/firefox'],
+}
+
+# Chaves do registro do Windows com a versão instalada
+REGISTRO_WINDOWS = {
+    'chrome': [('HKEY_CURRENT_USER', r'Software\Google\Chrome\BLBeacon', 'version'),
+               ('HKEY_LOCAL_MACHINE', r'SOFTWARE\WOW6432Node\Google\Chrome\BLBeacon', 'version')],
+    'firefox': [('HKEY_LOCAL_MACHINE', r'SOFTWARE\Mozilla\Mozilla Firefox', 'CurrentVersion')],
+}
+
+_versoes = {}
+_sem_versao = set()
+_lock = threading.Lock()
+_locks_chave = {}
+
+
+def _lock_chave(chave):
+    """
+    Retorna o lock de download de uma chave navegador-versão.
+    """
+    with _lock:
+        return _locks_chave.setdefault(chave, threading.Lock())
+
+
+def versao_navegador(browser):
+    """
+    Descobre a versão principal do navegador instalado (uma vez por processo).
+
+    Args:
+        browser (str): 'chrome' ou 'firefox'.
+
+    Returns:
+        str | None: Versão principal (ex.: '121'), ou None se não encontrada.
+    """
+    if browser in _versoes:
+        return _versoes[browser]
+
+    texto = None
+    if sys.platform == 'win32':
+        import winreg
+        for raiz, chave, valor in REGISTRO_WINDOWS.get(browser, []):
+            try:
+                with winreg.OpenKey(getattr(winreg, raiz), chave) as registro:
+                    texto = winreg.QueryValueEx(registro, valor)[0]
+                    break
+            except OSError:
+                continue
+    else:
+        for executavel in NAVEGADORES.get(browser, []):
+            if not (os.path.isabs(executavel) and os.path.exists(executavel)) and not shutil.which(executavel):
+                continue
+            try:
+                texto = subprocess.run([executavel, '--version'], capture_output=True, text=True, timeout=10).stdout
+                break
+            except (OSError, subprocess.SubprocessError):
+                continue
+
+    encontrada = re.search(r'(\d+)\.[\d.]+', texto or '')
+    _versoes[browser] = encontrada.group(1) if encontrada else None
+    return _versoes[browser]
+
+
+def _ler_indice():
+    try:
+        with open(os.path.join(DIRETORIO_CACHE, 'indice.json'), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_indice(indice):
+    os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=DIRETORIO_CACHE, suffix='.tmp')
+    with os.fdopen(descritor, 'w', encoding='utf-8') as file:
+        json.dump(indice, file, indent=2)
+    os.replace(temporario, os.path.join(DIRETORIO_CACHE, 'indice.json'))
+
+
+def _baixar(browser):
+    """
+    Resolve o driver pelo webdriver_manager (importado só aqui).
+
+    Args:
+        browser (str): 'chrome' ou 'firefox'.
+
+    Returns:
+        str: Caminho do executável baixado.
+    """
+    if browser == 'chrome':
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if browser == 'firefox':
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    raise ValueError(f"Navegador '{browser}' sem driver gerenciado.")
+
+
+def resolver_driver(browser, offline=None):
+    """
+    Retorna o executável do driver compatível com o navegador instalado, usando o cache em disco.
+
+    Args:
+        browser (str): 'chrome' ou 'firefox'.
+        offline (bool): Usa apenas o cache, sem acessar a rede (padrão: None, lê DRIVER_OFFLINE).
+
+    Returns:
+        str: Caminho do executável do driver.
+    """
+    if offline is None:
+        offline = os.environ.get('DRIVER_OFFLINE', '').lower() in ('1', 'true', 'sim')
+
+    versao = versao_navegador(browser)
+    chave = f'{browser}-{versao or "desconhecida"}'
+
+    caminho = _ler_indice().get(chave) if versao else None
+    if caminho and os.path.exists(caminho):
+        return caminho
+
+    if offline:
+        # Sem rede: qualquer driver em cache para o navegador é melhor que nenhum
+        disponiveis = [c for k, c in _ler_indice().items() if k.startswith(f'{browser}-') and os.path.exists(c)]
+        if not disponiveis:
+            raise FileNotFoundError(f"Nenhum driver de '{browser}' em cache para uso offline em {DIRETORIO_CACHE}.")
+        logger.warning(f"Driver para {chave} não está em cache; usando {disponiveis[-1]} (offline).")
+        return disponiveis[-1]
+
+    # O download usa um lock por chave: sessões de outros navegadores/versões não esperam a rede
+    with _lock_chave(chave):
+        if not versao:
+            # Sem a versão não há como saber quando o navegador for atualizado: o driver não vai para
+            # o cache local e a validade fica por conta do cache do próprio webdriver_manager
+            if browser not in _sem_versao:
+                _sem_versao.add(browser)
+                logger.warning(f"Versão do navegador '{browser}' não detectada: driver resolvido pelo webdriver_manager, sem cache local.")
+            return _baixar(browser)
+
+        # Outra thread pode ter baixado enquanto esta esperava o lock
+        caminho = _ler_indice().get(chave)
+        if caminho and os.path.exists(caminho):
+            return caminho
+
+        origem = _baixar(browser)
+        destino = os.path.join(DIRETORIO_CACHE, browser, versao, os.path.basename(origem))
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        shutil.copy2(origem, destino)
+        os.chmod(destino, 0o755)
+        with _lock:
+            indice = _ler_indice()
+            indice[chave] = destino
+            _gravar_indice(indice)
+    logger.info(f'Driver de {chave} salvo em cache: {destino}')
+    return destino
+
+
+class _InicioMedido:
+    """Registra o tempo de start() do serviço (processo do driver)."""
+
+    tempo_inicio = 0.0
+
+    def start(self):
+        inicio = time.perf_counter()
+        super().start()
+        self.tempo_inicio = time.perf_counter() - inicio
+
+
+class ServicoChrome(_InicioMedido, ChromeService):
+    """Serviço do chromedriver com medição do tempo de início."""
+
+
+class ServicoFirefox(_InicioMedido, FirefoxService):
+    """Serviço do geckodriver com medição do tempo de início."""
+
+
+class ServicoCompartilhado(ServicoChrome):
+    """Serviço do chromedriver reaproveitado por várias sessões."""
+
+    def __init__(self, executable_path):
+        super().__init__(executable_path=executable_path)
+        self._usuarios = 0
+        self._trava = threading.Lock()
+
+    def start(self):
+        with self._trava:
+            self._usuarios += 1
+            processo = getattr(self, 'process', None)
+            if processo is not None and processo.poll() is None:
+                self.tempo_inicio = 0.0
+                return
+            super().start()
+
+    def stop(self):
+        # O processo continua ativo para a próxima sessão; é encerrado com o interpretador
+        with self._trava:
+            self._usuarios = max(0, self._usuarios - 1)
+
+    def encerrar(self):
+        with self._trava:
+            if getattr(self, 'process', None) is not None:
+                ChromeService.stop(self)
+
+
+_servicos = {}
+
+
+def servico_compartilhado(executable_path):
+    """
+    Retorna o serviço compartilhado do chromedriver para o executável, criado no primeiro uso.
+
+    Args:
+        executable_path (str): Caminho do chromedriver.
+
+    Returns:
+        ServicoCompartilhado: Serviço compartilhado.
+    """
+    with _lock:
+        if executable_path not in _servicos:
+            servico = ServicoCompartilhado(executable_path)
+            atexit.register(servico.encerrar)
+            _servicos[executable_path] = servico
+        return _servicos[executable_path]
@@ -0,0 +1,438 @@
+"""
+Módulo com o cache em disco das respostas HTTP do navegador (Chrome).
+
+As requisições que casam com as regras do cache são interceptadas via CDP
+(domínio Fetch): em um acerto, a resposta gravada é entregue direto ao
+navegador, sem acessar a rede; em uma falta, a resposta da rede é gravada ao
+passar. Os corpos são endereçados pelo conteúdo (SHA-256), então o mesmo
+bundle JS servido por várias URLs ocupa espaço uma única vez, e o tamanho
+total é limitado com descarte dos menos usados recentemente (LRU).
+
+No modo offline nenhuma requisição interceptada vai para a rede: o site
+gravado é servido inteiramente do disco e as faltas falham na hora, o que
+deixa desenvolvimento e benchmarks determinísticos.
+"""
+import asyncio
+import base64
+import fnmatch
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.logger_config import logger
+
+# Políticas por padrão de URL
+CACHE = 'cache'            # serve do cache enquanto válido; senão busca na rede e grava
+ATUALIZAR = 'atualizar'    # sempre busca na rede e grava (mantém o cache fresco para o modo offline)
+REDE = 'rede'              # nunca usa o cache
+POLITICAS = (CACHE, ATUALIZAR, REDE)
+
+# Cabeçalhos que não valem para o corpo gravado (já decodificado pelo navegador)
+CABECALHOS_DESCARTADOS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    chave TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    cabecalhos TEXT NOT NULL,
+    salvo_em REAL NOT NULL,
+    acessado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS respostas_acesso ON respostas (acessado_em);
+CREATE INDEX IF NOT EXISTS respostas_hash ON respostas (hash);
+CREATE TABLE IF NOT EXISTS corpos (
+    hash TEXT PRIMARY KEY,
+    tamanho INTEGER NOT NULL
+);
+"""
+
+
+class ResponseCache:
+    """Cache de respostas em disco, endereçado pelo conteúdo e limitado por tamanho."""
+
+    def __init__(self, diretorio='cache_respostas', regras=None, limite_mb=500, offline=False):
+        """
+        Inicializa um objeto ResponseCache.
+
+        Regras são pares (padrão de URL com curingas '*' e '?', política) ou (padrão, política, ttl em
+        segundos), avaliados na ordem; vale a primeira que casar. URLs sem regra não são interceptadas.
+
+        Exemplo de uso:
+            cache = ResponseCache('cache', regras=[('*/api/carrinho*', 'rede'), ('*/api/*', 'cache', 3600), ('*', 'cache')])
+            bot = Driver(headless=True, cache_respostas=cache)
+
+        Args:
+            diretorio (str): Diretório do índice e dos corpos (padrão: 'cache_respostas').
+            regras (list): Regras por padrão de URL (padrão: None, cacheia tudo sem expiração).
+            limite_mb (float): Tamanho máximo dos corpos gravados em MB (padrão: 500).
+            offline (bool): Serve só do disco e falha as faltas, sem acessar a rede (padrão: False).
+        """
+        self.diretorio = diretorio
+        self.regras = []
+        for regra in regras or [('*', CACHE)]:
+            padrao, politica, ttl = (tuple(regra) + (None,))[:3]
+            if politica not in POLITICAS:
+                raise ValueError(f"Política de cache '{politica}' inválida. Opções: {', '.join(POLITICAS)}.")
+            self.regras.append((padrao, politica, ttl))
+        self.limite = int(limite_mb * 1024 * 1024)
+        self.offline = offline
+
+        os.makedirs(os.path.join(diretorio, 'corpos'), exist_ok=True)
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._metricas = {'acertos': 0, 'faltas': 0, 'gravadas': 0, 'descartadas': 0, 'falhas_offline': 0,
+                          'bytes_economizados': 0, 'bytes_gravados': 0}
+        with self._conexao() as conexao:
+            conexao.executescript(_ESQUEMA)
+
+    def _conexao(self):
+        """
+        Retorna a conexão SQLite da thread atual.
+
+        Returns:
+            sqlite3.Connection: Conexão em modo WAL.
+        """
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(os.path.join(self.diretorio, 'indice.db'), timeout=30)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+        return conexao
+
+    def _contar(self, chave, valor=1):
+        with self._trava:
+            self._metricas[chave] += valor
+
+    def padroes(self):
+        """
+        Retorna os padrões de URL que precisam ser interceptados.
+
+        Returns:
+            list: Padrões das regras que usam o cache.
+        """
+        return [padrao for padrao, politica, _ in self.regras if politica != REDE]
+
+    def regra(self, url):
+        """
+        Retorna a primeira regra que casa com a URL.
+
+        Args:
+            url (str): URL da requisição.
+
+        Returns:
+            tuple: (política, ttl), com política REDE quando nenhuma regra casa.
+        """
+        for padrao, politica, ttl in self.regras:
+            if fnmatch.fnmatchcase(url, padrao):
+                return politica, ttl
+        return REDE, None
+
+    @staticmethod
+    def chave(metodo, url):
+        """
+        Retorna a chave de uma requisição no índice.
+
+        Args:
+            metodo (str): Método HTTP.
+            url (str): URL sem o fragmento.
+
+        Returns:
+            str: Hash SHA-256 de método e URL.
+        """
+        return hashlib.sha256(f'{metodo.upper()} {url.split("#", 1)[0]}'.encode('utf-8')).hexdigest()
+
+    def _caminho(self, hash_):
+        return os.path.join(self.diretorio, 'corpos', hash_[:2], hash_)
+
+    def buscar(self, metodo, url, ttl=None):
+        """
+        Busca a resposta gravada de uma requisição.
+
+        Args:
+            metodo (str): Método HTTP.
+            url (str): URL da requisição.
+            ttl (float): Idade máxima em segundos; ignorada no modo offline (padrão: None, sem expiração).
+
+        Returns:
+            tuple | None: (status, cabeçalhos, corpo em bytes), ou None se não houver resposta válida.
+        """
+        chave = self.chave(metodo, url)
+        conexao = self._conexao()
+        linha = conexao.execute('SELECT hash, status, cabecalhos, salvo_em FROM respostas WHERE chave = ?', (chave,)).fetchone()
+        if linha is None:
+            return None
+        hash_, status, cabecalhos, salvo_em = linha
+        if ttl is not None and not self.offline and time.time() - salvo_em > ttl:
+            return None
+        try:
+            with open(self._caminho(hash_), 'rb') as file:
+                corpo = file.read()
+        except OSError:
+            with conexao:
+                conexao.execute('DELETE FROM respostas WHERE chave = ?', (chave,))
+            return None
+        with conexao:
+            conexao.execute('UPDATE respostas SET acessado_em = ? WHERE chave = ?', (time.time(), chave))
+        return status, json.loads(cabecalhos), corpo
+
+    def gravar(self, metodo, url, status, cabecalhos, corpo):
+        """
+        Grava a resposta de uma requisição e descarta as menos usadas se o limite for excedido.
+
+        Args:
+            metodo (str): Método HTTP.
+            url (str): URL da requisição.
+            status (int): Status HTTP.
+            cabecalhos (list): Cabeçalhos da resposta, como [{'name': ..., 'value': ...}].
+            corpo (bytes): Corpo já decodificado.
+        """
+        hash_ = hashlib.sha256(corpo).hexdigest()
+        caminho = self._caminho(hash_)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+            with os.fdopen(descritor, 'wb') as file:
+                file.write(corpo)
+            os.replace(temporario, caminho)
+
+        cabecalhos = [c for c in cabecalhos if c['name'].lower() not in CABECALHOS_DESCARTADOS]
+        agora = time.time()
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute('INSERT OR IGNORE INTO corpos (hash, tamanho) VALUES (?, ?)', (hash_, len(corpo)))
+            conexao.execute('INSERT OR REPLACE INTO respostas (chave, url, hash, status, cabecalhos, salvo_em, acessado_em) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (self.chave(metodo, url), url, hash_, status, json.dumps(cabecalhos), agora, agora))
+        self._contar('gravadas')
+        self._contar('bytes_gravados', len(corpo))
+        self._descartar()
+
+    def tamanho(self):
+        """
+        Retorna o tamanho total dos corpos gravados.
+
+        Returns:
+            int: Tamanho em bytes.
+        """
+        return self._conexao().execute('SELECT COALESCE(SUM(tamanho), 0) FROM corpos').fetchone()[0]
+
+    def _descartar(self):
+        """
+        Remove as respostas acessadas há mais tempo até o total caber no limite.
+
+        Um corpo só é apagado quando nenhuma resposta aponta mais para ele.
+        """
+        total = self.tamanho()
+        if total <= self.limite:
+            return
+        conexao = self._conexao()
+        descartadas, removidos = 0, []
+        with conexao:
+            for chave, hash_ in conexao.execute('SELECT chave, hash FROM respostas ORDER BY acessado_em LIMIT 1000').fetchall():
+                if total <= self.limite:
+                    break
+                conexao.execute('DELETE FROM respostas WHERE chave = ?', (chave,))
+                descartadas += 1
+                if conexao.execute('SELECT 1 FROM respostas WHERE hash = ? LIMIT 1', (hash_,)).fetchone() is None:
+                    total -= conexao.execute('SELECT tamanho FROM corpos WHERE hash = ?', (hash_,)).fetchone()[0]
+                    conexao.execute('DELETE FROM corpos WHERE hash = ?', (hash_,))
+                    removidos.append(hash_)
+        for hash_ in removidos:
+            try:
+                os.remove(self._caminho(hash_))
+            except OSError:
+                pass
+        self._contar('descartadas', descartadas)
+
+    def metricas(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Acertos, faltas, gravações, descartes, falhas offline, bytes economizados e gravados,
+            taxa de acerto, entradas e tamanho atual em bytes.
+        """
+        with self._trava:
+            metricas = dict(self._metricas)
+        consultas = metricas['acertos'] + metricas['faltas']
+        metricas['taxa_acerto'] = metricas['acertos'] / consultas if consultas else 0.0
+        metricas['entradas'] = self._conexao().execute('SELECT COUNT(*) FROM respostas').fetchone()[0]
+        metricas['tamanho'] = self.tamanho()
+        return metricas
+
+    def limpar(self):
+        """
+        Remove todas as respostas gravadas.
+        """
+        conexao = self._conexao()
+        hashes = [h for h, in conexao.execute('SELECT hash FROM corpos')]
+        with conexao:
+            conexao.execute('DELETE FROM respostas')
+            conexao.execute('DELETE FROM corpos')
+        for hash_ in hashes:
+            try:
+                os.remove(self._caminho(hash_))
+            except OSError:
+                pass
+
+    def close(self):
+        """
+        Fecha a conexão da thread atual.
+        """
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
+
+
+class CacheInterceptor:
+    """Liga um ResponseCache às abas de uma sessão do Chrome via CDP Fetch."""
+
+    def __init__(self, driver, cache: ResponseCache):
+        """
+        Inicializa um objeto CacheInterceptor.
+
+        A conexão CDP roda em um event loop próprio, em uma thread de fundo, e se anexa a todas
+        as abas da sessão, inclusive as abertas depois.
+
+        Args:
+            driver: WebDriver do Chrome ou Undetected Chromedriver.
+            cache (ResponseCache): Cache usado pela sessão.
+        """
+        self.driver = driver
+        self.cache = cache
+        self._loop = asyncio.new_event_loop()
+        self._conexao = None
+        self._thread = threading.Thread(target=self._loop.run_forever, name='cache-respostas', daemon=True)
+
+    def iniciar(self, timeout=15):
+        """
+        Conecta ao navegador e habilita a interceptação.
+
+        Args:
+            timeout (float): Tempo máximo da conexão em segundos (padrão: 15).
+        """
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._conectar(), self._loop).result(timeout)
+
+    async def _conectar(self):
+        from iterator.async_iteration import CDPConnection, endpoint_cdp
+
+        self._conexao = await CDPConnection.abrir(await asyncio.to_thread(endpoint_cdp, self.driver))
+        self._conexao.ouvir('Target.attachedToTarget', self._anexada)
+        self._conexao.ouvir('Fetch.requestPaused', self._pausada)
+        await self._conexao.send('Target.setAutoAttach', {'autoAttach': True, 'waitForDebuggerOnStart': True, 'flatten': True})
+
+    async def _anexada(self, params, _):
+        """
+        Habilita o Fetch em uma aba recém-anexada e libera a sua execução.
+
+        Com waitForDebuggerOnStart a aba fica parada até ser liberada, então qualquer falha
+        ainda libera a aba (sem cache).
+        """
+        try:
+            await self._habilitar(params)
+        except Exception as e:
+            logger.warning(f'Cache de respostas não habilitado em uma aba: {type(e).__name__}: {e}')
+            if params.get('waitingForDebugger'):
+                await self._liberar('Runtime.runIfWaitingForDebugger', None, params.get('sessionId'))
+
+    async def _habilitar(self, params):
+        sessao = params['sessionId']
+        if params['targetInfo']['type'] not in ('page', 'iframe'):
+            if params.get('waitingForDebugger'):
+                await self._enviar('Runtime.runIfWaitingForDebugger', None, sessao)
+            return
+        padroes = [{'urlPattern': p, 'requestStage': estagio} for p in self.cache.padroes() for estagio in ('Request', 'Response')]
+        await self._enviar('Fetch.enable', {'patterns': padroes}, sessao)
+        if params.get('waitingForDebugger'):
+            await self._enviar('Runtime.runIfWaitingForDebugger', None, sessao)
+
+    async def _enviar(self, metodo, params, sessao):
+        try:
+            return await self._conexao.send(metodo, params, sessao)
+        except WebDriverException as e:
+            # A aba pode ter sido fechada enquanto a requisição estava pausada
+            logger.debug(f'CDP {metodo} ignorado: {e}')
+            return None
+
+    async def _liberar(self, metodo, params, sessao):
+        """
+        Envia o comando que libera uma aba ou requisição, ignorando qualquer falha (último recurso).
+        """
+        try:
+            await self._conexao.send(metodo, params, sessao)
+        except Exception as e:
+            logger.debug(f'CDP {metodo} ignorado: {e}')
+
+    async def _pausada(self, params, sessao):
+        """
+        Decide o destino de uma requisição pausada: servir do cache, seguir para a rede ou gravar a resposta.
+
+        Uma falha do cache (SQLite, disco cheio, evento inesperado) não pode deixar a requisição
+        pausada: ela segue pela rede.
+        """
+        try:
+            await self._decidir(params, sessao)
+        except Exception as e:
+            url = params.get('request', {}).get('url')
+            logger.warning(f'Cache de respostas falhou para {url}: {type(e).__name__}: {e}; seguindo pela rede.')
+            await self._liberar('Fetch.continueRequest', {'requestId': params.get('requestId')}, sessao)
+
+    async def _decidir(self, params, sessao):
+        pedido = params['request']
+        metodo, url = pedido['method'], pedido['url']
+        politica, ttl = self.cache.regra(url)
+        cacheavel = metodo == 'GET' and politica != REDE
+        id_ = params['requestId']
+
+        if 'responseStatusCode' not in params and 'responseErrorReason' not in params:
+            # Estágio de requisição
+            if cacheavel and (politica == CACHE or self.cache.offline):
+                gravada = await asyncio.to_thread(self.cache.buscar, metodo, url, ttl)
+                if gravada is not None:
+                    status, cabecalhos, corpo = gravada
+                    self.cache._contar('acertos')
+                    self.cache._contar('bytes_economizados', len(corpo))
+                    await self._enviar('Fetch.fulfillRequest', {
+                        'requestId': id_, 'responseCode': status, 'responseHeaders': cabecalhos,
+                        'body': base64.b64encode(corpo).decode('ascii')}, sessao)
+                    return
+                self.cache._contar('faltas')
+            if self.cache.offline:
+                self.cache._contar('falhas_offline')
+                await self._enviar('Fetch.failRequest', {'requestId': id_, 'errorReason': 'InternetDisconnected'}, sessao)
+                return
+            await self._enviar('Fetch.continueRequest', {'requestId': id_}, sessao)
+            return
+
+        # Estágio de resposta: grava só respostas completas de sucesso
+        if cacheavel and params.get('responseStatusCode') == 200:
+            resposta = await self._enviar('Fetch.getResponseBody', {'requestId': id_}, sessao)
+            if resposta is not None:
+                corpo = base64.b64decode(resposta['body']) if resposta.get('base64Encoded') else resposta['body'].encode('utf-8')
+                await asyncio.to_thread(self.cache.gravar, metodo, url, 200, params.get('responseHeaders', []), corpo)
+        await self._enviar('Fetch.continueRequest', {'requestId': id_}, sessao)
+
+    def close(self, timeout=5):
+        """
+        Encerra a conexão CDP e o event loop. O navegador continua aberto.
+
+        Args:
+            timeout (float): Tempo máximo de espera em segundos (padrão: 5).
+        """
+        if self._conexao is not None and self._loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(self._conexao.close(), self._loop).result(timeout)
+            except Exception as e:
+                logger.debug(f'Falha ao fechar a conexão do cache: {e}')
+        self._loop.call_soon_threadsafe(self._loop.stop)
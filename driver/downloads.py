@@ -0,0 +1,240 @@
+"""
+Módulo com o gerenciador de downloads do navegador.
+
+Detecta quando um download terminou observando o diretório de downloads
+(ignorando os arquivos parciais .crdownload/.part), devolve o caminho do
+arquivo assim que ele é concluído e, opcionalmente, entrega o arquivo a um
+pipeline de processamento executado em segundo plano.
+"""
+import fnmatch
+import gzip
+import hashlib
+import os
+import shutil
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger_config import logger
+
+# Extensões de arquivos ainda em download (Chrome, Firefox, Edge/Safari e temporários)
+PARCIAIS = ('.crdownload', '.part', '.partial', '.download', '.tmp')
+
+
+def hash_sha256(caminho):
+    """
+    Etapa de pipeline: calcula o SHA-256 do arquivo em blocos.
+
+    Args:
+        caminho (str): Arquivo baixado.
+
+    Returns:
+        dict: {'caminho', 'sha256'}.
+    """
+    resumo = hashlib.sha256()
+    with open(caminho, 'rb') as file:
+        for bloco in iter(lambda: file.read(1024 * 1024), b''):
+            resumo.update(bloco)
+    return {'caminho': caminho, 'sha256': resumo.hexdigest()}
+
+
+def descompactar(caminho):
+    """
+    Etapa de pipeline: extrai arquivos .zip, .tar(.gz) e .gz ao lado do arquivo baixado.
+
+    Args:
+        caminho (str | dict): Arquivo baixado (ou o dicionário da etapa anterior, com 'caminho').
+
+    Returns:
+        dict: {'caminho', 'arquivos'} com a lista de arquivos extraídos.
+    """
+    caminho = caminho['caminho'] if isinstance(caminho, dict) else caminho
+    destino = os.path.splitext(caminho)[0]
+    if zipfile.is_zipfile(caminho):
+        with zipfile.ZipFile(caminho) as arquivo:
+            arquivo.extractall(destino)
+            nomes = arquivo.namelist()
+    elif tarfile.is_tarfile(caminho):
+        with tarfile.open(caminho) as arquivo:
+            arquivo.extractall(destino, filter='data')
+            nomes = arquivo.getnames()
+    elif caminho.endswith('.gz'):
+        with gzip.open(caminho, 'rb') as origem, open(destino, 'wb') as saida:
+            shutil.copyfileobj(origem, saida)
+        return {'caminho': caminho, 'arquivos': [destino]}
+    else:
+        return {'caminho': caminho, 'arquivos': []}
+    return {'caminho': caminho, 'arquivos': [os.path.join(destino, nome) for nome in nomes]}
+
+
+class DownloadManager:
+    """Gerencia o diretório de downloads de uma sessão."""
+
+    def __init__(self, diretorio, isolar=True, pipeline=None, workers=2, intervalo=0.1):
+        """
+        Inicializa um objeto DownloadManager.
+
+        Args:
+            diretorio (str): Diretório base de downloads (ex.: o download_path do Driver).
+            isolar (bool): Cria um subdiretório exclusivo para a sessão (padrão: True).
+            pipeline (list): Funções aplicadas em sequência a cada arquivo concluído; cada uma recebe
+                o retorno da anterior (a primeira recebe o caminho) (padrão: None).
+            workers (int): Threads do pipeline de processamento (padrão: 2).
+            intervalo (float): Intervalo de verificação do diretório em segundos (padrão: 0.1).
+        """
+        self.diretorio = os.path.join(diretorio, f'sessao_{uuid.uuid4().hex[:12]}') if isolar else diretorio
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.isolado = isolar
+        self.pipeline = list(pipeline or [])
+        self.intervalo = intervalo
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='download') if self.pipeline else None
+        self._lock = threading.Lock()
+        self._metricas = {'downloads': 0, 'bytes': 0, 'tempo_total': 0.0, 'timeouts': 0}
+
+    def aplicar(self, driver):
+        """
+        Direciona os downloads de uma sessão já iniciada para o diretório do gerenciador (apenas Chrome).
+
+        Args:
+            driver: Objeto WebDriver do Selenium.
+
+        Returns:
+            bool: True se o diretório foi aplicado via CDP, False se o navegador não suporta.
+        """
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            return False
+        driver.execute_cdp_cmd('Browser.setDownloadBehavior', {'behavior': 'allow', 'downloadPath': os.path.abspath(self.diretorio)})
+        return True
+
+    def _listar(self):
+        """
+        Lista os arquivos concluídos do diretório com seus tamanhos.
+
+        Returns:
+            dict: {caminho: tamanho}.
+        """
+        arquivos = {}
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and not entrada.name.endswith(PARCIAIS) and not entrada.name.startswith('.'):
+                    arquivos[entrada.path] = entrada.stat().st_size
+        return arquivos
+
+    def _em_andamento(self):
+        with os.scandir(self.diretorio) as entradas:
+            return any(entrada.name.endswith(PARCIAIS) for entrada in entradas)
+
+    def esperar(self, acao=None, timeout=60, padrao='*'):
+        """
+        Espera um novo download ser concluído e retorna o caminho do arquivo.
+
+        Exemplo de uso:
+            caminho = driver.downloads.esperar(lambda: bot.click('//a[@id="exportar"]'), padrao='*.csv')
+
+        Args:
+            acao (callable): Função que dispara o download; os arquivos existentes antes dela são ignorados (padrão: None).
+            timeout (float): Tempo máximo de espera em segundos (padrão: 60).
+            padrao (str): Padrão (fnmatch) do nome do arquivo esperado (padrão: '*').
+
+        Returns:
+            str: Caminho do arquivo concluído.
+        """
+        existentes = self._listar()
+        inicio = time.perf_counter()
+        if acao is not None:
+            acao()
+
+        limite = time.monotonic() + timeout
+        candidatos = {}
+        while time.monotonic() < limite:
+            atuais = self._listar()
+            for caminho, tamanho in atuais.items():
+                if caminho in existentes and existentes[caminho] == tamanho:
+                    continue
+                if not fnmatch.fnmatch(os.path.basename(caminho), padrao):
+                    continue
+                # Concluído quando o tamanho se mantém entre duas verificações sem parcial correspondente;
+                # o Firefox cria o arquivo final vazio ao lado do .part, então um arquivo de 0 bytes só
+                # conta quando não há nenhum download em andamento no diretório
+                if (candidatos.get(caminho) == tamanho
+                        and not any(os.path.exists(caminho + sufixo) for sufixo in PARCIAIS)
+                        and (tamanho > 0 or not self._em_andamento())):
+                    return self._concluir(caminho, tamanho, time.perf_counter() - inicio)
+                candidatos[caminho] = tamanho
+            time.sleep(self.intervalo)
+
+        with self._lock:
+            self._metricas['timeouts'] += 1
+        situacao = 'ainda em andamento' if self._em_andamento() else 'não iniciado'
+        raise TimeoutError(f'Download {situacao} após {timeout} segundos em {self.diretorio}.')
+
+    def _concluir(self, caminho, tamanho, duracao):
+        with self._lock:
+            self._metricas['downloads'] += 1
+            self._metricas['bytes'] += tamanho
+            self._metricas['tempo_total'] += duracao
+        logger.debug(f'Download concluído: {caminho} ({tamanho} bytes em {duracao:.2f}s).')
+        return caminho
+
+    def processar(self, caminho):
+        """
+        Entrega um arquivo ao pipeline de processamento em segundo plano.
+
+        Args:
+            caminho (str): Arquivo baixado.
+
+        Returns:
+            concurrent.futures.Future: Resultado da última etapa do pipeline.
+        """
+        if self._executor is None:
+            raise RuntimeError('Nenhum pipeline de processamento configurado.')
+
+        def executar():
+            resultado = caminho
+            for etapa in self.pipeline:
+                resultado = etapa(resultado)
+            return resultado
+
+        return self._executor.submit(executar)
+
+    def baixar(self, acao=None, timeout=60, padrao='*'):
+        """
+        Espera o download e já o envia ao pipeline.
+
+        Args:
+            acao (callable): Função que dispara o download (padrão: None).
+            timeout (float): Tempo máximo de espera em segundos (padrão: 60).
+            padrao (str): Padrão (fnmatch) do nome do arquivo esperado (padrão: '*').
+
+        Returns:
+            concurrent.futures.Future: Resultado do pipeline para o arquivo baixado.
+        """
+        return self.processar(self.esperar(acao, timeout, padrao))
+
+    def metricas(self):
+        """
+        Retorna as métricas de download.
+
+        Returns:
+            dict: Quantidade, bytes, tempo médio até a conclusão e vazão em MB/s.
+        """
+        with self._lock:
+            metricas = dict(self._metricas)
+        metricas['tempo_medio'] = metricas['tempo_total'] / metricas['downloads'] if metricas['downloads'] else 0.0
+        metricas['mb_por_segundo'] = metricas['bytes'] / (1024 * 1024) / metricas['tempo_total'] if metricas['tempo_total'] else 0.0
+        return metricas
+
+    def close(self, remover=False):
+        """
+        Aguarda o pipeline e, opcionalmente, remove o diretório isolado da sessão.
+
+        Args:
+            remover (bool): Remove o diretório da sessão quando isolado (padrão: False).
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if remover and self.isolado:
+            shutil.rmtree(self.diretorio, ignore_errors=True)
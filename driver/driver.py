@@ -1,21 +1,32 @@
+import time
+
+_inicio_importacao = time.perf_counter()
+
 import os
 import re
 import logging
-import sys
 from iterator.iteration import Interation
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as GeckoOptions
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 from selenium.common.exceptions import WebDriverException
-import undetected_chromedriver as uc
+from driver.resources import PerfilRecursos, ResourceMonitor
+from driver.downloads import DownloadManager
+from driver.cache import CacheInterceptor, ResponseCache
+from driver.grid import Grid, grid_padrao
+from driver.binaries import ServicoChrome, ServicoFirefox, resolver_driver, servico_compartilhado
+
+# Tempo de importação deste módulo; undetected_chromedriver e webdriver_manager só são importados quando usados
+TEMPO_IMPORTACAO = time.perf_counter() - _inicio_importacao
+
+CHROMEDRIVER_LOCAL = r'./driver/chromedriver.exe'
 
 class Driver(Interation):
     """Classe para gerenciar o WebDriver e as opções do navegador."""
 
-    def __init__(self, browser='chrome', headless=False, incognito=False, download_path='', remote=False, desabilitar_carregamento_imagem=False):
+    def __init__(self, browser='chrome', headless=False, incognito=False, download_path='', remote=False, desabilitar_carregamento_imagem=False,
+                 perfil_recursos=None, bloquear_urls=None, page_load_strategy='normal', user_data_dir=None, snapshot=None,
+                 isolar_downloads=False, pipeline_downloads=None, inicio_rapido=False, cache_respostas=None):
         """
         Inicializa um objeto Driver.
 
@@ -24,27 +35,118 @@ class Driver(Interation):
             headless (bool): Define se o navegador será executado em modo headless (padrão: False).
             incognito (bool): Define se o navegador será iniciado no modo incognito (padrão: False).
             download_path (str): O caminho para o diretório de downloads (padrão: '').
-            remote (bool): Define se a execução será remota (padrão: False).
+            remote (bool | str | Grid): Execução remota: True usa os nós da seção 'Grid' do config.yaml,
+                uma URL usa um único hub (um Grid compartilhado por URL) e um objeto Grid usa os seus nós (padrão: False).
             desabilitar_carregamento_imagem (bool): Define se o carregamento de imagens será desabilitado (padrão: False).
+            perfil_recursos (str | list): Perfil de bloqueio de recursos ('minimal', 'no-media', 'no-ads', 'text-only')
+                ou lista de categorias de driver.resources.CATEGORIAS (padrão: None).
+            bloquear_urls (list): Padrões de URL adicionais a bloquear, com curinga '*' (padrão: None).
+            page_load_strategy (str): Estratégia de carregamento: 'normal' (evento load), 'eager' (DOMContentLoaded)
+                ou 'none' (retorna logo após iniciar a navegação) (padrão: 'normal').
+            user_data_dir (str): Diretório de perfil do navegador (padrão: None, perfil temporário).
+            snapshot (SessionSnapshot): Snapshot de sessão restaurado ao iniciar; se tiver perfil salvo e
+                user_data_dir não for informado, uma cópia exclusiva do perfil é usada e apagada no quit (padrão: None).
+            isolar_downloads (bool): Usa um subdiretório exclusivo de download_path para esta sessão (padrão: False).
+            pipeline_downloads (list): Etapas de processamento dos arquivos baixados, ver driver.downloads (padrão: None).
+            inicio_rapido (bool): Reaproveita um único processo do chromedriver para todas as sessões do processo
+                Python, em vez de iniciar um novo a cada Driver (padrão: False).
+            cache_respostas (ResponseCache | str): Cache em disco das respostas HTTP, ou o diretório de um cache com
+                as regras padrão; só Chrome e Undetected Chromedriver, ver driver.cache (padrão: None).
         """
+        inicio = time.perf_counter()
+        self.inicio_rapido = inicio_rapido
+        self.tempos_inicializacao = {'importacao': TEMPO_IMPORTACAO, 'resolucao_driver': 0.0, 'processo_driver': 0.0, 'sessao': 0.0}
+        if page_load_strategy not in ('normal', 'eager', 'none'):
+            raise ValueError(f"page_load_strategy '{page_load_strategy}' inválida. Use 'normal', 'eager' ou 'none'.")
+        self.page_load_strategy = page_load_strategy
+        self.perfil = PerfilRecursos(perfil_recursos, bloquear_urls)
+        self.recursos = None
+        self.cache_respostas = ResponseCache(cache_respostas) if isinstance(cache_respostas, str) else cache_respostas
+        self.interceptador = None
+        self.snapshot = snapshot
+        # Cópia do perfil extraída só para esta instância: removida no quit, ou se a criação falhar
+        self._perfil_extraido = None
+        if user_data_dir is None and snapshot is not None and not remote:
+            user_data_dir = self._perfil_extraido = snapshot.preparar_perfil()
+        self.user_data_dir = user_data_dir
+
+        self.grid = None
+        if remote:
+            self.grid = remote if isinstance(remote, Grid) else grid_padrao(remote if isinstance(remote, str) else None)
+
         if download_path == '':
             download_path = self.get_download_dir()
+        self.downloads = DownloadManager(download_path, isolar=isolar_downloads, pipeline=pipeline_downloads)
+        download_path = self.downloads.diretorio
 
-        if remote:
-            if browser == 'chrome':
-                self.make_chrome(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
-            elif browser == 'firefox':
-                self.make_mozilla(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
+        try:
+            if remote:
+                if browser == 'chrome':
+                    self.make_chrome(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
+                elif browser == 'firefox':
+                    self.make_mozilla(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
+                else:
+                    raise ValueError(f'{browser} não suportado para acesso remoto.')
             else:
-                logging.error(f'{browser} não suportado para acesso remoto.')
-                sys.exit(1)
-        else:
-            if browser == 'chrome':
-                self.make_chrome(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
-            elif browser == 'firefox':
-                self.make_mozilla(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
-            elif browser == 'undetected_chromedriver':
-                self.make_uc(headless, incognito, download_path, desabilitar_carregamento_imagem)
+                if browser == 'chrome':
+                    self.make_chrome(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
+                elif browser == 'firefox':
+                    self.make_mozilla(headless, incognito, download_path, desabilitar_carregamento_imagem, remote)
+                elif browser == 'undetected_chromedriver':
+                    self.make_uc(headless, incognito, download_path, desabilitar_carregamento_imagem)
+        except BaseException:
+            if self._perfil_extraido:
+                snapshot.descartar_perfil(self._perfil_extraido)
+            raise
+        if self._perfil_extraido:
+            if hasattr(self, 'driver'):
+                self._descartar_perfil_no_quit()
+            else:
+                snapshot.descartar_perfil(self._perfil_extraido)
+
+        self.tempos_inicializacao['total'] = time.perf_counter() - inicio
+        logging.debug(self.relatorio_inicializacao())
+
+        if snapshot is not None and hasattr(self, 'driver'):
+            snapshot.restaurar(self.driver)
+
+    def _descartar_perfil_no_quit(self):
+        """
+        Faz o quit() da sessão remover a cópia do perfil extraída do snapshot.
+        """
+        quit_original = self.driver.quit
+        perfil = self._perfil_extraido
+
+        def encerrar():
+            try:
+                quit_original()
+            finally:
+                self.snapshot.descartar_perfil(perfil)
+
+        self.driver.quit = encerrar
+
+    def relatorio_inicializacao(self):
+        """
+        Retorna o relatório dos tempos de inicialização do navegador.
+
+        Returns:
+            str: Tempos, em ms, de importação, resolução do driver, início do processo do driver e criação da sessão.
+        """
+        return 'Inicialização do navegador: ' + ', '.join(
+            f'{etapa}={tempo * 1000:.0f}ms' for etapa, tempo in self.tempos_inicializacao.items())
+
+    def _registrar_sessao(self, inicio, service=None):
+        """
+        Separa o tempo de criação do WebDriver entre o início do processo do driver e a criação da sessão.
+
+        Args:
+            inicio (float): Instante (time.perf_counter) do início da criação.
+            service: Serviço do driver, com o tempo de início medido (padrão: None).
+        """
+        decorrido = time.perf_counter() - inicio
+        processo = getattr(service, 'tempo_inicio', 0.0)
+        self.tempos_inicializacao['processo_driver'] = processo
+        self.tempos_inicializacao['sessao'] = decorrido - processo
 
     def get_download_dir(self):
         """
@@ -70,8 +172,12 @@ class Driver(Interation):
             download_path (str): O caminho para o diretório de downloads.
             desabilitar_carregamento_imagem (bool): Define se o carregamento de imagens será desabilitado.
         """
-        # user_data_dir = os.path.join(os.getcwd(), 'appdata')
+        inicio = time.perf_counter()
+        import undetected_chromedriver as uc
+        self.tempos_inicializacao['importacao'] += time.perf_counter() - inicio
+
         options = uc.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
         options.add_argument('--disable-notifications')
         options.add_argument('--disable-extensions')
         options.add_argument('--disable-gpu')
@@ -89,10 +195,15 @@ class Driver(Interation):
             options.add_argument("--incognito")
         if desabilitar_carregamento_imagem:
             options.add_argument('--blink-settings=imagesEnabled=false')
+        if self.perfil:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
 
         try:
-            # self.driver = uc.Chrome(options, user_data_dir, log_level=4, headless=headless)
-            self.driver = uc.Chrome(options, log_level=3, headless=headless, driver_executable_path=r'./driver/chromedriver.exe')
+            inicio = time.perf_counter()
+            self.driver = uc.Chrome(options, user_data_dir=self.user_data_dir, log_level=3, headless=headless, driver_executable_path=CHROMEDRIVER_LOCAL)
+            self._registrar_sessao(inicio)
+            self._aplicar_perfil_chrome()
+            self._aplicar_cache_chrome()
         except WebDriverException as e:
             if 'This version of ChromeDriver only supports Chrome version' in str(e):
                 versao_chromedriver_suporta = re.search("ChromeDriver only supports Chrome version (\\d+)", str(e)).group(1)
@@ -100,7 +211,7 @@ class Driver(Interation):
                 logging.critical(f'Erro: Navegador está na versão {versao_navegador_cliente}. O ChromeDriver suporta apenas a vesão {versao_chromedriver_suporta}. Favor atualizar o Navegador.')
             else:
                 logging.critical('Erro ao instânciar Navegador.')
-                sys.exit(1)
+            raise
 
     def make_chrome(self, headless, incognito, download_path, desabilitar_carregamento_imagem, remote):
         """
@@ -113,42 +224,53 @@ class Driver(Interation):
             desabilitar_carregamento_imagem (bool): Define se o carregamento de imagens será desabilitado.
             remote (bool): Define se a execução será remota.
         """
-        # user_data_dir = os.path.join(os.getcwd(), 'appdata')
-        service = Service(executable_path=r'./driver/chromedriver.exe')
         options = ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+
+        if self.user_data_dir and not remote:
+            options.add_argument(f"--user-data-dir={self.user_data_dir}")
+        options.add_argument('--log-level=3')
+        options.add_argument('--disable-notifications')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-gpu')
+        options.add_argument("--no-sandbox")
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument("--safebrowsing-disable-download-protection")
+        options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        options.add_experimental_option('prefs',
+                                        {'download.prompt_for_download': False,
+                                         'credentials_enable_service': False,
+                                         'profile.password_manager_enabled': False,
+                                         'profile.default_content_setting_values.notifications': 2,
+                                         'profile.default_content_setting_values.automatic_downloads': 1,
+                                         'download.default_directory': download_path})
+
+        if headless:
+            options.add_argument('--headless')
+        if incognito:
+            options.add_argument("--incognito")
+        if desabilitar_carregamento_imagem:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+        if self.perfil:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
 
         if remote:
-            options.set_capability("browserVersion", "121.0")
-            options.set_capability("selenoid:options", {"enableVNC": True})
-            options.set_capability("selenoid:options", {"screenResolution ": "1280x1024x24"})
-            options.set_capability("selenoid:options", {"enableVideo": False})
-            self.driver = webdriver.Remote(command_executor="http://localhost:4444/wd/hub", options=options)
-        else:
-            # options.add_argument(f"--user-data-dir={user_data_dir}")
-            options.add_argument('--log-level=3')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-gpu')
-            options.add_argument("--no-sandbox")
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument("--safebrowsing-disable-download-protection")
-            options.add_experimental_option("excludeSwitches", ["enable-logging"])
-            options.add_experimental_option('prefs',
-                                            {'download.prompt_for_download': False,
-                                             'credentials_enable_service': False,
-                                             'profile.password_manager_enabled': False,
-                                             'profile.default_content_setting_values.notifications': 2,
-                                             'profile.default_content_setting_values.automatic_downloads': 1,
-                                             'download.default_directory': download_path})
-
-            if headless:
-                options.add_argument('--headless')
-            if incognito:
-                options.add_argument("--incognito")
-            if desabilitar_carregamento_imagem:
-                options.add_argument('--blink-settings=imagesEnabled=false')
+            inicio = time.perf_counter()
+            self.driver = self.grid.criar_sessao(options)
+            self._registrar_sessao(inicio)
+            self._aplicar_cache_chrome()
+            return
+
+        inicio = time.perf_counter()
+        executavel = CHROMEDRIVER_LOCAL if os.path.exists(CHROMEDRIVER_LOCAL) else resolver_driver('chrome')
+        self.tempos_inicializacao['resolucao_driver'] = time.perf_counter() - inicio
+        service = servico_compartilhado(executavel) if self.inicio_rapido else ServicoChrome(executable_path=executavel)
         try:
+            inicio = time.perf_counter()
             self.driver = webdriver.Chrome(service=service, options=options)
+            self._registrar_sessao(inicio, service)
+            self._aplicar_perfil_chrome()
+            self._aplicar_cache_chrome()
         except WebDriverException as e:
             if 'This version of ChromeDriver only supports Chrome version' in str(e):
                 versao_chromedriver_suporta = re.search("ChromeDriver only supports Chrome version (\\d+)", str(e)).group(1)
@@ -156,7 +278,7 @@ class Driver(Interation):
                 logging.critical(f'Erro: Navegador está na versão {versao_navegador_cliente}. O ChromeDriver suporta apenas a vesão {versao_chromedriver_suporta}. Favor atualizar o Navegador.')
             else:
                 logging.critical('Erro ao instânciar Navegador.')
-                sys.exit(1)
+            raise
 
     def make_mozilla(self, headless, incognito, download_path, desabilitar_carregamento_imagem, remote):
         """
@@ -169,40 +291,48 @@ class Driver(Interation):
             desabilitar_carregamento_imagem (bool): Define se o carregamento de imagens será desabilitado.
             remote (bool): Define se a execução será remota.
         """
-        user_data_dir = os.path.join(os.getcwd(), 'appdata')
-        service = Service(GeckoDriverManager().install())
         options = GeckoOptions()
+        options.page_load_strategy = self.page_load_strategy
+
+        options.add_argument('--log-level=4')
+        options.add_argument('--disable-notifications')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-plugins')
+        options.add_argument('--disable-gpu')
+        if self.user_data_dir and not remote:
+            options.add_argument('-profile')
+            options.add_argument(self.user_data_dir)
+
+        options.set_preference("browser.download.folderList", 2)
+        options.set_preference("browser.download.dir", download_path)
+        options.set_preference("browser.download.useDownloadDir", True)
+        options.set_preference("dom.webnotifications.enabled", False)
+        options.set_preference("layers.acceleration.disabled", True)
+        options.set_preference("toolkit.cosmeticAnimations.enabled", False)
+
+        if headless:
+            options.add_argument('--headless')
+        if incognito:
+            options.set_preference("browser.privatebrowsing.autostart", True)
+        if desabilitar_carregamento_imagem:
+            options.set_preference('permissions.default.image', 2)
+        self.perfil.aplicar_firefox(options)
+        if self.cache_respostas is not None:
+            logging.warning('Firefox não suporta interceptação via CDP: cache_respostas ignorado.')
 
         if remote:
-            options.set_capability("browserVersion", "121.0")
-            options.set_capability("selenoid:options", {"enableVNC": True})
-            options.set_capability("selenoid:options", {"screenResolution ": "1280x1024x24"})
-            options.set_capability("selenoid:options", {"enableVideo": False})
-            self.driver = webdriver.Remote(command_executor="http://localhost:4444/wd/hub", options=options)
-        else:
-            options.add_argument('--log-level=4')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-plugins')
-            options.add_argument('--disable-gpu')
-            options.add_argument(f"--user-data-dir={user_data_dir}")
-
-            options.set_preference("browser.download.folderList", 2)
-            options.set_preference("browser.download.dir", download_path)
-            options.set_preference("browser.download.useDownloadDir", True)
-            options.set_preference("dom.webnotifications.enabled", False)
-            options.set_preference("layers.acceleration.disabled", True)
-            options.set_preference("toolkit.cosmeticAnimations.enabled", False)
-
-            if headless:
-                options.add_argument('--headless')
-            if incognito:
-                options.set_preference("browser.privatebrowsing.autostart", True)
-            if desabilitar_carregamento_imagem:
-                options.add_argument('--blink-settings=imagesEnabled=false')
+            inicio = time.perf_counter()
+            self.driver = self.grid.criar_sessao(options)
+            self._registrar_sessao(inicio)
+            return
 
+        inicio = time.perf_counter()
+        service = ServicoFirefox(executable_path=resolver_driver('firefox'))
+        self.tempos_inicializacao['resolucao_driver'] = time.perf_counter() - inicio
         try:
+            inicio = time.perf_counter()
             self.driver = webdriver.Firefox(service=service, options=options)
+            self._registrar_sessao(inicio, service)
         except WebDriverException as e:
             if 'This version of ChromeDriver only supports Chrome version' in str(e):
                 versao_chromedriver_suporta = re.search("ChromeDriver only supports Chrome version (\\d+)", str(e)).group(1)
@@ -210,4 +340,22 @@ class Driver(Interation):
                 logging.critical(f'Erro: Navegador está na versão {versao_navegador_cliente}. O ChromeDriver suporta apenas a vesão {versao_chromedriver_suporta}. Favor atualizar o Navegador.')
             else:
                 logging.critical('Erro ao instânciar Navegador.')
-                sys.exit(1)
+            raise
+
+    def _aplicar_perfil_chrome(self):
+        """
+        Aplica o perfil de recursos na sessão do Chrome e inicia o monitor de bloqueios.
+        """
+        if not self.perfil:
+            return
+        self.perfil.aplicar_chrome(self.driver)
+        self.recursos = ResourceMonitor(self.driver)
+
+    def _aplicar_cache_chrome(self):
+        """
+        Liga o cache de respostas à sessão do Chrome.
+        """
+        if self.cache_respostas is None:
+            return
+        self.interceptador = CacheInterceptor(self.driver, self.cache_respostas)
+        self.interceptador.iniciar()
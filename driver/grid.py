@@ -0,0 +1,416 @@
+"""
+Módulo com o backend remoto (Selenium Grid / Selenoid).
+
+Os nós são lidos da seção 'Grid' do config.yaml. Cada nova sessão vai para o
+nó com mais vagas livres (e, no empate, menor latência), considerando também as
+vagas e a fila informadas pelo /status de cada nó (consultado no máximo uma vez
+a cada intervalo_status segundos); se a criação falhar, o nó fica em quarentena
+e a sessão é tentada no próximo. Os Drivers de um processo compartilham o mesmo
+Grid por URL (grid_padrao), para que a contagem de vagas seja única. Cada nó mantém uma
+única conexão HTTP persistente (keep-alive), compartilhada por todas as
+sessões abertas nele, e registra latência de comandos e tamanho da fila.
+
+Exemplo de configuração:
+    Grid:
+      nos:
+        - url: http://localhost:4444/wd/hub
+          capacidade: 5
+      selenoid:
+        enableVNC: true
+        screenResolution: 1280x1024x24
+"""
+import copy
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+import urllib3
+import yaml
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from utils.logger_config import logger
+
+URL_PADRAO = 'http://localhost:4444/wd/hub'
+
+SELENOID_PADRAO = {'enableVNC': True, 'screenResolution': '1280x1024x24', 'enableVideo': False}
+
+
+class _ConexaoPersistente(RemoteConnection):
+    """Conexão keep-alive de um nó, compartilhada pelas sessões e com medição de latência."""
+
+    def __init__(self, no, maxsize):
+        self.no = no
+        self.maxsize = maxsize
+        super().__init__(no.url, keep_alive=True)
+
+    def _get_connection_manager(self):
+        gerenciador = super()._get_connection_manager()
+        gerenciador.connection_pool_kw['maxsize'] = self.maxsize
+        return gerenciador
+
+    def execute(self, command, params):
+        inicio = time.perf_counter()
+        try:
+            return super().execute(command, params)
+        finally:
+            self.no.registrar_comando(time.perf_counter() - inicio)
+
+    def close(self):
+        # O WebDriver fecha a conexão no quit; aqui ela só é fechada junto com o Grid
+        pass
+
+    def encerrar(self):
+        if hasattr(self, '_conn'):
+            self._conn.clear()
+
+
+class GridNode:
+    """Nó do grid remoto e suas métricas."""
+
+    def __init__(self, url, capacidade=5, nome=None, capabilities=None, maxsize=10):
+        """
+        Inicializa um objeto GridNode.
+
+        Args:
+            url (str): URL do hub/nó (ex.: 'http://localhost:4444/wd/hub').
+            capacidade (int): Sessões simultâneas permitidas no nó (padrão: 5).
+            nome (str): Nome do nó nas métricas (padrão: None, usa a URL).
+            capabilities (dict): Capabilities adicionais das sessões criadas no nó (padrão: None).
+            maxsize (int): Conexões HTTP mantidas abertas com o nó (padrão: 10).
+        """
+        self.url = url.rstrip('/')
+        self.capacidade = capacidade
+        self.nome = nome or self.url
+        self.capabilities = capabilities or {}
+        self.conexao = _ConexaoPersistente(self, maxsize)
+        self.ativas = 0
+        self.quarentena_ate = 0.0
+        self.fila_remota = None
+        self.livres_remotas = None
+        self._lock = threading.Lock()
+        self._latencias = deque(maxlen=500)
+        self._metricas = {'sessoes_criadas': 0, 'falhas_criacao': 0, 'comandos': 0,
+                          'tempo_comandos': 0.0, 'tempo_criacao': 0.0}
+
+    @property
+    def disponivel(self):
+        return time.monotonic() >= self.quarentena_ate
+
+    @property
+    def livres(self):
+        livres = self.capacidade - self.ativas
+        if self.livres_remotas is not None:
+            livres = min(livres, self.livres_remotas)
+        return livres
+
+    def latencia_media(self):
+        with self._lock:
+            return statistics.fmean(self._latencias) if self._latencias else 0.0
+
+    def registrar_comando(self, duracao):
+        with self._lock:
+            self._latencias.append(duracao)
+            self._metricas['comandos'] += 1
+            self._metricas['tempo_comandos'] += duracao
+
+    def registrar_criacao(self, duracao, sucesso):
+        with self._lock:
+            self._metricas['sessoes_criadas' if sucesso else 'falhas_criacao'] += 1
+            self._metricas['tempo_criacao'] += duracao
+
+    def atualizar_status(self, timeout=5):
+        """
+        Consulta o endpoint /status do nó (Selenium Grid 4 ou Selenoid) e atualiza vagas e fila.
+
+        Args:
+            timeout (float): Tempo máximo da consulta em segundos (padrão: 5).
+
+        Returns:
+            bool: False se o nó não respondeu ou informou que não está pronto. Uma resposta que não
+                segue nenhum dos dois formatos deixa as vagas remotas como desconhecidas e retorna True.
+        """
+        try:
+            resposta = self.conexao._conn.request('GET', f'{self.url}/status', timeout=timeout, retries=False)
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            logger.warning(f'Nó {self.nome} não respondeu ao /status: {e}')
+            return False
+        try:
+            dados = json.loads(resposta.data.decode('utf-8'))
+            if resposta.status >= 400 or not isinstance(dados, dict):
+                raise ValueError(f'HTTP {resposta.status}')
+        except ValueError as e:
+            logger.debug(f'Nó {self.nome} sem /status utilizável ({e}); vagas remotas desconhecidas.')
+            self.livres_remotas = self.fila_remota = None
+            return True
+
+        if 'total' in dados:
+            # Selenoid
+            self.livres_remotas = dados.get('total', 0) - dados.get('used', 0)
+            self.fila_remota = dados.get('queued', 0) + dados.get('pending', 0)
+            return True
+
+        valor = dados.get('value', {})
+        slots = [slot for no in valor.get('nodes', []) if no.get('availability', 'UP') == 'UP' for slot in no.get('slots', [])]
+        if slots:
+            self.livres_remotas = sum(1 for slot in slots if not slot.get('session'))
+        return bool(valor.get('ready', True))
+
+    def metricas(self):
+        """
+        Retorna as métricas do nó.
+
+        Returns:
+            dict: Sessões ativas, vagas, fila remota, falhas e latências (ms) de comandos e de criação de sessão.
+        """
+        with self._lock:
+            metricas = dict(self._metricas)
+            latencias = sorted(self._latencias)
+        criacoes = metricas['sessoes_criadas'] + metricas['falhas_criacao']
+        metricas.update({
+            'ativas': self.ativas,
+            'capacidade': self.capacidade,
+            'livres': self.livres,
+            'fila_remota': self.fila_remota,
+            'em_quarentena': not self.disponivel,
+            'latencia_media_ms': metricas['tempo_comandos'] / metricas['comandos'] * 1000 if metricas['comandos'] else 0.0,
+            'latencia_p95_ms': latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else 0.0,
+            'criacao_media_ms': metricas['tempo_criacao'] / criacoes * 1000 if criacoes else 0.0,
+        })
+        return metricas
+
+
+class Grid:
+    """Balanceador de sessões entre os nós de um grid remoto."""
+
+    def __init__(self, nos=None, tentativas=2, quarentena=30, tempo_espera=60, selenoid=None, intervalo_status=10):
+        """
+        Inicializa um objeto Grid.
+
+        Args:
+            nos (list): URLs ou dicionários {'url', 'capacidade', 'nome', 'capabilities'} dos nós
+                (padrão: None, usa SELENIUM_REMOTE_URL ou 'http://localhost:4444/wd/hub').
+            tentativas (int): Tentativas de criação de sessão por nó antes de passar ao próximo (padrão: 2).
+            quarentena (int): Tempo, em segundos, que um nó com falha deixa de receber sessões (padrão: 30).
+            tempo_espera (int): Tempo máximo de espera por uma vaga quando todos os nós estão cheios (padrão: 60).
+            selenoid (dict): Opções 'selenoid:options' das sessões; None usa SELENOID_PADRAO, {} desativa (padrão: None).
+            intervalo_status (float): Intervalo mínimo, em segundos, entre consultas ao /status dos nós;
+                0 desativa a consulta (padrão: 10).
+        """
+        nos = nos or [os.environ.get('SELENIUM_REMOTE_URL', URL_PADRAO)]
+        self.nos = [GridNode(**no) if isinstance(no, dict) else GridNode(no) for no in nos]
+        self.tentativas = tentativas
+        self.quarentena = quarentena
+        self.tempo_espera = tempo_espera
+        self.selenoid = SELENOID_PADRAO if selenoid is None else selenoid
+        self.intervalo_status = intervalo_status
+        self._status_em = None
+        self._lock_status = threading.Lock()
+        self._vaga = threading.Condition()
+        self._aguardando = 0
+        self._metricas = {'failovers': 0, 'tempo_fila_total': 0.0, 'tempo_fila_max': 0.0, 'esperas': 0}
+
+    @classmethod
+    def from_config(cls, caminho='config.yaml'):
+        """
+        Cria o grid a partir da seção 'Grid' de um arquivo YAML.
+
+        Args:
+            caminho (str): Caminho do arquivo de configuração (padrão: 'config.yaml').
+
+        Returns:
+            Grid: Grid configurado; sem a seção 'Grid', usa o nó padrão.
+        """
+        config = {}
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as file:
+                config = (yaml.safe_load(file) or {}).get('Grid') or {}
+        return cls(**config)
+
+    def atualizar_status(self, forcar=False):
+        """
+        Consulta o /status de todos os nós; nós que não respondem entram em quarentena.
+
+        Args:
+            forcar (bool): Consulta mesmo que a última tenha sido há menos de intervalo_status segundos (padrão: False).
+        """
+        if not self.intervalo_status and not forcar:
+            return
+        with self._lock_status:
+            agora = time.monotonic()
+            if not forcar and self._status_em is not None and agora - self._status_em < self.intervalo_status:
+                return
+            self._status_em = agora
+            for no in self.nos:
+                if no.disponivel and not no.atualizar_status():
+                    no.quarentena_ate = time.monotonic() + self.quarentena
+            with self._vaga:
+                self._vaga.notify_all()
+
+    def _candidatos(self):
+        self.atualizar_status()
+        with self._vaga:
+            nos = [no for no in self.nos if no.disponivel and no.livres > 0]
+        return sorted(nos, key=lambda no: (-no.livres, no.latencia_media()))
+
+    def _configurar(self, options, no):
+        """
+        Retorna uma cópia das options com as capabilities do nó; as options de quem chamou
+        não são alteradas, para que as capabilities de um nó não vazem para o próximo no failover.
+        """
+        options = copy.deepcopy(options)
+        if self.selenoid:
+            options.set_capability('selenoid:options', {**self.selenoid, **options.capabilities.get('selenoid:options', {})})
+        for chave, valor in no.capabilities.items():
+            options.set_capability(chave, valor)
+        return options
+
+    def criar_sessao(self, options):
+        """
+        Cria uma sessão remota no nó com mais vagas, com failover para os demais nós.
+
+        Args:
+            options: Options do Selenium (ChromeOptions, FirefoxOptions) da sessão.
+
+        Returns:
+            WebDriver: Sessão remota; ao chamar quit() a vaga é devolvida ao nó.
+        """
+        erros = []
+        limite = time.monotonic() + self.tempo_espera
+        while True:
+            candidatos = self._esperar_vaga(limite)
+            for no in candidatos:
+                with self._vaga:
+                    if no.livres <= 0:
+                        continue
+                    no.ativas += 1
+                for tentativa in range(1, self.tentativas + 1):
+                    inicio = time.perf_counter()
+                    try:
+                        driver = webdriver.Remote(command_executor=no.conexao, options=self._configurar(options, no))
+                    except (WebDriverException, urllib3.exceptions.HTTPError, OSError) as e:
+                        no.registrar_criacao(time.perf_counter() - inicio, False)
+                        erros.append(f'{no.nome}: {e}')
+                        logger.warning(f'Falha ao criar sessão em {no.nome} (tentativa {tentativa}/{self.tentativas}): {e}')
+                        continue
+                    no.registrar_criacao(time.perf_counter() - inicio, True)
+                    logger.debug(f'Sessão remota criada em {no.nome} em {time.perf_counter() - inicio:.2f}s.')
+                    return self._vincular(driver, no)
+
+                with self._vaga:
+                    no.ativas -= 1
+                    no.quarentena_ate = time.monotonic() + self.quarentena
+                    self._metricas['failovers'] += 1
+                    self._vaga.notify_all()
+
+            if time.monotonic() >= limite or not any(no.disponivel for no in self.nos):
+                raise WebDriverException('Não foi possível criar a sessão remota em nenhum nó do grid:\n' + '\n'.join(erros))
+
+    def _esperar_vaga(self, limite):
+        """
+        Bloqueia até algum nó ter vaga livre.
+
+        Args:
+            limite (float): Instante (time.monotonic) máximo de espera.
+
+        Returns:
+            list: Nós candidatos, do melhor para o pior.
+        """
+        candidatos = self._candidatos()
+        if candidatos:
+            return candidatos
+
+        inicio = time.perf_counter()
+        with self._vaga:
+            self._aguardando += 1
+        try:
+            while not candidatos:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise TimeoutError(f'Nenhuma vaga livre no grid dentro do tempo limite de {self.tempo_espera} segundos.')
+                # Acorda periodicamente para reavaliar nós saindo da quarentena e o /status dos nós
+                with self._vaga:
+                    self._vaga.wait(min(restante, 1.0))
+                candidatos = self._candidatos()
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._vaga:
+                self._aguardando -= 1
+                self._metricas['esperas'] += 1
+                self._metricas['tempo_fila_total'] += espera
+                self._metricas['tempo_fila_max'] = max(self._metricas['tempo_fila_max'], espera)
+        return candidatos
+
+    def _vincular(self, driver, no):
+        """
+        Faz o quit() da sessão devolver a vaga ao nó.
+
+        Args:
+            driver: Sessão remota criada.
+            no (GridNode): Nó onde a sessão foi criada.
+
+        Returns:
+            WebDriver: A mesma sessão.
+        """
+        quit_original = driver.quit
+        liberada = threading.Event()
+
+        def encerrar():
+            try:
+                quit_original()
+            finally:
+                if not liberada.is_set():
+                    liberada.set()
+                    with self._vaga:
+                        no.ativas -= 1
+                        self._vaga.notify_all()
+
+        driver.quit = encerrar
+        driver.grid_node = no.nome
+        return driver
+
+    def metricas(self):
+        """
+        Retorna as métricas do grid e de cada nó.
+
+        Returns:
+            dict: Failovers, espera na fila local e métricas por nó.
+        """
+        with self._vaga:
+            metricas = dict(self._metricas)
+            metricas['aguardando'] = self._aguardando
+        metricas['tempo_fila_medio'] = metricas['tempo_fila_total'] / metricas['esperas'] if metricas['esperas'] else 0.0
+        metricas['nos'] = {no.nome: no.metricas() for no in self.nos}
+        return metricas
+
+    def close(self):
+        """
+        Fecha as conexões HTTP persistentes com os nós.
+        """
+        for no in self.nos:
+            no.conexao.encerrar()
+
+
+_grids = {}
+_lock_grid = threading.Lock()
+
+
+def grid_padrao(url=None) -> Grid:
+    """
+    Retorna o grid compartilhado pelos Drivers do processo, criado no primeiro uso.
+
+    Args:
+        url (str): URL de um único hub; None usa os nós da seção 'Grid' do config.yaml (padrão: None).
+
+    Returns:
+        Grid: Grid do config.yaml ou da URL, o mesmo objeto em todas as chamadas.
+    """
+    with _lock_grid:
+        chave = url.rstrip('/') if url else None
+        if chave not in _grids:
+            _grids[chave] = Grid([chave]) if chave else Grid.from_config()
+        return _grids[chave]
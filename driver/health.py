@@ -0,0 +1,76 @@
+"""
+Módulo com a detecção rápida de sessões mortas do WebDriver.
+
+Quando o navegador trava ou fecha, o próximo comando pode ficar bloqueado
+até o timeout do driver (dezenas de segundos). Aqui a sessão é verificada com
+uma requisição curta, com timeout próprio, e as exceções são classificadas
+para decidir se vale reiniciar o navegador.
+"""
+import urllib3
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+
+# Trechos das mensagens de erro do chromedriver/geckodriver para sessão perdida
+MENSAGENS_SESSAO_MORTA = (
+    'invalid session id',
+    'session deleted',
+    'chrome not reachable',
+    'disconnected: ',
+    'target window already closed',
+    'no such window',
+    'browsing context has been discarded',
+    'failed to decode response from marionette',
+    'tried to run command without establishing a connection',
+    'connection refused',
+    'max retries exceeded',
+)
+
+
+def sessao_morta(erro):
+    """
+    Verifica se uma exceção indica que a sessão do navegador foi perdida.
+
+    Args:
+        erro (Exception): Exceção levantada por um comando.
+
+    Returns:
+        bool: True se o navegador deve ser reiniciado.
+    """
+    if isinstance(erro, (InvalidSessionIdException, NoSuchWindowException, ConnectionError, urllib3.exceptions.HTTPError)):
+        return True
+    if isinstance(erro, WebDriverException):
+        mensagem = str(erro).lower()
+        return any(trecho in mensagem for trecho in MENSAGENS_SESSAO_MORTA)
+    return False
+
+
+def sessao_viva(driver, timeout=2.0):
+    """
+    Verifica, sem esperar o timeout do driver, se a sessão ainda responde.
+
+    Confere primeiro se o processo do driver local ainda existe e depois pede a janela
+    atual da sessão diretamente ao servidor, com timeout curto.
+
+    Args:
+        driver: Objeto WebDriver do Selenium.
+        timeout (float): Tempo máximo da verificação em segundos (padrão: 2.0).
+
+    Returns:
+        bool: True se a sessão respondeu normalmente.
+    """
+    if driver is None or not getattr(driver, 'session_id', None):
+        return False
+
+    servico = getattr(driver, 'service', None)
+    processo = getattr(servico, 'process', None)
+    if processo is not None and processo.poll() is not None:
+        return False
+
+    url = getattr(servico, 'service_url', None) or getattr(driver.command_executor, '_url', None)
+    if not url:
+        return True
+    try:
+        resposta = urllib3.request('GET', f'{url.rstrip("/")}/session/{driver.session_id}/window',
+                                   timeout=timeout, retries=False)
+    except (urllib3.exceptions.HTTPError, OSError):
+        return False
+    return resposta.status == 200
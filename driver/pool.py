@@ -0,0 +1,324 @@
+"""
+Módulo com o pool de sessões do WebDriver.
+
+Mantém N navegadores já iniciados para que os bots peguem uma sessão
+emprestada em vez de abrir um Chrome do zero a cada execução.
+"""
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from driver.driver import Driver
+from utils.logger_config import logger
+
+
+class _Sessao:
+    """Sessão do WebDriver mantida pelo pool."""
+
+    __slots__ = ('driver', 'usos', 'criada_em')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.usos = 0
+        self.criada_em = time.monotonic()
+
+
+class DriverPool:
+    """Pool de sessões do WebDriver pré-inicializadas."""
+
+    def __init__(self, tamanho=2, max_usos=50, max_memoria_mb=None, tempo_espera=60, aquecer=True, **driver_kwargs):
+        """
+        Inicializa um objeto DriverPool.
+
+        Args:
+            tamanho (int): Quantidade máxima de navegadores mantidos pelo pool (padrão: 2).
+            max_usos (int): Quantidade de empréstimos antes de reciclar a sessão (padrão: 50).
+            max_memoria_mb (float): Heap JS da aba atual, em MB, a partir do qual a sessão é reciclada; não é a
+                memória total do navegador (padrão: None, sem limite).
+            tempo_espera (int): Tempo máximo de espera por uma sessão livre em segundos (padrão: 60).
+            aquecer (bool): Define se os navegadores serão iniciados imediatamente (padrão: True).
+            **driver_kwargs: Argumentos repassados para a classe Driver.
+        """
+        self.tamanho = tamanho
+        self.max_usos = max_usos
+        self.max_memoria_mb = max_memoria_mb
+        self.tempo_espera = tempo_espera
+        self.driver_kwargs = driver_kwargs
+
+        self._livres = queue.Queue()
+        self._emprestadas = {}
+        self._criadas = 0
+        self._lock = threading.Lock()
+        self._fechado = False
+        self._metricas = {
+            'hits': 0,
+            'misses': 0,
+            'criadas': 0,
+            'recicladas': 0,
+            'falhas_health_check': 0,
+            'tempo_espera_total': 0.0,
+            'tempo_espera_max': 0.0,
+        }
+
+        if aquecer:
+            self.aquecer()
+
+    def aquecer(self):
+        """
+        Inicia os navegadores que ainda faltam para completar o pool.
+        """
+        while True:
+            with self._lock:
+                if self._criadas >= self.tamanho:
+                    return
+                self._criadas += 1
+            self._livres.put(self._criar_sessao())
+
+    def _criar_sessao(self):
+        """
+        Cria uma nova sessão do WebDriver.
+
+        Returns:
+            _Sessao: Sessão criada.
+        """
+        inicio = time.perf_counter()
+        try:
+            driver = Driver(**self.driver_kwargs).driver
+        except BaseException:
+            # Devolve a vaga reservada por quem chamou, senão o pool encolhe a cada falha
+            with self._lock:
+                self._criadas -= 1
+            raise
+        with self._lock:
+            self._metricas['criadas'] += 1
+        logger.debug(f'Sessão criada pelo pool em {time.perf_counter() - inicio:.2f}s.')
+        return _Sessao(driver)
+
+    def acquire(self, timeout=None):
+        """
+        Pega uma sessão emprestada do pool.
+
+        Args:
+            timeout (int): Tempo máximo de espera em segundos (padrão: tempo_espera do pool).
+
+        Returns:
+            WebDriver: Sessão do WebDriver pronta para uso.
+        """
+        if self._fechado:
+            raise RuntimeError('O pool de navegadores já foi encerrado.')
+
+        timeout = self.tempo_espera if timeout is None else timeout
+        inicio = time.perf_counter()
+        hit = True
+
+        try:
+            sessao = self._livres.get_nowait()
+        except queue.Empty:
+            hit = False
+            sessao = None
+            with self._lock:
+                pode_criar = self._criadas < self.tamanho
+                if pode_criar:
+                    self._criadas += 1
+            if pode_criar:
+                sessao = self._criar_sessao()
+            else:
+                try:
+                    sessao = self._livres.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f'Nenhuma sessão livre no pool dentro do tempo limite de {timeout} segundos.')
+
+        if not self._saudavel(sessao):
+            hit = False
+            sessao = self._reciclar(sessao)
+
+        espera = time.perf_counter() - inicio
+        with self._lock:
+            self._metricas['hits' if hit else 'misses'] += 1
+            self._metricas['tempo_espera_total'] += espera
+            self._metricas['tempo_espera_max'] = max(self._metricas['tempo_espera_max'], espera)
+            sessao.usos += 1
+            self._emprestadas[id(sessao.driver)] = sessao
+        return sessao.driver
+
+    def release(self, driver):
+        """
+        Devolve uma sessão ao pool, limpando o seu estado.
+
+        Args:
+            driver (WebDriver): Sessão obtida por acquire.
+        """
+        with self._lock:
+            sessao = self._emprestadas.pop(id(driver), None)
+        if sessao is None:
+            logger.warning('Sessão devolvida não pertence ao pool.')
+            return
+
+        if self._fechado:
+            self._encerrar(sessao)
+            return
+
+        if sessao.usos >= self.max_usos or self._memoria_excedida(sessao) or not self._resetar(sessao):
+            try:
+                sessao = self._reciclar(sessao)
+            except Exception as e:
+                # release() roda no finally do lease(): uma falha aqui esconderia o erro de quem usava
+                # a sessão. A vaga já foi devolvida e a próxima acquire() cria uma sessão nova.
+                logger.error(f'Falha ao recriar sessão do pool: {type(e).__name__}: {e}')
+                return
+        self._livres.put(sessao)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Empresta uma sessão do pool dentro de um bloco with.
+
+        Args:
+            timeout (int): Tempo máximo de espera em segundos (padrão: tempo_espera do pool).
+
+        Exemplo de uso:
+            with pool.lease() as driver:
+                Interation(driver).load_page('https://www.example.com')
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def _saudavel(self, sessao):
+        """
+        Verifica se a sessão ainda responde aos comandos.
+
+        Args:
+            sessao (_Sessao): Sessão a ser verificada.
+
+        Returns:
+            bool: True se a sessão estiver respondendo, False caso contrário.
+        """
+        try:
+            sessao.driver.execute_script('return 1;')
+            return True
+        except WebDriverException:
+            with self._lock:
+                self._metricas['falhas_health_check'] += 1
+            return False
+
+    def _memoria_excedida(self, sessao):
+        """
+        Verifica se o heap JS da sessão passou do limite configurado.
+
+        Mede só o performance.memory.usedJSHeapSize da aba atual (disponível no Chrome), não a
+        memória do processo do navegador: DOM, imagens, GPU e outras abas ficam de fora.
+
+        Args:
+            sessao (_Sessao): Sessão a ser verificada.
+
+        Returns:
+            bool: True se o limite de memória foi excedido, False caso contrário.
+        """
+        if self.max_memoria_mb is None:
+            return False
+        try:
+            usado = sessao.driver.execute_script(
+                'return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;')
+        except WebDriverException:
+            return True
+        return usado is not None and usado / (1024 * 1024) > self.max_memoria_mb
+
+    def _resetar(self, sessao):
+        """
+        Limpa cookies, storage, abas extras e downloads da sessão.
+
+        Args:
+            sessao (_Sessao): Sessão a ser limpa.
+
+        Returns:
+            bool: True se a limpeza foi concluída, False caso contrário.
+        """
+        driver = sessao.driver
+        try:
+            abas = driver.window_handles
+            for aba in abas[1:]:
+                driver.switch_to.window(aba)
+                driver.close()
+            driver.switch_to.window(abas[0])
+            driver.delete_all_cookies()
+            driver.execute_script('try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}')
+            download_path = self.driver_kwargs.get('download_path')
+            if download_path and hasattr(driver, 'execute_cdp_cmd'):
+                driver.execute_cdp_cmd('Browser.setDownloadBehavior', {'behavior': 'allow', 'downloadPath': download_path})
+            driver.get('about:blank')
+            return True
+        except WebDriverException as e:
+            logger.warning(f'Falha ao limpar sessão do pool: {e}')
+            return False
+
+    def _reciclar(self, sessao):
+        """
+        Encerra uma sessão e cria outra no lugar.
+
+        Args:
+            sessao (_Sessao): Sessão a ser reciclada.
+
+        Returns:
+            _Sessao: Nova sessão.
+        """
+        self._encerrar(sessao)
+        with self._lock:
+            self._criadas += 1
+            self._metricas['recicladas'] += 1
+        return self._criar_sessao()
+
+    def _encerrar(self, sessao):
+        """
+        Encerra o navegador de uma sessão.
+
+        Args:
+            sessao (_Sessao): Sessão a ser encerrada.
+        """
+        with self._lock:
+            self._criadas -= 1
+        try:
+            sessao.driver.quit()
+        except WebDriverException:
+            pass
+
+    def metricas(self):
+        """
+        Retorna as métricas de uso do pool.
+
+        Returns:
+            dict: Hits, misses, sessões criadas/recicladas e tempos de espera.
+        """
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas['emprestadas'] = len(self._emprestadas)
+        metricas['livres'] = self._livres.qsize()
+        total = metricas['hits'] + metricas['misses']
+        metricas['hit_rate'] = metricas['hits'] / total if total else 0.0
+        metricas['tempo_espera_medio'] = metricas['tempo_espera_total'] / total if total else 0.0
+        return metricas
+
+    def close(self):
+        """
+        Encerra todos os navegadores livres do pool.
+
+        Sessões emprestadas são encerradas quando devolvidas.
+        """
+        self._fechado = True
+        while True:
+            try:
+                self._encerrar(self._livres.get_nowait())
+            except queue.Empty:
+                break
+        logger.info(f'Pool de navegadores encerrado. Métricas: {self.metricas()}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
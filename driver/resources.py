@@ -0,0 +1,217 @@
+"""
+Módulo com os perfis de bloqueio de recursos do navegador.
+
+No Chrome/Undetected Chromedriver os padrões de URL são aplicados via CDP
+(Network.setBlockedURLs); no Firefox cada categoria é traduzida para as
+preferências equivalentes. O bloqueio do CDP vale só para a aba em que foi
+aplicado: a sessão guarda o perfil em driver.perfil_recursos, e abas novas
+(como as do TabPool) precisam chamar aplicar_chrome depois de abertas.
+"""
+import json
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.logger_config import logger
+
+
+def _extensoes(*extensoes):
+    """
+    Gera os padrões de URL que casam só com a extensão no fim do caminho (com ou sem query/fragmento),
+    para que um host como 'shop.gifts.com' não seja confundido com um '.gif'.
+    """
+    return [padrao for ext in extensoes for padrao in (f'*.{ext}', f'*.{ext}?*', f'*.{ext}#*')]
+
+
+# Categorias de recursos: padrões de URL (Chrome) e preferências equivalentes (Firefox)
+CATEGORIAS = {
+    'imagens': {
+        'padroes': _extensoes('png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp', 'avif'),
+        'firefox': {'permissions.default.image': 2},
+    },
+    'fontes': {
+        'padroes': _extensoes('woff', 'woff2', 'ttf', 'otf', 'eot'),
+        'firefox': {'browser.display.use_document_fonts': 0, 'gfx.downloadable_fonts.enabled': False},
+    },
+    'midia': {
+        'padroes': _extensoes('mp4', 'webm', 'm3u8', 'mp3', 'ogg', 'wav', 'mov', 'flv'),
+        'firefox': {'media.autoplay.default': 5, 'media.preload.default': 0},
+    },
+    'estilos': {
+        'padroes': _extensoes('css'),
+        'firefox': {'permissions.default.stylesheet': 2},
+    },
+    'anuncios': {
+        'padroes': ['*doubleclick.net*', '*googlesyndication.com*', '*googleadservices.com*', '*adservice.google.*',
+                    '*amazon-adsystem.com*', '*adnxs.com*', '*taboola.com*', '*outbrain.com*', '*criteo.com*'],
+        'firefox': {'privacy.trackingprotection.enabled': True},
+    },
+    'analytics': {
+        'padroes': ['*google-analytics.com*', '*googletagmanager.com*', '*hotjar.com*', '*connect.facebook.net*',
+                    '*segment.com*', '*mixpanel.com*', '*clarity.ms*', '*nr-data.net*'],
+        'firefox': {'privacy.trackingprotection.enabled': True},
+    },
+}
+
+PERFIS = {
+    'minimal': ('imagens', 'fontes', 'midia', 'anuncios', 'analytics'),
+    'no-media': ('imagens', 'midia'),
+    'no-ads': ('anuncios', 'analytics'),
+    'text-only': ('imagens', 'fontes', 'midia', 'estilos', 'anuncios', 'analytics'),
+}
+
+# Tamanho médio (bytes) usado para estimar a economia enquanto não há amostras do próprio tipo
+TAMANHO_MEDIO = {
+    'Image': 40_000,
+    'Font': 35_000,
+    'Media': 500_000,
+    'Stylesheet': 20_000,
+    'Script': 30_000,
+}
+TAMANHO_MEDIO_OUTROS = 5_000
+
+
+class PerfilRecursos:
+    """Conjunto resolvido de bloqueios para uma sessão."""
+
+    def __init__(self, perfil=None, bloquear_urls=None):
+        """
+        Inicializa um objeto PerfilRecursos.
+
+        Args:
+            perfil (str | list): Nome de um perfil de PERFIS ou lista de categorias de CATEGORIAS (padrão: None).
+            bloquear_urls (list): Padrões de URL adicionais, com curinga '*' (padrão: None).
+        """
+        if perfil is None:
+            categorias = []
+        elif isinstance(perfil, str):
+            if perfil not in PERFIS:
+                raise ValueError(f"Perfil de recursos '{perfil}' não existe. Opções: {', '.join(PERFIS)}.")
+            categorias = list(PERFIS[perfil])
+        else:
+            categorias = list(perfil)
+
+        desconhecidas = [c for c in categorias if c not in CATEGORIAS]
+        if desconhecidas:
+            raise ValueError(f"Categorias de recursos desconhecidas: {', '.join(desconhecidas)}.")
+
+        self.categorias = categorias
+        self.bloquear_urls = list(bloquear_urls or [])
+        self.padroes = [p for c in categorias for p in CATEGORIAS[c]['padroes']] + self.bloquear_urls
+        self.prefs_firefox = {}
+        for categoria in categorias:
+            self.prefs_firefox.update(CATEGORIAS[categoria]['firefox'])
+
+    def __bool__(self):
+        return bool(self.padroes)
+
+    def aplicar_chrome(self, driver):
+        """
+        Aplica os bloqueios na aba atual de uma sessão do Chrome via CDP e guarda o perfil
+        em driver.perfil_recursos, para ser reaplicado nas abas abertas depois.
+
+        Args:
+            driver: WebDriver do Chrome ou Undetected Chromedriver.
+        """
+        if not self.padroes:
+            return
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            logger.warning('Sessão sem suporte a CDP: bloqueio de recursos ignorado.')
+            return
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.padroes})
+        driver.perfil_recursos = self
+
+    def aplicar_firefox(self, options):
+        """
+        Aplica as preferências equivalentes nas opções do Firefox.
+
+        Args:
+            options: Opções do Firefox (selenium.webdriver.firefox.options.Options).
+        """
+        for nome, valor in self.prefs_firefox.items():
+            options.set_preference(nome, valor)
+        if self.bloquear_urls:
+            logger.warning('Firefox não suporta bloqueio por padrão de URL: bloquear_urls ignorado.')
+
+
+class ResourceMonitor:
+    """Contabiliza requisições bloqueadas e bytes economizados por página (Chrome)."""
+
+    def __init__(self, driver):
+        """
+        Inicializa um objeto ResourceMonitor.
+
+        A sessão precisa ter sido criada com a capability goog:loggingPrefs performance=ALL,
+        o que a classe Driver faz automaticamente quando há um perfil de recursos.
+
+        Args:
+            driver: WebDriver do Chrome ou Undetected Chromedriver.
+        """
+        self.driver = driver
+        self._requisicoes = {}
+        self._tamanhos = {}
+        self._paginas = {}
+
+    def _pagina(self, url):
+        return self._paginas.setdefault(url, {
+            'requisicoes': 0, 'bloqueadas': 0, 'bytes_carregados': 0, 'bytes_economizados': 0, 'bloqueadas_por_tipo': {}})
+
+    def _tamanho_estimado(self, tipo):
+        quantidade, total = self._tamanhos.get(tipo, (0, 0))
+        if quantidade:
+            return total // quantidade
+        return TAMANHO_MEDIO.get(tipo, TAMANHO_MEDIO_OUTROS)
+
+    def coletar(self):
+        """
+        Lê os eventos de rede pendentes no log de performance e atualiza os contadores.
+
+        Returns:
+            dict: Contadores por URL de página (requisições, bloqueadas, bytes carregados e economizados).
+        """
+        try:
+            entradas = self.driver.get_log('performance')
+        except WebDriverException:
+            logger.warning('Log de performance indisponível: contadores de recursos não atualizados.')
+            return self.estatisticas()
+
+        bloqueadas = []
+        for entrada in entradas:
+            mensagem = json.loads(entrada['message'])['message']
+            metodo, params = mensagem.get('method'), mensagem.get('params', {})
+
+            if metodo == 'Network.requestWillBeSent':
+                self._requisicoes[params['requestId']] = (params.get('documentURL', ''), params.get('type', 'Other'))
+                self._pagina(params.get('documentURL', ''))['requisicoes'] += 1
+            elif metodo == 'Network.loadingFinished':
+                pagina, tipo = self._requisicoes.pop(params['requestId'], ('', 'Other'))
+                tamanho = int(params.get('encodedDataLength', 0))
+                self._pagina(pagina)['bytes_carregados'] += tamanho
+                quantidade, total = self._tamanhos.get(tipo, (0, 0))
+                self._tamanhos[tipo] = (quantidade + 1, total + tamanho)
+            elif metodo == 'Network.loadingFailed':
+                pagina, tipo = self._requisicoes.pop(params['requestId'], ('', 'Other'))
+                if params.get('blockedReason'):
+                    bloqueadas.append((pagina, tipo))
+
+        # A estimativa usa as médias já atualizadas com os recursos carregados neste lote
+        for pagina, tipo in bloqueadas:
+            contadores = self._pagina(pagina)
+            contadores['bloqueadas'] += 1
+            contadores['bytes_economizados'] += self._tamanho_estimado(tipo)
+            contadores['bloqueadas_por_tipo'][tipo] = contadores['bloqueadas_por_tipo'].get(tipo, 0) + 1
+
+        return self.estatisticas()
+
+    def estatisticas(self):
+        """
+        Retorna os contadores acumulados.
+
+        Returns:
+            dict: {'paginas': {url: contadores}, 'total': contadores somados}.
+        """
+        total = {'requisicoes': 0, 'bloqueadas': 0, 'bytes_carregados': 0, 'bytes_economizados': 0}
+        for contadores in self._paginas.values():
+            for chave in total:
+                total[chave] += contadores[chave]
+        return {'paginas': {url: dict(c) for url, c in self._paginas.items()}, 'total': total}
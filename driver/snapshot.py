@@ -0,0 +1,256 @@
+"""
+Módulo com os snapshots de sessão do navegador.
+
+Salva cookies, localStorage/sessionStorage e, opcionalmente, o diretório de
+perfil compactado depois de um login, para restaurar na próxima execução sem
+repetir o login nem baixar de novo os arquivos estáticos em cache.
+Cada conta tem o seu próprio diretório, e vários workers podem usar o mesmo
+snapshot ao mesmo tempo: as gravações são atômicas e protegidas por lock, e
+cada worker recebe uma cópia própria do perfil.
+"""
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.logger_config import logger
+
+LER_STORAGE = """
+const ler = s => { const r = {}; for (let i = 0; i < s.length; i++) { const k = s.key(i); r[k] = s.getItem(k); } return r; };
+return {origem: location.origin, local: ler(localStorage), session: ler(sessionStorage)};
+"""
+
+GRAVAR_STORAGE = """
+const [local, session] = arguments;
+for (const [k, v] of Object.entries(local)) localStorage.setItem(k, v);
+for (const [k, v] of Object.entries(session)) sessionStorage.setItem(k, v);
+"""
+
+
+class _Lock:
+    """
+    Lock entre processos baseado na criação exclusiva de um arquivo.
+
+    Um lock sem renovação há mais de 'expira' segundos é considerado abandonado; operações
+    longas (compactar ou extrair um perfil grande) chamam renovar() enquanto avançam.
+    """
+
+    def __init__(self, caminho, timeout=30, expira=120):
+        self.caminho = caminho
+        self.timeout = timeout
+        self.expira = expira
+        self._renovado = 0.0
+
+    def renovar(self, intervalo=5):
+        """
+        Atualiza a data do arquivo de lock, no máximo uma vez a cada intervalo segundos.
+        """
+        if time.monotonic() - self._renovado >= intervalo:
+            self._renovado = time.monotonic()
+            try:
+                os.utime(self.caminho)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        limite = time.monotonic() + self.timeout
+        while True:
+            try:
+                os.close(os.open(self.caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                self._renovado = time.monotonic()
+                return self
+            except FileExistsError:
+                # Lock abandonado por um processo que morreu
+                try:
+                    if time.time() - os.path.getmtime(self.caminho) > self.expira:
+                        os.remove(self.caminho)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() > limite:
+                    raise TimeoutError(f'Não foi possível obter o lock {self.caminho}.')
+                time.sleep(0.1)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.caminho)
+        except FileNotFoundError:
+            pass
+
+
+class SessionSnapshot:
+    """Snapshot persistente da sessão de uma conta."""
+
+    def __init__(self, conta='default', diretorio='sessoes', validade=24 * 3600):
+        """
+        Inicializa um objeto SessionSnapshot.
+
+        Args:
+            conta (str): Identificador da conta; cada conta tem o seu snapshot (padrão: 'default').
+            diretorio (str): Diretório base dos snapshots (padrão: 'sessoes').
+            validade (int): Tempo de validade do snapshot em segundos; None para não expirar (padrão: 24h).
+        """
+        self.conta = conta
+        self.validade = validade
+        self.diretorio = os.path.join(diretorio, conta)
+        self.arquivo_estado = os.path.join(self.diretorio, 'estado.json')
+        self.arquivo_perfil = os.path.join(self.diretorio, 'perfil.tar.gz')
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def _lock(self):
+        return _Lock(os.path.join(self.diretorio, '.lock'))
+
+    def valido(self):
+        """
+        Verifica se existe um snapshot dentro da validade.
+
+        Returns:
+            bool: True se o snapshot existe e não expirou.
+        """
+        if not os.path.exists(self.arquivo_estado):
+            return False
+        if self.validade is None:
+            return True
+        return time.time() - os.path.getmtime(self.arquivo_estado) < self.validade
+
+    def salvar(self, driver, origens=None, perfil_dir=None):
+        """
+        Salva cookies e storage da sessão e, opcionalmente, o perfil do navegador.
+
+        Args:
+            driver: Objeto WebDriver do Selenium, já logado.
+            origens (list): URLs cujas origens terão o storage salvo; o navegador visita cada uma
+                (padrão: None, só a página atual).
+            perfil_dir (str): Diretório de perfil (user-data-dir) a compactar junto (padrão: None).
+        """
+        storages = [driver.execute_script(LER_STORAGE)]
+        for origem in origens or []:
+            if urlparse(origem).netloc != urlparse(storages[0]['origem']).netloc:
+                driver.get(origem)
+                storages.append(driver.execute_script(LER_STORAGE))
+
+        estado = {
+            'conta': self.conta,
+            'criado_em': time.time(),
+            'cookies': driver.get_cookies(),
+            'storage': storages,
+        }
+
+        with self._lock() as lock:
+            self._gravar_atomico(self.arquivo_estado, lambda f: f.write(json.dumps(estado).encode('utf-8')))
+            if perfil_dir:
+                self._gravar_atomico(self.arquivo_perfil, lambda f: self._compactar(perfil_dir, f, lock))
+        logger.info(f"Snapshot da conta '{self.conta}' salvo com {len(estado['cookies'])} cookies.")
+
+    def _gravar_atomico(self, destino, escrever):
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as file:
+                escrever(file)
+            os.replace(temporario, destino)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    @staticmethod
+    def _compactar(perfil_dir, file, lock):
+        # Arquivos de lock/sockets do Chrome impedem reabrir o perfil em outra instância
+        ignorar = {'SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'parent.lock'}
+
+        def filtrar(info):
+            lock.renovar()
+            return None if os.path.basename(info.name) in ignorar else info
+
+        with tarfile.open(fileobj=file, mode='w:gz') as tar:
+            tar.add(perfil_dir, arcname='.', filter=filtrar)
+
+    def preparar_perfil(self, destino=None):
+        """
+        Extrai o perfil salvo em um diretório exclusivo para uma nova instância do navegador.
+
+        O diretório criado deve ser removido com descartar_perfil quando a instância terminar
+        (a classe Driver faz isso no quit).
+
+        Args:
+            destino (str): Diretório de destino (padrão: None, cria um diretório temporário).
+
+        Returns:
+            str | None: Caminho do perfil extraído, ou None se não houver perfil válido salvo.
+        """
+        if not os.path.exists(self.arquivo_perfil) or not self.valido():
+            return None
+        destino = destino or tempfile.mkdtemp(prefix=f'perfil_{self.conta}_')
+        with self._lock() as lock:
+            with tarfile.open(self.arquivo_perfil, 'r:gz') as tar:
+                for membro in tar:
+                    lock.renovar()
+                    tar.extract(membro, destino, filter='data')
+        return destino
+
+    def restaurar(self, driver):
+        """
+        Restaura cookies e storage salvos na sessão.
+
+        Args:
+            driver: Objeto WebDriver do Selenium.
+
+        Returns:
+            bool: True se o snapshot foi restaurado, False se não existe ou expirou.
+        """
+        if not self.valido():
+            return False
+        with self._lock():
+            with open(self.arquivo_estado, 'r', encoding='utf-8') as file:
+                estado = json.load(file)
+
+        agora = time.time()
+        cookies = [c for c in estado['cookies'] if c.get('expiry') is None or c['expiry'] > agora]
+        storages = {s['origem']: s for s in estado['storage'] if s.get('origem', 'null') != 'null'}
+
+        # Cookies só podem ser adicionados estando em uma página do domínio
+        origens = dict(storages)
+        for cookie in cookies:
+            dominio = cookie.get('domain', '').lstrip('.')
+            if not any(urlparse(o).hostname and urlparse(o).hostname.endswith(dominio) for o in origens):
+                origens[f"https://{dominio}"] = None
+
+        for origem, storage in origens.items():
+            try:
+                driver.get(origem)
+                host = urlparse(origem).hostname or ''
+                for cookie in cookies:
+                    if host.endswith(cookie.get('domain', '').lstrip('.')):
+                        cookie = {k: v for k, v in cookie.items() if k != 'sameSite' or v in ('Strict', 'Lax', 'None')}
+                        driver.add_cookie(cookie)
+                if storage:
+                    driver.execute_script(GRAVAR_STORAGE, storage['local'], storage['session'])
+            except WebDriverException as e:
+                logger.warning(f'Falha ao restaurar sessão em {origem}: {e}')
+
+        logger.info(f"Snapshot da conta '{self.conta}' restaurado ({len(cookies)} cookies).")
+        return True
+
+    def remover(self):
+        """
+        Apaga o snapshot da conta.
+        """
+        with self._lock():
+            for arquivo in (self.arquivo_estado, self.arquivo_perfil):
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+
+    @staticmethod
+    def descartar_perfil(perfil_dir):
+        """
+        Remove um perfil extraído por preparar_perfil.
+
+        Args:
+            perfil_dir (str): Diretório do perfil.
+        """
+        shutil.rmtree(perfil_dir, ignore_errors=True)
@@ -0,0 +1,516 @@
+"""
+Módulo com a versão assíncrona (asyncio) da classe Interation.
+
+Os comandos são enviados direto ao navegador pelo websocket do Chrome DevTools
+Protocol (CDP), sem passar pelo chromedriver. Um único event loop consegue
+controlar dezenas de sessões ao mesmo tempo sem uma thread por navegador.
+
+Suporta Chrome e Undetected Chromedriver (local ou remoto via capability 'se:cdp').
+"""
+import asyncio
+import itertools
+import json
+
+import requests
+import websockets
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from iterator import scripts
+from utils.logger_config import logger
+
+
+def endpoint_cdp(driver):
+    """
+    Retorna a URL do websocket CDP do navegador de um WebDriver.
+
+    Args:
+        driver: Objeto WebDriver do Selenium (Chrome ou Undetected Chromedriver).
+
+    Returns:
+        str: URL ws:// do navegador.
+    """
+    capabilities = driver.capabilities
+    url = capabilities.get('se:cdp')
+    if url is None:
+        endereco = capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+        if endereco is None:
+            raise WebDriverException('O navegador não expõe um endpoint CDP. Use Chrome ou Undetected Chromedriver.')
+        url = requests.get(f'http://{endereco}/json/version', timeout=10).json()['webSocketDebuggerUrl']
+    return url
+
+
+class CDPConnection:
+    """Conexão assíncrona com o websocket do Chrome DevTools Protocol."""
+
+    def __init__(self, websocket, tempo=30):
+        """
+        Inicializa um objeto CDPConnection.
+
+        Args:
+            websocket: Conexão websocket já aberta com o navegador.
+            tempo (float): Tempo máximo de espera, em segundos, pela resposta de um comando (padrão: 30).
+        """
+        self.websocket = websocket
+        self.tempo = tempo
+        self._ids = itertools.count(1)
+        self._pendentes = {}
+        self._eventos = {}
+        self._ouvintes = {}
+        self._leitor = asyncio.create_task(self._ler())
+
+    @classmethod
+    async def abrir(cls, url: str, tempo=30):
+        """
+        Abre a conexão com o endpoint CDP do navegador.
+
+        Args:
+            url (str): URL ws:// do navegador.
+            tempo (float): Tempo máximo de espera, em segundos, pela resposta de um comando (padrão: 30).
+
+        Returns:
+            CDPConnection: Conexão aberta.
+        """
+        return cls(await websockets.connect(url, max_size=None), tempo)
+
+    def _verificar_aberta(self):
+        """
+        Falha imediatamente se o laço de leitura já terminou, em vez de esperar uma resposta que não virá.
+        """
+        if self._leitor.done():
+            raise WebDriverException('Conexão CDP encerrada.')
+
+    async def send(self, metodo: str, params=None, session_id=None, tempo=None):
+        """
+        Envia um comando CDP e aguarda a resposta.
+
+        Args:
+            metodo (str): Nome do comando (ex.: 'Page.navigate').
+            params (dict): Parâmetros do comando.
+            session_id (str): Sessão do alvo (aba) que receberá o comando.
+            tempo (float): Tempo máximo de espera pela resposta em segundos (padrão: None, usa o da conexão).
+
+        Returns:
+            dict: Resultado do comando.
+        """
+        self._verificar_aberta()
+        id_ = next(self._ids)
+        mensagem = {'id': id_, 'method': metodo, 'params': params or {}}
+        if session_id:
+            mensagem['sessionId'] = session_id
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes[id_] = futuro
+        tempo = self.tempo if tempo is None else tempo
+        try:
+            await self.websocket.send(json.dumps(mensagem))
+            return await asyncio.wait_for(futuro, tempo)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"O comando CDP '{metodo}' não respondeu dentro de {tempo} segundos.")
+        except websockets.ConnectionClosed:
+            raise WebDriverException('Conexão CDP encerrada.')
+        finally:
+            self._pendentes.pop(id_, None)
+
+    def esperar_evento(self, metodo: str, session_id=None) -> asyncio.Future:
+        """
+        Registra a espera por um evento CDP.
+
+        Deve ser chamado antes do comando que dispara o evento.
+
+        Args:
+            metodo (str): Nome do evento (ex.: 'Page.loadEventFired').
+            session_id (str): Sessão do alvo (aba) que emitirá o evento.
+
+        Returns:
+            asyncio.Future: Futuro resolvido com os parâmetros do evento.
+        """
+        self._verificar_aberta()
+        futuro = asyncio.get_running_loop().create_future()
+        self._eventos.setdefault((metodo, session_id), []).append(futuro)
+        return futuro
+
+    def ouvir(self, metodo: str, callback):
+        """
+        Registra um ouvinte permanente para um evento CDP, de qualquer sessão.
+
+        Args:
+            metodo (str): Nome do evento (ex.: 'Fetch.requestPaused').
+            callback (callable): Função (params, session_id) chamada a cada evento; se retornar uma
+                corrotina, ela é agendada no event loop.
+        """
+        self._ouvintes.setdefault(metodo, []).append(callback)
+
+    async def _ler(self):
+        """
+        Laço de leitura: entrega respostas e eventos a quem está esperando.
+        """
+        try:
+            async for bruto in self.websocket:
+                mensagem = json.loads(bruto)
+                if 'id' in mensagem:
+                    futuro = self._pendentes.pop(mensagem['id'], None)
+                    if futuro is None or futuro.done():
+                        continue
+                    if 'error' in mensagem:
+                        futuro.set_exception(WebDriverException(mensagem['error'].get('message')))
+                    else:
+                        futuro.set_result(mensagem.get('result', {}))
+                else:
+                    chave = (mensagem.get('method'), mensagem.get('sessionId'))
+                    for callback in self._ouvintes.get(chave[0], []):
+                        # Um ouvinte com erro não pode derrubar o laço que entrega as respostas
+                        try:
+                            retorno = callback(mensagem.get('params', {}), chave[1])
+                        except Exception as e:
+                            logger.error(f'Ouvinte de {chave[0]} falhou: {type(e).__name__}: {e}')
+                            continue
+                        if asyncio.iscoroutine(retorno):
+                            asyncio.ensure_future(retorno)
+                    for futuro in self._eventos.pop(chave, []):
+                        if not futuro.done():
+                            futuro.set_result(mensagem.get('params', {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for futuro in itertools.chain(self._pendentes.values(), *self._eventos.values()):
+                if not futuro.done():
+                    futuro.set_exception(WebDriverException('Conexão CDP encerrada.'))
+            self._pendentes.clear()
+            self._eventos.clear()
+
+    async def close(self):
+        """
+        Encerra a conexão.
+        """
+        await self.websocket.close()
+        await self._leitor
+
+
+class AsyncElement:
+    """Referência assíncrona a um elemento da página."""
+
+    def __init__(self, interacao, object_id: str):
+        """
+        Inicializa um objeto AsyncElement.
+
+        Args:
+            interacao (AsyncInteration): Interação dona do elemento.
+            object_id (str): Identificador do objeto remoto no CDP.
+        """
+        self.interacao = interacao
+        self.object_id = object_id
+
+    async def _chamar(self, funcao: str, *args):
+        resultado = await self.interacao._send('Runtime.callFunctionOn', {
+            'objectId': self.object_id,
+            'functionDeclaration': funcao,
+            'arguments': [{'value': arg} for arg in args],
+            'returnByValue': True,
+        })
+        return resultado.get('result', {}).get('value')
+
+    async def release(self):
+        """Libera a referência remota do elemento no navegador."""
+        await self.interacao._send('Runtime.releaseObject', {'objectId': self.object_id})
+
+    async def click(self):
+        """Clica no elemento via JavaScript."""
+        await self._chamar('function() { this.click(); }')
+
+    async def focus(self):
+        """Coloca o foco no elemento."""
+        await self._chamar('function() { this.scrollIntoView({block: "center"}); this.focus(); }')
+
+    async def text(self) -> str:
+        """str: Texto visível do elemento."""
+        return await self._chamar('function() { return (this.innerText !== undefined ? this.innerText : this.textContent).trim(); }')
+
+    async def get_attribute(self, atributo: str):
+        """
+        Obtém o valor de uma propriedade ou atributo do elemento.
+
+        Args:
+            atributo (str): Nome do atributo.
+
+        Returns:
+            str: Valor do atributo.
+        """
+        return await self._chamar(
+            'function(a) { const p = this[a]; return (p !== undefined && p !== null && typeof p !== "object" && typeof p !== "function") ? p : this.getAttribute(a); }',
+            atributo)
+
+
+class AsyncInteration:
+    """Classe assíncrona para interação com o navegador via CDP."""
+
+    teclas = {
+        'enter': ('Enter', 'Enter', 13, '\r'),
+        'esc': ('Escape', 'Escape', 27, ''),
+        'down': ('ArrowDown', 'ArrowDown', 40, ''),
+        'home': ('Home', 'Home', 36, ''),
+        'tab': ('Tab', 'Tab', 9, '\t'),
+    }
+
+    def __init__(self, conexao: CDPConnection, session_id: str, tempo=10):
+        """
+        Inicializa um objeto AsyncInteration.
+
+        Prefira AsyncInteration.conectar(driver) para criar a partir de um WebDriver.
+
+        Args:
+            conexao (CDPConnection): Conexão CDP com o navegador.
+            session_id (str): Sessão CDP da aba controlada.
+            tempo (int): Tempo máximo de espera em segundos (padrão: 10).
+        """
+        self.conexao = conexao
+        self.session_id = session_id
+        self.tempo = tempo
+        # Grupo das referências remotas criadas por find/find_all, liberado por release()
+        self.grupo = f'interacao-{session_id}'
+
+    @classmethod
+    async def conectar(cls, driver, tempo=10):
+        """
+        Cria uma AsyncInteration ligada à aba atual de um WebDriver do Chrome.
+
+        Args:
+            driver: Objeto WebDriver do Selenium (Chrome ou Undetected Chromedriver).
+            tempo (int): Tempo máximo de espera em segundos (padrão: 10).
+
+        Returns:
+            AsyncInteration: Interação assíncrona pronta para uso.
+        """
+        conexao = await CDPConnection.abrir(await asyncio.to_thread(endpoint_cdp, driver))
+        alvos = (await conexao.send('Target.getTargets'))['targetInfos']
+        paginas = [alvo for alvo in alvos if alvo['type'] == 'page']
+        if not paginas:
+            await conexao.close()
+            raise WebDriverException('Nenhuma aba encontrada no navegador.')
+        # No chromedriver o window handle é o próprio targetId
+        atual = driver.current_window_handle.upper()
+        alvo = next((p for p in paginas if p['targetId'].upper() == atual), paginas[0])
+
+        anexo = await conexao.send('Target.attachToTarget', {'targetId': alvo['targetId'], 'flatten': True})
+        interacao = cls(conexao, anexo['sessionId'], tempo)
+        await interacao._send('Page.enable')
+        await interacao._send('Runtime.enable')
+        return interacao
+
+    async def _send(self, metodo: str, params=None, tempo=None):
+        return await self.conexao.send(metodo, params, self.session_id, tempo)
+
+    async def _avaliar(self, expressao: str, por_valor=True, aguardar=False, tempo=None):
+        """
+        Avalia uma expressão JavaScript na aba.
+
+        Args:
+            expressao (str): Expressão JavaScript.
+            por_valor (bool): Retorna o valor serializado em vez da referência remota (padrão: True).
+            aguardar (bool): Aguarda a resolução de uma Promise (padrão: False).
+            tempo (float): Tempo máximo de espera pela resposta em segundos (padrão: None, usa o da conexão).
+
+        Returns:
+            dict: Objeto remoto retornado pelo CDP.
+        """
+        parametros = {'expression': expressao, 'returnByValue': por_valor, 'awaitPromise': aguardar}
+        if not por_valor:
+            parametros['objectGroup'] = self.grupo
+        resultado = await self._send('Runtime.evaluate', parametros, tempo)
+        if 'exceptionDetails' in resultado:
+            detalhes = resultado['exceptionDetails']
+            mensagem = detalhes.get('exception', {}).get('description') or detalhes.get('text')
+            raise WebDriverException(mensagem)
+        return resultado['result']
+
+    async def _esperar(self, tag, tempo, metodo, element_is, todos):
+        """
+        Espera a condição do elemento dentro da página e devolve a referência remota.
+        """
+        args = json.dumps([tag, metodo, element_is or 'clickable', todos, int(tempo * 1000), 100])
+        try:
+            # A resposta só chega quando a espera no navegador termina, então o limite do comando é maior
+            return await self._avaliar(f'({scripts.ESPERAR_ELEMENTO_FN})(...{args})', por_valor=False, aguardar=True,
+                                       tempo=tempo + self.conexao.tempo)
+        except WebDriverException as e:
+            if 'timeout' in str(e):
+                raise TimeoutException(f"Elemento '{tag}' não atendeu à condição '{element_is}' dentro de {tempo} segundos.")
+            raise
+
+    async def find(self, tag: str, tempo=15, metodo='xpath', element_is='clickable') -> AsyncElement:
+        """
+        Localiza um elemento na página.
+
+        Args:
+            tag (str): Identificador do elemento.
+            tempo (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização do elemento (padrão: 'xpath').
+            element_is (str): Condição esperada do elemento (padrão: 'clickable').
+
+        Returns:
+            AsyncElement: Elemento encontrado.
+        """
+        remoto = await self._esperar(tag, tempo, metodo, element_is, False)
+        return AsyncElement(self, remoto['objectId'])
+
+    async def find_all(self, tag: str, tempo=15, metodo='xpath', element_is='presence') -> list[AsyncElement]:
+        """
+        Localiza todos os elementos correspondentes na página.
+
+        Args:
+            tag (str): Identificador do elemento.
+            tempo (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização do elemento (padrão: 'xpath').
+            element_is (str): Condição esperada dos elementos (padrão: 'presence').
+
+        Returns:
+            list: Lista de elementos encontrados.
+        """
+        remoto = await self._esperar(tag, tempo, metodo, element_is, True)
+        try:
+            propriedades = await self._send('Runtime.getProperties', {'objectId': remoto['objectId'], 'ownProperties': True})
+        finally:
+            await self._send('Runtime.releaseObject', {'objectId': remoto['objectId']})
+        itens = [p for p in propriedades['result'] if p['name'].isdigit() and 'objectId' in p.get('value', {})]
+        itens.sort(key=lambda p: int(p['name']))
+        return [AsyncElement(self, p['value']['objectId']) for p in itens]
+
+    async def wait_for(self, tag: str, timeout=15, metodo='xpath', element_is='clickable') -> AsyncElement:
+        """
+        Espera até que um elemento seja encontrado na página.
+
+        Args:
+            tag (str): Identificador do elemento.
+            timeout (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização do elemento (padrão: 'xpath').
+            element_is (str): Condição esperada do elemento (padrão: 'clickable').
+
+        Returns:
+            AsyncElement: Elemento encontrado.
+        """
+        return await self.find(tag, timeout, metodo, element_is)
+
+    async def wait_for_url(self, target_url: str, timeout=10):
+        """
+        Espera até que a URL do navegador contenha a URL alvo.
+
+        Args:
+            target_url (str): URL alvo que estamos esperando.
+            timeout (int, opcional): Tempo máximo de espera em segundos. Padrão é 10 segundos.
+        """
+        loop = asyncio.get_running_loop()
+        limite = loop.time() + timeout
+        alvo = json.dumps(target_url)
+        while loop.time() < limite:
+            if (await self._avaliar(f'location.href.includes({alvo})')).get('value'):
+                return
+            await asyncio.sleep(0.05)
+        raise TimeoutException(f"A URL não correspondeu à URL alvo '{target_url}' dentro do tempo limite de {timeout} segundos.")
+
+    async def click(self, tag: str, metodo='xpath', tempo=10):
+        """
+        Clica em um elemento da página.
+
+        Args:
+            tag (str): Identificador do elemento.
+            metodo (str): Método de localização do elemento (padrão: 'xpath').
+            tempo (int): Tempo máximo de espera em segundos (padrão: 10).
+
+        Returns:
+            bool: True se o clique for bem-sucedido.
+        """
+        el = await self.find(tag, tempo, metodo, 'clickable')
+        try:
+            await el.click()
+        finally:
+            await el.release()
+        return True
+
+    async def key(self, tag: str, tecla='enter', tempo=15, metodo='xpath'):
+        """
+        Pressiona uma tecla em um elemento da página.
+
+        Args:
+            tag (str): Identificador do elemento.
+            tecla (str): Tecla a ser pressionada (padrão: 'enter').
+            tempo (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização do elemento (padrão: 'xpath').
+
+        Returns:
+            bool: True se a ação for bem-sucedida.
+        """
+        el = await self.find(tag, tempo, metodo, 'presence')
+        try:
+            await el.focus()
+        finally:
+            await el.release()
+        if tecla in self.teclas:
+            nome, codigo, virtual, texto = self.teclas[tecla]
+            evento = {'key': nome, 'code': codigo, 'windowsVirtualKeyCode': virtual, 'nativeVirtualKeyCode': virtual}
+            await self._send('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': texto, **evento})
+            await self._send('Input.dispatchKeyEvent', {'type': 'keyUp', **evento})
+        else:
+            await self._send('Input.insertText', {'text': tecla})
+        return True
+
+    async def write(self, seletor: str, valor: str, tempo=15, metodo='xpath'):
+        """
+        Insere um valor em um campo de entrada.
+
+        Args:
+            seletor (str): Identificador do elemento.
+            valor (str): Valor a ser inserido no campo.
+            tempo (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização do elemento (padrão: 'xpath').
+        """
+        el = await self.find(seletor, tempo, metodo)
+        try:
+            await el.focus()
+        finally:
+            await el.release()
+        await self._send('Input.insertText', {'text': str(valor)})
+
+    async def load_page(self, url: str, tempo=30):
+        """
+        Carrega uma página e aguarda o evento load.
+
+        Args:
+            url (str): URL da página a ser carregada.
+            tempo (int): Tempo máximo de espera em segundos (padrão: 30).
+        """
+        await self.release()
+        carregou = self.conexao.esperar_evento('Page.loadEventFired', self.session_id)
+        resultado = await self._send('Page.navigate', {'url': url})
+        if resultado.get('errorText'):
+            carregou.cancel()
+            raise WebDriverException(f"Falha ao carregar '{url}': {resultado['errorText']}")
+        try:
+            await asyncio.wait_for(carregou, tempo)
+        except asyncio.TimeoutError:
+            raise TimeoutException(f"A página '{url}' não carregou dentro de {tempo} segundos.")
+
+    async def sleep(self, seconds: float):
+        """
+        Espera um determinado tempo, em segundos, sem bloquear o event loop.
+
+        Args:
+            seconds (float): Número em segundos.
+        """
+        await asyncio.sleep(seconds)
+
+    async def release(self):
+        """
+        Libera no navegador as referências remotas de todos os elementos retornados por find/find_all.
+
+        Os elementos liberados não podem mais ser usados. Chamado automaticamente pelo load_page e pelo close;
+        em páginas que ficam abertas por muito tempo, chame entre lotes de buscas para não acumular objetos.
+        """
+        await self._send('Runtime.releaseObjectGroup', {'objectGroup': self.grupo})
+
+    async def close(self):
+        """
+        Encerra a conexão CDP. O navegador continua aberto e deve ser encerrado pelo WebDriver.
+        """
+        try:
+            await self.release()
+        except WebDriverException:
+            pass
+        await self.conexao.close()
@@ -0,0 +1,70 @@
+"""
+Módulo com o contador de comandos do WebDriver.
+
+Cada comando enviado ao chromedriver/geckodriver é uma requisição HTTP;
+contar os comandos de uma ação de alto nível mostra quantos round trips ela custa.
+"""
+from collections import Counter
+
+
+class CommandCounter:
+    """Conta os comandos enviados por um WebDriver enquanto estiver ativo."""
+
+    def __init__(self, driver):
+        """
+        Inicializa um objeto CommandCounter.
+
+        Args:
+            driver: Objeto WebDriver do Selenium.
+        """
+        self.driver = driver
+        self.comandos = Counter()
+        self._execute = None
+        self._sobrescrito = False
+
+    @property
+    def total(self):
+        """int: Total de comandos enviados."""
+        return sum(self.comandos.values())
+
+    def start(self):
+        """
+        Passa a contar os comandos do driver.
+        """
+        if self._execute is not None:
+            return
+        self._sobrescrito = 'execute' in vars(self.driver)
+        self._execute = self.driver.execute
+
+        def execute(driver_command, params=None):
+            self.comandos[driver_command] += 1
+            return self._execute(driver_command, params)
+
+        # WebElement também envia seus comandos por driver.execute
+        self.driver.execute = execute
+
+    def stop(self):
+        """
+        Para de contar e restaura o método original do driver.
+        """
+        if self._execute is None:
+            return
+        if self._sobrescrito:
+            self.driver.execute = self._execute
+        else:
+            del self.driver.execute
+        self._execute = None
+
+    def reset(self):
+        """
+        Zera a contagem.
+        """
+        self.comandos.clear()
+
+    def __enter__(self):
+        self.reset()
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,244 @@
+"""
+Módulo com a instrumentação de latência das ações da Interation.
+
+Cada ação instrumentada registra seletor, método, tempo de parede, número de
+comandos do WebDriver e resultado. As medições são agregadas em histogramas
+por ação e por seletor e podem ser exportadas em JSON ou no formato texto do
+Prometheus. Com a instrumentação desligada o custo é uma checagem de atributo.
+"""
+import atexit
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+
+# Limites dos buckets do histograma, em segundos
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Amostras mantidas por série para o cálculo de percentis
+TAMANHO_AMOSTRA = 1024
+
+
+class _Serie:
+    """Histograma e contadores de uma ação (ou ação + seletor)."""
+
+    __slots__ = ('quantidade', 'soma', 'maximo', 'buckets', 'amostras', 'comandos', 'erros')
+
+    def __init__(self):
+        self.quantidade = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.amostras = []
+        self.comandos = 0
+        self.erros = 0
+
+    def adicionar(self, duracao, comandos, sucesso):
+        self.quantidade += 1
+        self.soma += duracao
+        self.maximo = max(self.maximo, duracao)
+        self.comandos += comandos
+        if not sucesso:
+            self.erros += 1
+        for i, limite in enumerate(BUCKETS):
+            if duracao <= limite:
+                self.buckets[i] += 1
+                break
+        # Amostragem por reservatório: memória limitada mesmo em execuções longas
+        if len(self.amostras) < TAMANHO_AMOSTRA:
+            self.amostras.append(duracao)
+        else:
+            j = random.randrange(self.quantidade)
+            if j < TAMANHO_AMOSTRA:
+                self.amostras[j] = duracao
+
+    def percentil(self, p):
+        if not self.amostras:
+            return 0.0
+        ordenadas = sorted(self.amostras)
+        return ordenadas[min(len(ordenadas) - 1, int(p / 100 * len(ordenadas)))]
+
+    def resumo(self):
+        return {
+            'quantidade': self.quantidade,
+            'erros': self.erros,
+            'comandos': self.comandos,
+            'comandos_por_acao': self.comandos / self.quantidade if self.quantidade else 0.0,
+            'media': self.soma / self.quantidade if self.quantidade else 0.0,
+            'p50': self.percentil(50),
+            'p95': self.percentil(95),
+            'p99': self.percentil(99),
+            'max': self.maximo,
+        }
+
+
+class Instrumentacao:
+    """Coletor de latência das ações, compartilhável entre várias Interation."""
+
+    def __init__(self, habilitada=True, registrar_chamadas=False, exportar_em=None):
+        """
+        Inicializa um objeto Instrumentacao.
+
+        Args:
+            habilitada (bool): Define se as ações serão medidas (padrão: True).
+            registrar_chamadas (bool): Guarda cada chamada individual, além dos agregados (padrão: False).
+            exportar_em (str): Arquivo exportado ao fim do processo; '.prom' gera texto Prometheus,
+                qualquer outra extensão gera JSON (padrão: None).
+        """
+        self.habilitada = habilitada
+        self.registrar_chamadas = registrar_chamadas
+        self.chamadas = []
+        self._por_acao = {}
+        self._por_seletor = {}
+        self._lock = threading.Lock()
+
+        if exportar_em:
+            atexit.register(self.exportar, exportar_em)
+
+    def registrar(self, acao, seletor, metodo, duracao, comandos, sucesso):
+        """
+        Registra uma medição.
+
+        Args:
+            acao (str): Nome da ação (ex.: 'click').
+            seletor (str): Seletor usado pela ação.
+            metodo (str): Método de localização do seletor.
+            duracao (float): Tempo de parede em segundos.
+            comandos (int): Comandos enviados ao WebDriver.
+            sucesso (bool): Se a ação terminou sem exceção.
+        """
+        with self._lock:
+            self._por_acao.setdefault(acao, _Serie()).adicionar(duracao, comandos, sucesso)
+            if seletor is not None:
+                self._por_seletor.setdefault((acao, seletor, metodo), _Serie()).adicionar(duracao, comandos, sucesso)
+            if self.registrar_chamadas:
+                self.chamadas.append({
+                    'acao': acao, 'seletor': seletor, 'metodo': metodo, 'duracao': duracao,
+                    'comandos': comandos, 'resultado': 'ok' if sucesso else 'erro'})
+
+    def to_json(self):
+        """
+        Retorna os agregados como dicionário serializável em JSON.
+
+        Returns:
+            dict: {'acoes': {acao: resumo}, 'seletores': [resumo com acao/seletor/metodo]}.
+        """
+        with self._lock:
+            dados = {
+                'acoes': {acao: serie.resumo() for acao, serie in self._por_acao.items()},
+                'seletores': [dict(serie.resumo(), acao=acao, seletor=seletor, metodo=metodo)
+                              for (acao, seletor, metodo), serie in self._por_seletor.items()],
+            }
+            if self.registrar_chamadas:
+                dados['chamadas'] = list(self.chamadas)
+        return dados
+
+    def to_prometheus(self):
+        """
+        Retorna os agregados no formato texto do Prometheus.
+
+        Returns:
+            str: Métricas interation_action_seconds (histograma), _commands_total e _errors_total.
+        """
+        linhas = [
+            '# HELP interation_action_seconds Duração das ações da Interation.',
+            '# TYPE interation_action_seconds histogram',
+        ]
+        with self._lock:
+            series = [({'acao': acao, 'seletor': seletor, 'metodo': metodo}, serie)
+                      for (acao, seletor, metodo), serie in self._por_seletor.items()]
+            series += [({'acao': acao}, serie) for acao, serie in self._por_acao.items()
+                       if not any(chave[0] == acao for chave in self._por_seletor)]
+
+            for rotulos, serie in series:
+                acumulado = 0
+                for limite, quantidade in zip(BUCKETS, serie.buckets):
+                    acumulado += quantidade
+                    linhas.append(f'interation_action_seconds_bucket{_rotulos(rotulos, le=limite)} {acumulado}')
+                linhas.append(f'interation_action_seconds_bucket{_rotulos(rotulos, le="+Inf")} {serie.quantidade}')
+                linhas.append(f'interation_action_seconds_sum{_rotulos(rotulos)} {serie.soma}')
+                linhas.append(f'interation_action_seconds_count{_rotulos(rotulos)} {serie.quantidade}')
+
+            linhas += ['# HELP interation_action_commands_total Comandos do WebDriver enviados pelas ações.',
+                       '# TYPE interation_action_commands_total counter']
+            linhas += [f'interation_action_commands_total{_rotulos(r)} {s.comandos}' for r, s in series]
+            linhas += ['# HELP interation_action_errors_total Ações que terminaram com exceção.',
+                       '# TYPE interation_action_errors_total counter']
+            linhas += [f'interation_action_errors_total{_rotulos(r)} {s.erros}' for r, s in series]
+        return '\n'.join(linhas) + '\n'
+
+    def exportar(self, caminho):
+        """
+        Grava os agregados em arquivo.
+
+        Args:
+            caminho (str): Arquivo de destino; '.prom' gera texto Prometheus, os demais JSON.
+        """
+        with open(caminho, 'w', encoding='utf-8') as file:
+            if caminho.endswith('.prom'):
+                file.write(self.to_prometheus())
+            else:
+                json.dump(self.to_json(), file, indent=2, ensure_ascii=False)
+
+    def reset(self):
+        """
+        Descarta todas as medições.
+        """
+        with self._lock:
+            self._por_acao.clear()
+            self._por_seletor.clear()
+            self.chamadas.clear()
+
+
+def _rotulos(rotulos, **extra):
+    itens = dict(rotulos, **extra)
+    escapar = lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{escapar(v)}"' for k, v in itens.items()) + '}'
+
+
+_profundidade = threading.local()
+
+
+def instrumentado(acao, com_seletor=True):
+    """
+    Decorador que mede um método da Interation.
+
+    Só as chamadas mais externas são registradas: um click que chama find
+    conta como um click, com todos os comandos enviados por ele.
+
+    Args:
+        acao (str): Nome da ação registrada.
+        com_seletor (bool): Usa o primeiro argumento do método como seletor (padrão: True).
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao)
+
+        @functools.wraps(funcao)
+        def wrapper(self, *args, **kwargs):
+            instrumentacao = getattr(self, 'instrumentacao', None)
+            if instrumentacao is None or not instrumentacao.habilitada or getattr(_profundidade, 'valor', 0):
+                return funcao(self, *args, **kwargs)
+
+            seletor = metodo = None
+            if com_seletor:
+                argumentos = assinatura.bind_partial(self, *args, **kwargs).arguments
+                seletor = next(iter(list(argumentos.values())[1:2]), None)
+                if 'metodo' in assinatura.parameters:
+                    metodo = argumentos.get('metodo', assinatura.parameters['metodo'].default)
+            contador = self._contador_comandos
+            comandos_antes = contador.total
+            inicio = time.perf_counter()
+            sucesso = False
+            _profundidade.valor = 1
+            try:
+                resultado = funcao(self, *args, **kwargs)
+                sucesso = True
+                return resultado
+            finally:
+                _profundidade.valor = 0
+                instrumentacao.registrar(acao, seletor, metodo, time.perf_counter() - inicio,
+                                         contador.total - comandos_antes, sucesso)
+        return wrapper
+    return decorador
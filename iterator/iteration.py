@@ -1,27 +1,100 @@
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
+from iterator import scripts
+from iterator.selectors import ElementCache, registro_padrao
+from iterator.waits import WaitEngine
+from iterator.commands import CommandCounter
+from iterator.instrumentation import instrumentado
+from utils.logger_config import logger
+import datetime
+import json
 import time
+from collections import OrderedDict
+
+TECLAS = {
+    'enter': Keys.ENTER,
+    'esc': Keys.ESCAPE,
+    'down': Keys.DOWN,
+    'home': Keys.HOME,
+    'tab': Keys.TAB
+}
+
+# Condições conferidas em um elemento já localizado, antes de reaproveitá-lo do cache
+CONDICOES_ELEMENTO = {
+    'clickable': EC.element_to_be_clickable,
+    'visibled': EC.visibility_of,
+    'selected': EC.element_to_be_selected,
+    'presence': lambda elemento: lambda driver: True,
+}
 
 class Interation:
     """Classe para interação do usuário com o navegador."""
 
-    def __init__(self, driver, tempo=10):
+    def __init__(self, driver, tempo=10, modo_espera='evento', intervalo_espera=0.5, instrumentacao=None, seletores=None,
+                 agendador=None):
         """
         Inicializa um objeto Interacao.
 
         Args:
             driver: Objeto WebDriver do Selenium.
             tempo (int): Tempo máximo de espera em segundos (padrão: 10).
+            modo_espera (str): 'evento' (observa a página) ou 'polling' (padrão: 'evento').
+            intervalo_espera (float): Intervalo máximo do polling em segundos (padrão: 0.5).
+            instrumentacao (Instrumentacao): Coletor de latência das ações (padrão: None, desligado).
+            seletores (SelectorRegistry): Registro de seletores nomeados aceitos como '@nome' no lugar de `tag`
+                (padrão: None, usa os seletores de utils/elements.py).
+            agendador (DomainScheduler): Agendador que limita os acessos por domínio no load_page
+                (padrão: None, sem limite).
         """
         self.wait = WebDriverWait(driver, tempo)
         self.driver = driver
         self.action = ActionChains(self.driver)
+        self.esperas = WaitEngine(driver, modo_espera, intervalo_espera)
+        self.instrumentacao = instrumentacao
+        self._contador_comandos = CommandCounter(driver)
+        if instrumentacao is not None:
+            self._contador_comandos.start()
+        self.seletores = seletores if seletores is not None else registro_padrao()
+        self.cache = ElementCache()
+        self.agendador = agendador
+
+    def _com_elemento(self, tag, metodo, element_is, tempo, acao):
+        """
+        Executa uma ação sobre um elemento, reaproveitando o último elemento resolvido
+        para o mesmo seletor e buscando-o de novo se estiver obsoleto.
 
+        Args:
+            tag (str): Seletor do elemento ou '@nome' do registro de seletores.
+            metodo (str): Método de localização do elemento.
+            element_is (str): Condição esperada do elemento.
+            tempo (int): Tempo máximo de espera em segundos.
+            acao (callable): Função que recebe o elemento.
+
+        Returns:
+            O retorno da ação.
+        """
+        locator = self.seletores.resolver(tag, metodo)
+        chave = (locator, element_is)
+        elemento = self.cache.get(chave)
+        if elemento is not None:
+            # O cache guarda só a busca: a condição é conferida de novo no elemento guardado,
+            # já que ele pode ter ficado desabilitado ou oculto desde a última ação
+            condicao = CONDICOES_ELEMENTO.get(element_is)
+            try:
+                if condicao is not None and condicao(elemento)(self.driver):
+                    return acao(elemento)
+            except StaleElementReferenceException:
+                pass
+            self.cache.invalidar(chave)
+        elemento = self.find(locator, tempo, metodo, element_is)
+        self.cache.put(chave, elemento)
+        return acao(elemento)
+
+    @instrumentado('click')
     def click(self, tag: str, metodo='xpath', tempo=10):
         """
         Clica em um elemento da página.
@@ -34,18 +107,11 @@ class Interation:
         Returns:
             bool: True se o clique for bem-sucedido, False caso contrário.
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-        method = metodos.get(metodo)
-        el = WebDriverWait(self.driver, tempo).until(
-            EC.element_to_be_clickable((method, tag)))
-        self.driver.execute_script("arguments[0].click();", el)
+        self._com_elemento(tag, metodo, 'clickable', tempo,
+                           lambda el: self.driver.execute_script("arguments[0].click();", el))
         return True
 
+    @instrumentado('key')
     def key(self, tag: str, tecla='enter', tempo=15, metodo='xpath'):
         """
         Pressiona uma tecla em um elemento da página.
@@ -59,140 +125,69 @@ class Interation:
         Returns:
             bool: True se a ação for bem-sucedida, False caso contrário.
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-        method = metodos.get(metodo)
-        WebDriverWait(self.driver, tempo).until(
-            EC.presence_of_element_located((method, tag)))
-        elemento = self.driver.find_element(method, tag)
-        acoes = {
-            'enter': Keys.ENTER,
-            'esc': Keys.ESCAPE,
-            'down': Keys.DOWN,
-            'home': Keys.HOME,
-            'tab': Keys.TAB
-        }
-        if tecla in acoes:
-            elemento.send_keys(acoes[tecla])
-        else:
-            elemento.send_keys(tecla)
+        self._com_elemento(tag, metodo, 'presence', tempo, lambda el: el.send_keys(TECLAS.get(tecla, tecla)))
         return True
 
+    @instrumentado('find')
     def find(self, tag: str, tempo=15, metodo='xpath', element_is='clickable') -> WebElement:
         """
         Localiza um elemento na página.
 
         Args:
-            tag (str): Identificador do elemento.
+            tag (str): Identificador do elemento ou '@nome' do registro de seletores.
             tempo (int): Tempo máximo de espera em segundos (padrão: 15).
             metodo (str): Método de localização do elemento (padrão: 'xpath').
 
         Returns:
             selenium.webdriver.remote.webelement.WebElement: Elemento encontrado.
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-
-        method = metodos.get(metodo)
-        
-        if element_is is not None:
-            atributos = {
-            'clickable': EC.element_to_be_clickable,
-            'selected': EC.element_to_be_selected,
-            'text_in': EC.text_to_be_present_in_element,
-            'presence': EC.presence_of_element_located,
-            'visibled': EC.visibility_of_element_located
-            }
-
-            atributo = atributos.get(element_is)
-        else:
-            atributo = EC.element_to_be_clickable
+        locator = self.seletores.resolver(tag, metodo)
+        element_is = element_is or 'clickable'
 
-        WebDriverWait(self.driver, tempo).until(
-            atributo((method, tag)))
-        elemento = self.driver.find_element(method, tag)
+        elemento = self.esperas.elemento(locator.seletor, locator.metodo, element_is, tempo, locator.condicao(element_is))
+        # Condições booleanas não devolvem o elemento, então é preciso buscá-lo
+        if not isinstance(elemento, WebElement):
+            elemento = self.driver.find_element(locator.by, locator.seletor)
         return elemento
 
+    @instrumentado('find_all')
     def find_all(self, tag: str, tempo=15, metodo='xpath', element_is='presence') -> list[WebElement]:
         """
         Localiza todos os elementos correspondentes na página.
 
         Args:
-            tag (str): Identificador do elemento.
+            tag (str): Identificador do elemento ou '@nome' do registro de seletores.
             tempo (int): Tempo máximo de espera em segundos (padrão: 15).
             metodo (str): Método de localização do elemento (padrão: 'xpath').
 
         Returns:
             list: Lista de elementos encontrados.
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-
-        if element_is is not None:
-            atributos = {
-            'clickable': EC.element_to_be_clickable,
-            'selected': EC.element_to_be_selected,
-            'text_in': EC.text_to_be_present_in_element,
-            'presence': EC.presence_of_element_located,
-            'visibled': EC.visibility_of_element_located
-            }
-
-            atributo = atributos.get(element_is)
-        else:
-            atributo = EC.presence_of_element_located
-
-        method = metodos.get(metodo)
-
-        WebDriverWait(self.driver, tempo).until(
-            atributo((method, tag)))
-        elementos = self.driver.find_elements(method, tag)
+        locator = self.seletores.resolver(tag, metodo)
+        element_is = element_is or 'presence'
+
+        elementos = self.esperas.elemento(locator.seletor, locator.metodo, element_is, tempo,
+                                          locator.condicao(element_is, todos=True), todos=True)
+        # Condições de elemento único não devolvem a lista completa
+        if not isinstance(elementos, list):
+            elementos = self.driver.find_elements(locator.by, locator.seletor)
         return elementos
-    
+
+    @instrumentado('wait_for')
     def wait_for(self, tag:str, timeout=15, metodo='xpath', element_is='clickable'):
         """
         Espera até que um elemento seja encontrado na página.
 
         Args:
-            tag (str): Identificador do elemento.
+            tag (str): Identificador do elemento ou '@nome' do registro de seletores.
             timeout (int): Tempo máximo de espera em segundos (padrão: 15).
             metodo (str): Método de localização do elemento (padrão: 'xpath').
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-
-        if element_is is not None:
-            atributos = {
-            'clickable': EC.element_to_be_clickable,
-            'selected': EC.element_to_be_selected,
-            'text_in': EC.text_to_be_present_in_element,
-            'presence': EC.presence_of_element_located,
-            'visibled': EC.visibility_of_element_located
-            }
-
-            atributo = atributos.get(element_is)
-        else:
-            atributo = EC.element_to_be_clickable
+        locator = self.seletores.resolver(tag, metodo)
+        element_is = element_is or 'clickable'
+        return self.esperas.elemento(locator.seletor, locator.metodo, element_is, timeout, locator.condicao(element_is))
 
-        method = metodos.get(metodo)
-        return WebDriverWait(self.driver, timeout).until(
-            atributo((method, tag)))
-    
+    @instrumentado('wait_for_url')
     def wait_for_url(self, target_url: str, timeout=10):
         """
         Espera até que a URL do navegador seja igual à URL alvo.
@@ -206,12 +201,11 @@ class Interation:
             driver.get('https://www.example.com')
             wait_for_url(driver, 'https://www.example.com')
         """
-        try:
-            WebDriverWait(self.driver, timeout).until(EC.url_contains(target_url))
-        except TimeoutException:
-            raise TimeoutException(f"A URL não correspondeu à URL alvo '{target_url}' dentro do tempo limite de {timeout} segundos.")
+        self.esperas.url(target_url, timeout)
+        self.cache.invalidar()
 
-    def get_attribute(self, tag: str, atributo='value', tempo=15, metodo='xpath'):
+    @instrumentado('get_attribute')
+    def get_attribute(self, tag: str, atributo='value', tempo=15, metodo='xpath', element_is='presence'):
         """
         Obtém o valor de um atributo de um elemento.
 
@@ -220,20 +214,234 @@ class Interation:
             atributo (str): Nome do atributo a ser obtido (padrão: 'value').
             tempo (int): Tempo máximo de espera em segundos (padrão: 15).
             metodo (str): Método de localização do elemento (padrão: 'xpath').
+            element_is (str): Condição esperada do elemento (padrão: 'presence').
 
         Returns:
             str: Valor do atributo especificado.
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
+        return self._com_elemento(tag, metodo, element_is, tempo, lambda el: el.get_attribute(atributo))
+
+    @instrumentado('get_attributes')
+    def get_attributes(self, tag: str, atributos='text', tempo=15, metodo='xpath'):
+        """
+        Obtém atributos/textos de todos os elementos correspondentes em uma única chamada de script.
+
+        Além dos atributos HTML, aceita os campos especiais 'text' (texto visível),
+        'html' (outerHTML) e 'inner_html'.
+
+        Args:
+            tag (str): Identificador dos elementos.
+            atributos (str | list): Nome de um atributo ou lista de atributos (padrão: 'text').
+            tempo (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização dos elementos (padrão: 'xpath').
+
+        Returns:
+            list: Lista de valores quando atributos é str, ou lista de dicionários {atributo: valor}.
+        """
+        elementos = self.find_all(tag, tempo, metodo, 'presence')
+        unico = isinstance(atributos, str)
+        campos = [atributos] if unico else list(atributos)
+
+        valores = self.driver.execute_script(scripts.LER_ATRIBUTOS, elementos, campos)
+        if unico:
+            return [linha[0] for linha in valores]
+        return [dict(zip(campos, linha)) for linha in valores]
+
+    def extract(self, linha: str, campos: dict, tempo=15, metodo='xpath', proxima=None, metodo_proxima=None, max_paginas=None):
+        """
+        Extrai os dados de uma lista/tabela inteira com uma chamada de script por página.
 
-        method = metodos.get(metodo)
-        return self.find(tag, tempo, method).get_attribute(atributo)
+        Cada campo pode ser:
+            - str: seletor relativo à linha, retornando o texto (ex.: './td[2]' ou XPATH['nome']);
+            - tuple: (seletor, atributo), ex.: ('./a', 'href');
+            - dict: {'seletor', 'atributo', 'metodo', 'multiplo'}; 'multiplo' retorna a lista de todos os elementos.
+        Um seletor vazio ou '.' refere-se à própria linha.
 
+        Args:
+            linha (str): Seletor das linhas.
+            campos (dict): Mapeamento nome do campo -> seletor/atributo.
+            tempo (int): Tempo máximo de espera em segundos (padrão: 15).
+            metodo (str): Método de localização das linhas e campos (padrão: 'xpath').
+            proxima (str): Seletor do botão de próxima página (padrão: None, sem paginação).
+            metodo_proxima (str): Método de localização do botão de próxima página (padrão: o mesmo das linhas).
+            max_paginas (int): Número máximo de páginas percorridas (padrão: None, sem limite).
+
+        Yields:
+            dict: Um registro por linha.
+
+        Exemplo de uso:
+            for produto in bot.extract('//table/tbody/tr', {'nome': './td[1]', 'link': ('./td[2]/a', 'href')}):
+                print(produto)
+        """
+        especificacao = [self._normalizar_campo(nome, campo, metodo) for nome, campo in campos.items()]
+        locator = self.seletores.resolver(linha, metodo)
+        linha, metodo = locator.seletor, locator.metodo
+        pagina = 0
+
+        while True:
+            self.find(linha, tempo, metodo, 'presence')
+            for registro in self.driver.execute_script(scripts.EXTRAIR, linha, metodo, especificacao):
+                yield registro
+
+            pagina += 1
+            if proxima is None or (max_paginas is not None and pagina >= max_paginas):
+                return
+
+            assinatura = self.driver.execute_script(scripts.ASSINATURA_LINHAS, linha, metodo)
+            if not self.driver.execute_script(scripts.CLICAR_PROXIMA, proxima, metodo_proxima or metodo):
+                return
+            try:
+                WebDriverWait(self.driver, tempo).until(
+                    lambda d: d.execute_script(scripts.ASSINATURA_LINHAS, linha, metodo) != assinatura)
+            except TimeoutException:
+                return
+
+    def harvest(self, item: str, campos: dict, metodo='xpath', container=None, chave=None, max_itens=None, passo=None,
+                espera=2.0, sem_crescimento=3, fim=None, metodo_fim=None, max_chaves=100000, tempo=15):
+        """
+        Coleta os itens de uma lista com scroll infinito/carregamento preguiçoso, como um gerador.
+
+        Um observador na página lê cada item assim que ele é inserido; a cada passo só os itens novos
+        são enviados ao Python, então o custo por passo não cresce com o tamanho da lista. A coleta
+        termina quando o marcador de fim aparece, quando max_itens é atingido ou quando a lista não
+        cresce por `sem_crescimento` passos seguidos com o scroll no fim.
+
+        Os campos seguem o mesmo formato do extract. A deduplicação guarda no máximo `max_chaves`
+        chaves (as mais recentes), para manter a memória limitada em listas muito longas.
+
+        Exemplo de uso:
+            for post in bot.harvest('article.post', {'id': ('.', 'data-id'), 'titulo': 'h2'}, metodo='css', chave='id'):
+                salvar(post)
+
+        Args:
+            item (str): Seletor dos itens da lista.
+            campos (dict): Mapeamento nome do campo -> seletor/atributo, relativo ao item.
+            metodo (str): Método de localização dos itens, campos e container (padrão: 'xpath').
+            container (str): Seletor do elemento com scroll (padrão: None, rola a janela).
+            chave (str | callable): Campo ou função registro -> chave usada na deduplicação; itens em que a chave
+                é None usam o registro inteiro (padrão: None, o registro inteiro).
+            max_itens (int): Quantidade máxima de itens produzidos (padrão: None, sem limite).
+            passo (int): Deslocamento do scroll em px a cada passo (padrão: None, rola até o fim).
+            espera (float): Tempo máximo de espera por itens novos a cada passo em segundos (padrão: 2.0).
+            sem_crescimento (int): Passos seguidos sem itens novos, com o scroll no fim, para encerrar (padrão: 3).
+            fim (str): Seletor de um marcador de fim da lista (padrão: None).
+            metodo_fim (str): Método de localização do marcador de fim (padrão: o mesmo dos itens).
+            max_chaves (int): Chaves mantidas para deduplicação (padrão: 100000).
+            tempo (int): Tempo máximo de espera pelo primeiro item em segundos (padrão: 15).
+
+        Yields:
+            dict: Um registro por item novo.
+        """
+        especificacao = [self._normalizar_campo(nome, campo, metodo) for nome, campo in campos.items()]
+        locator = self.seletores.resolver(item, metodo)
+        alvo = self.seletores.resolver(container, metodo) if container else None
+        marcador = self.seletores.resolver(fim, metodo_fim or metodo) if fim else None
+
+        self.find(locator, tempo, metodo, 'presence')
+        self.driver.execute_script(scripts.COLETA_INICIAR, locator.seletor, locator.metodo,
+                                   alvo.seletor if alvo else None, alvo.metodo if alvo else None, especificacao)
+
+        vistos = OrderedDict()
+        produzidos = parados = 0
+        try:
+            while True:
+                registros = self.driver.execute_script(scripts.COLETA_PASSO, passo)
+                if registros is None:
+                    logger.warning('Coleta interrompida: a página foi recarregada ou trocada.')
+                    return
+
+                for registro in registros:
+                    if callable(chave):
+                        identificador = chave(registro)
+                    elif chave is not None:
+                        identificador = registro.get(chave)
+                    else:
+                        identificador = None
+                    if identificador is None:
+                        # Sem chave (ou com o campo da chave vazio) o registro inteiro identifica o item;
+                        # senão todos os itens sem o campo seriam tratados como o mesmo
+                        identificador = json.dumps(registro, sort_keys=True, default=str)
+                    if identificador in vistos:
+                        vistos.move_to_end(identificador)
+                        continue
+                    vistos[identificador] = None
+                    if len(vistos) > max_chaves:
+                        vistos.popitem(last=False)
+
+                    yield registro
+                    produzidos += 1
+                    if max_itens is not None and produzidos >= max_itens:
+                        return
+
+                estado = self.esperas.script('harvest', scripts.COLETA_ESPERAR, espera,
+                                             marcador.seletor if marcador else None, marcador.metodo if marcador else None)
+                if estado['perdida']:
+                    logger.warning('Coleta interrompida: a página foi recarregada ou trocada.')
+                    return
+                if estado['marcador'] and not estado['novos']:
+                    return
+                parados = parados + 1 if not estado['novos'] and estado['fim'] else 0
+                if parados >= sem_crescimento:
+                    return
+        finally:
+            try:
+                self.driver.execute_script(scripts.COLETA_PARAR)
+            except WebDriverException:
+                pass
+
+    @instrumentado('extract_fields', com_seletor=False)
+    def extract_fields(self, campos: dict, metodo='xpath'):
+        """
+        Extrai campos avulsos da página (não uma lista) com uma única chamada de script.
+
+        Os campos seguem o formato do extract, com seletores relativos ao documento; campos
+        não encontrados retornam None, sem esperar.
+
+        Exemplo de uso:
+            produto = bot.extract_fields({'nome': '//h1', 'preco': '//span[@class="preco"]', 'foto': ('//img', 'src')})
+
+        Args:
+            campos (dict): Mapeamento nome do campo -> seletor/atributo.
+            metodo (str): Método de localização dos campos (padrão: 'xpath').
+
+        Returns:
+            dict: Registro com os valores dos campos.
+        """
+        especificacao = []
+        for nome, campo in campos.items():
+            campo = self._normalizar_campo(nome, campo, metodo)
+            locator = self.seletores.resolver(campo['seletor'], campo['metodo']) if campo['seletor'] not in ('', '.') else None
+            if locator is not None:
+                campo['seletor'], campo['metodo'] = locator.seletor, locator.metodo
+            especificacao.append(campo)
+        return self.driver.execute_script(scripts.EXTRAIR_CAMPOS, especificacao)
+
+    @staticmethod
+    def _normalizar_campo(nome, campo, metodo):
+        """
+        Converte a definição de um campo do extract para o formato do script.
+
+        Args:
+            nome (str): Nome do campo.
+            campo (str | tuple | dict): Definição do campo.
+            metodo (str): Método padrão de localização.
+
+        Returns:
+            dict: Campo no formato {nome, seletor, metodo, atributo, multiplo}.
+        """
+        if isinstance(campo, str):
+            campo = {'seletor': campo}
+        elif isinstance(campo, (tuple, list)):
+            campo = {'seletor': campo[0], 'atributo': campo[1]}
+        return {
+            'nome': nome,
+            'seletor': campo.get('seletor', ''),
+            'metodo': campo.get('metodo', metodo),
+            'atributo': campo.get('atributo', 'text'),
+            'multiplo': bool(campo.get('multiplo', False)),
+        }
+
+    @instrumentado('click_js')
     def click_js(self, tag: str, tempo=15, metodo='xpath'):
         """
         Executa um clique em um elemento usando JavaScript.
@@ -243,28 +451,91 @@ class Interation:
             tempo (int): Tempo máximo de espera em segundos (padrão: 15).
             metodo (str): Método de localização do elemento (padrão: 'xpath').
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-
-        method = metodos.get(metodo)
-        el = self.find(tag, tempo, method)
-        self.driver.execute_script("arguments[0].click();", el)
+        self._com_elemento(tag, metodo, 'clickable', tempo,
+                           lambda el: self.driver.execute_script("arguments[0].click();", el))
 
-    def write_js(self, tag, valor):
+    def write_js(self, tag, valor, metodo='css'):
         """
-        Insere um valor em um campo usando JavaScript.
+        Insere um valor em um campo usando JavaScript, disparando os eventos input/change.
 
         Args:
             tag (str): Identificador do elemento.
             valor: Valor a ser inserido no campo.
+            metodo (str): Método de localização do elemento (padrão: 'css').
+        """
+        self.fill_form({tag: valor}, metodo=metodo, esperar=False)
+
+    @instrumentado('fill_form', com_seletor=False)
+    def fill_form(self, campos: dict, metodo='xpath', tempo=15, teclado=(), esperar=True, clicar=None):
         """
-        js = f'document.querySelector("{tag}").value = "{valor}"'
-        self.driver.execute_script(js)
+        Preenche vários campos de um formulário com uma única chamada de script.
+
+        Aceita inputs de texto, textarea, select (valor ou texto da opção; lista para seleção múltipla),
+        checkbox (bool), radio (valor da opção), datas (date/datetime/time) e contenteditable. Os valores
+        são definidos pelo setter nativo e os eventos input/change são disparados, para que páginas
+        React/Vue/Angular percebam a alteração.
+
+        Exemplo de uso:
+            bot.fill_form({'#nome': 'Ana', '#uf': 'SP', '#aceite': True, '#nascimento': date(1990, 5, 1),
+                           '#cpf': {'valor': '12345678900', 'teclado': True}}, metodo='css')
 
+        Args:
+            campos (dict): Mapeamento seletor -> valor, ou seletor -> {'valor', 'metodo', 'teclado'}.
+            metodo (str): Método de localização dos campos (padrão: 'xpath').
+            tempo (int): Tempo máximo de espera pelo primeiro campo em segundos (padrão: 15).
+            teclado (iterable): Seletores preenchidos com teclas reais (máscaras, autocomplete) (padrão: ()).
+            esperar (bool): Espera o primeiro campo estar presente antes de preencher (padrão: True).
+            clicar (str): Elemento clicado depois do preenchimento, como o botão de envio; sem campos digitados
+                com teclado, o clique vai no mesmo script, sem esperar o elemento ficar clicável (padrão: None).
+        """
+        teclado = set(teclado)
+        lote, digitados = [], []
+        for tag, valor in campos.items():
+            opcoes = valor if isinstance(valor, dict) and 'valor' in valor else {'valor': valor}
+            locator = self.seletores.resolver(tag, opcoes.get('metodo', metodo))
+            campo = (locator, self._valor_formulario(opcoes['valor']))
+            if opcoes.get('teclado') or tag in teclado:
+                digitados.append(campo)
+            else:
+                lote.append(campo)
+
+        botao = self.seletores.resolver(clicar, metodo) if clicar else None
+        if lote:
+            if esperar:
+                self.find(lote[0][0], tempo, metodo, 'presence')
+            no_script = botao is not None and not digitados
+            erros = self.driver.execute_script(scripts.PREENCHER_FORMULARIO, [
+                {'seletor': locator.seletor, 'metodo': locator.metodo, 'valor': valor} for locator, valor in lote],
+                {'seletor': botao.seletor, 'metodo': botao.metodo} if no_script else None)
+            if erros:
+                raise NoSuchElementException('Campos não preenchidos: ' + '; '.join(f"{e['seletor']} ({e['erro']})" for e in erros))
+            if no_script:
+                self.cache.invalidar()
+                return
+
+        for locator, valor in digitados:
+            def digitar(el, valor=valor):
+                el.clear()
+                el.send_keys('' if valor is None else str(valor))
+            self._com_elemento(locator, metodo, 'clickable', tempo, digitar)
+
+        if botao is not None:
+            self.click(botao, metodo, tempo)
+
+    @staticmethod
+    def _valor_formulario(valor):
+        """
+        Converte datas e horas para o formato aceito pelos inputs date/datetime-local/time.
+        """
+        if isinstance(valor, datetime.datetime):
+            return valor.strftime('%Y-%m-%dT%H:%M')
+        if isinstance(valor, datetime.date):
+            return valor.isoformat()
+        if isinstance(valor, datetime.time):
+            return valor.strftime('%H:%M')
+        return valor
+
+    @instrumentado('write')
     def write(self, seletor, valor: str, tempo=15, metodo='xpath'):
         """
         Insere um valor em um campo de entrada.
@@ -275,15 +546,7 @@ class Interation:
             tempo (int): Tempo máximo de espera em segundos (padrão: 15).
             metodo (str): Método de localização do elemento (padrão: 'xpath').
         """
-        metodos = {
-            'css': By.CSS_SELECTOR,
-            'id': By.ID,
-            'xpath': By.XPATH,
-            'name': By.NAME
-        }
-        metodo = metodos.get(metodo)
-        el = self.find(seletor, tempo, metodo)
-        el.send_keys(str(valor))
+        self._com_elemento(seletor, metodo, 'clickable', tempo, lambda el: el.send_keys(str(valor)))
 
     def scroll(self, element: WebElement, modo: str = 'normal'):
         """
@@ -298,14 +561,116 @@ class Interation:
         elif modo == 'action':
             self.action.scroll_to_element(element).perform()
 
-    def load_page(self, url):
+    @instrumentado('load_page', com_seletor=False)
+    def load_page(self, url, pronto=None, tempo=30, seletor=None, metodo='xpath', ocioso_ms=500, prioridade=0):
         """
-        Carrega uma página no navegador.
+        Carrega uma página no navegador e espera a política de prontidão escolhida.
+
+        Políticas de prontidão (pronto):
+            - None: retorna quando o driver.get retornar (depende do page_load_strategy do Driver);
+            - 'domcontentloaded': espera o evento DOMContentLoaded;
+            - 'selector': espera o elemento `seletor` estar presente;
+            - 'networkidle': espera `ocioso_ms` ms sem requisições em andamento após o evento load.
+        Com page_load_strategy 'eager' ou 'none' no Driver, o driver.get retorna antes do evento load
+        e a política decide quando a página está pronta, sem sleeps fixos.
+        Com um agendador, a navegação espera uma vaga do domínio, e respostas 429/503 ou captchas
+        desaceleram o domínio para todas as sessões que usam o mesmo agendador.
 
         Args:
             url (str): URL da página a ser carregada.
+            pronto (str): Política de prontidão (padrão: None).
+            tempo (int): Tempo máximo de espera da política em segundos (padrão: 30).
+            seletor (str): Seletor usado pela política 'selector' (padrão: None).
+            metodo (str): Método de localização do seletor (padrão: 'xpath').
+            ocioso_ms (int): Janela sem atividade de rede da política 'networkidle' em ms (padrão: 500).
+            prioridade (int): Prioridade do pedido de vaga no agendador, quando houver (padrão: 0).
+
+        Returns:
+            dict: Tempos em ms desde o início da navegação (ttfb, dom_content_loaded, load, idle)
+            e 'total', o tempo de parede gasto pelo load_page.
+        """
+        inicio = time.perf_counter()
+        self.cache.invalidar()
+        if self.agendador is None:
+            idle = self._carregar(url, pronto, tempo, seletor, metodo, ocioso_ms)
+        else:
+            with self.agendador.reservar(url, prioridade):
+                try:
+                    idle = self._carregar(url, pronto, tempo, seletor, metodo, ocioso_ms)
+                except Exception:
+                    # Uma página de erro 429/503 costuma terminar em timeout da política de prontidão:
+                    # o agendador precisa saber da falha, senão o domínio nunca desacelera
+                    bloqueio = self._bloqueio() or {'status': None, 'captcha': False}
+                    self.agendador.registrar(url, bloqueio['status'], bloqueio['captcha'], erro=True)
+                    raise
+                bloqueio = self.driver.execute_script(scripts.VERIFICAR_BLOQUEIO)
+            self.agendador.registrar(url, bloqueio['status'], bloqueio['captcha'])
+
+        tempos = self.driver.execute_script(scripts.TEMPOS_NAVEGACAO) or {}
+        tempos['idle'] = idle
+        tempos['total'] = (time.perf_counter() - inicio) * 1000
+        return tempos
+
+    def _bloqueio(self):
+        """
+        Lê o status HTTP e os sinais de captcha da página atual, sem falhar.
+
+        Returns:
+            dict | None: {'status', 'captcha'}, ou None se a página não respondeu.
+        """
+        try:
+            return self.driver.execute_script(scripts.VERIFICAR_BLOQUEIO)
+        except WebDriverException:
+            return None
+
+    def _carregar(self, url, pronto, tempo, seletor, metodo, ocioso_ms):
+        """
+        Navega até a URL e espera a política de prontidão do load_page.
+
+        Returns:
+            float | None: Tempo até a rede ficar ociosa, na política 'networkidle'.
         """
         self.driver.get(url)
+        idle = None
+
+        if pronto == 'domcontentloaded':
+            self.esperas.script('domcontentloaded', scripts.ESPERAR_DOM, tempo)
+        elif pronto == 'selector':
+            if seletor is None:
+                raise ValueError("A política 'selector' exige o parâmetro seletor.")
+            self.find(seletor, tempo, metodo, 'presence')
+        elif pronto == 'networkidle':
+            idle = self.esperas.script('networkidle', scripts.ESPERAR_REDE_OCIOSA, tempo, ocioso_ms)
+        elif pronto is not None:
+            raise ValueError(f"Política de prontidão '{pronto}' inválida.")
+        return idle
+
+    def map_tabs(self, tarefas, tarefa=None, abas=4, pronto=None, seletor=None, metodo='xpath', tempo=30):
+        """
+        Processa várias páginas em abas da mesma sessão, carregando umas enquanto as prontas são processadas.
+
+        As abas extras são fechadas ao fim da iteração. Veja TabPool (iterator/tabs.py).
+
+        Exemplo de uso:
+            for url, dados, erro in bot.map_tabs(urls, lambda bot, url: bot.get_attributes('//h1'), abas=6):
+                ...
+
+        Args:
+            tarefas (iterable): URLs ou dicionários com a chave 'url'.
+            tarefa (callable): Função (interacao, tarefa) -> resultado; por padrão retorna URL e título (padrão: None).
+            abas (int): Quantidade de abas, incluindo a atual (padrão: 4).
+            pronto (str): Quando a aba está pronta: None/'load', 'domcontentloaded' ou 'selector' (padrão: None).
+            seletor (str): Seletor esperado pela política 'selector' (padrão: None).
+            metodo (str): Método de localização do seletor (padrão: 'xpath').
+            tempo (int): Tempo máximo de carregamento de cada página em segundos (padrão: 30).
+
+        Yields:
+            tuple: (tarefa, resultado, erro), na ordem em que as páginas ficam prontas.
+        """
+        from iterator.tabs import TabPool, ler_pagina
+
+        with TabPool(self, abas, pronto, seletor, metodo, tempo) as pool:
+            yield from pool.run(tarefas, tarefa or ler_pagina)
 
     def sleep(self, seconds: float):
         """
@@ -0,0 +1,362 @@
+"""
+Módulo destinado para armazenar os scripts JavaScript executados no navegador
+pelas interações.
+
+Os scripts recebem seus parâmetros via `arguments`, nunca por interpolação de strings.
+"""
+
+# arguments[0]: lista de elementos | arguments[1]: lista de campos
+LER_ATRIBUTOS = """
+const [elementos, campos] = arguments;
+const ler = (el, campo) => {
+    if (campo === 'text') return (el.innerText !== undefined ? el.innerText : el.textContent).trim();
+    if (campo === 'html') return el.outerHTML;
+    if (campo === 'inner_html') return el.innerHTML;
+    const prop = el[campo];
+    if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') return prop;
+    return el.getAttribute(campo);
+};
+return elementos.map(el => campos.map(campo => ler(el, campo)));
+"""
+
+# Função auxiliar: localiza elementos a partir de um contexto (document ou elemento)
+_LOCALIZAR = """
+const localizar = (contexto, seletor, metodo, todos) => {
+    if (!seletor || seletor === '.') return todos ? [contexto] : contexto;
+    if (metodo === 'xpath') {
+        const doc = contexto.ownerDocument || contexto;
+        if (!todos) return doc.evaluate(seletor, contexto, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        const snap = doc.evaluate(seletor, contexto, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nos = [];
+        for (let i = 0; i < snap.snapshotLength; i++) nos.push(snap.snapshotItem(i));
+        return nos;
+    }
+    if (metodo === 'id') seletor = '#' + CSS.escape(seletor);
+    else if (metodo === 'name') seletor = '[name="' + CSS.escape(seletor) + '"]';
+    return todos ? Array.from(contexto.querySelectorAll(seletor)) : contexto.querySelector(seletor);
+};
+"""
+
+# Funções auxiliares: lê um atributo de um elemento e monta o registro de uma linha
+# Cada campo: {nome, seletor, metodo, atributo, multiplo}
+_LER_REGISTRO = """
+const ler = (el, atributo) => {
+    if (!el) return null;
+    if (atributo === 'text') return (el.innerText !== undefined ? el.innerText : el.textContent).trim();
+    if (atributo === 'html') return el.outerHTML;
+    if (atributo === 'inner_html') return el.innerHTML;
+    const prop = el[atributo];
+    if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') return prop;
+    return el.getAttribute(atributo);
+};
+const lerRegistro = (linha, campos) => {
+    const registro = {};
+    for (const campo of campos) {
+        registro[campo.nome] = campo.multiplo
+            ? localizar(linha, campo.seletor, campo.metodo, true).map(el => ler(el, campo.atributo))
+            : ler(localizar(linha, campo.seletor, campo.metodo, false), campo.atributo);
+    }
+    return registro;
+};
+"""
+
+# arguments[0]: seletor das linhas | arguments[1]: método | arguments[2]: lista de campos
+EXTRAIR = _LOCALIZAR + _LER_REGISTRO + """
+const [seletorLinha, metodoLinha, campos] = arguments;
+return localizar(document, seletorLinha, metodoLinha, true).map(linha => lerRegistro(linha, campos));
+"""
+
+# arguments[0]: lista de campos
+# Lê campos avulsos da página (título, preço, etc.), relativos ao documento
+EXTRAIR_CAMPOS = _LOCALIZAR + _LER_REGISTRO + """
+return lerRegistro(document, arguments[0]);
+"""
+
+# arguments[0]: seletor das linhas | arguments[1]: método
+# Assinatura usada para detectar a troca de página na paginação
+ASSINATURA_LINHAS = _LOCALIZAR + """
+const linhas = localizar(document, arguments[0], arguments[1], true);
+return linhas.length + ':' + (linhas.length ? linhas[0].outerHTML.slice(0, 2000) : '');
+"""
+
+# arguments[0]: seletor do botão | arguments[1]: método
+# Retorna false quando o botão não existe ou está desabilitado
+CLICAR_PROXIMA = _LOCALIZAR + """
+const botao = localizar(document, arguments[0], arguments[1], false);
+if (!botao || botao.disabled || botao.getAttribute('aria-disabled') === 'true' || botao.classList.contains('disabled')) return false;
+botao.click();
+return true;
+"""
+
+# arguments[0]: lista de campos {seletor, metodo, valor} | arguments[1]: {seletor, metodo} clicado no fim (ou null)
+# Define os valores pelo setter nativo (compatível com React/Vue/Angular) e dispara os eventos
+# input/change; checkboxes e radios são clicados só quando o estado muda.
+# Devolve a lista de erros {seletor, erro} dos campos não preenchidos; com erros, o clique final não é feito.
+PREENCHER_FORMULARIO = _LOCALIZAR + """
+const [campos, clicar] = arguments;
+const disparar = (el, ...eventos) => eventos.forEach(nome => el.dispatchEvent(new Event(nome, {bubbles: true})));
+const definirValor = (el, valor) => {
+    const descritor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+    if (descritor && descritor.set) descritor.set.call(el, valor); else el.value = valor;
+};
+const marcar = (el, estado) => { if (el.checked !== estado) el.click(); if (el.checked !== estado) { el.checked = estado; disparar(el, 'input', 'change'); } };
+const verdadeiro = valor => typeof valor === 'string' ? !['', '0', 'false', 'off', 'nao', 'não'].includes(valor.toLowerCase()) : !!valor;
+const erros = [];
+for (const campo of campos) {
+    const encontrados = localizar(document, campo.seletor, campo.metodo, true);
+    const el = encontrados[0];
+    if (!el) { erros.push({seletor: campo.seletor, erro: 'não encontrado'}); continue; }
+    const valor = campo.valor;
+    const tipo = (el.type || '').toLowerCase();
+    if (tipo === 'radio') {
+        const alvo = typeof valor === 'boolean' ? el : encontrados.find(r => r.value === String(valor))
+            || Array.from(document.getElementsByName(el.name)).find(r => r.value === String(valor));
+        if (!alvo) { erros.push({seletor: campo.seletor, erro: 'opção não encontrada: ' + valor}); continue; }
+        marcar(alvo, typeof valor === 'boolean' ? valor : true);
+    } else if (tipo === 'checkbox') {
+        marcar(el, verdadeiro(valor));
+    } else if (el.tagName === 'SELECT') {
+        const desejados = (Array.isArray(valor) ? valor : [valor]).map(String);
+        const opcoes = Array.from(el.options);
+        const escolhidas = opcoes.filter(o => desejados.includes(o.value) || desejados.includes(o.text.trim()));
+        if (escolhidas.length < desejados.length) { erros.push({seletor: campo.seletor, erro: 'opção não encontrada: ' + desejados}); continue; }
+        opcoes.forEach(o => { o.selected = escolhidas.includes(o); });
+        disparar(el, 'input', 'change');
+    } else if (el.isContentEditable) {
+        el.focus();
+        el.textContent = valor === null ? '' : String(valor);
+        disparar(el, 'input');
+        el.blur();
+    } else {
+        el.focus();
+        definirValor(el, valor === null ? '' : String(valor));
+        disparar(el, 'input', 'change');
+        el.blur();
+    }
+}
+if (clicar && !erros.length) {
+    const alvo = localizar(document, clicar.seletor, clicar.metodo, false);
+    if (alvo) alvo.click(); else erros.push({seletor: clicar.seletor, erro: 'não encontrado'});
+}
+return erros;
+"""
+
+# arguments[0]: seletor dos itens | arguments[1]: método | arguments[2]: seletor do container (ou null)
+# arguments[3]: método do container | arguments[4]: lista de campos
+# Instala em window.__coleta um MutationObserver que lê cada item novo assim que ele entra no DOM
+# (antes de listas virtualizadas o removerem) e o guarda em `pendentes` até o próximo passo.
+COLETA_INICIAR = _LOCALIZAR + _LER_REGISTRO + """
+const [seletor, metodo, seletorContainer, metodoContainer, campos] = arguments;
+if (window.__coleta) window.__coleta.observer.disconnect();
+const container = seletorContainer ? localizar(document, seletorContainer, metodoContainer, false) : null;
+const raiz = container || document.body;
+const coleta = {container, vistos: new WeakSet(), pendentes: [], avisar: null};
+const adicionar = el => {
+    if (coleta.vistos.has(el)) return;
+    coleta.vistos.add(el);
+    coleta.pendentes.push(lerRegistro(el, campos));
+};
+const varrer = () => localizar(raiz, seletor, metodo, true).forEach(adicionar);
+coleta.observer = new MutationObserver(mutacoes => {
+    if (metodo === 'css') {
+        // Só os nós adicionados são examinados, sem percorrer a lista inteira
+        for (const mutacao of mutacoes) {
+            for (const no of mutacao.addedNodes) {
+                if (no.nodeType !== 1) continue;
+                if (no.matches(seletor)) adicionar(no);
+                no.querySelectorAll(seletor).forEach(adicionar);
+            }
+        }
+    } else {
+        varrer();
+    }
+    if (coleta.pendentes.length && coleta.avisar) coleta.avisar();
+});
+varrer();
+coleta.observer.observe(raiz, {childList: true, subtree: true});
+window.__coleta = coleta;
+"""
+
+# arguments[0]: deslocamento do scroll em px (0 ou null rola até o fim)
+# Devolve os registros novos desde o passo anterior e rola o container (ou a janela); null se a coleta foi perdida
+COLETA_PASSO = """
+const [passo] = arguments;
+const coleta = window.__coleta;
+if (!coleta) return null;
+const registros = coleta.pendentes.splice(0);
+const alvo = coleta.container;
+if (alvo) alvo.scrollTop = passo ? alvo.scrollTop + passo : alvo.scrollHeight;
+else window.scrollBy(0, passo || document.documentElement.scrollHeight);
+return registros;
+"""
+
+# arguments[0]: seletor do marcador de fim da lista (ou null) | arguments[1]: método | arguments[2]: timeout em ms
+# Espera itens novos chegarem (ou o timeout) e devolve {novos, fim, marcador, perdida}
+COLETA_ESPERAR = _LOCALIZAR + """
+const [seletorFim, metodoFim, timeout] = arguments;
+const cb = arguments[arguments.length - 1];
+const coleta = window.__coleta;
+if (!coleta) return cb({novos: 0, fim: true, marcador: false, perdida: true});
+const estado = () => {
+    const alvo = coleta.container || document.scrollingElement || document.documentElement;
+    return {
+        novos: coleta.pendentes.length,
+        fim: alvo.scrollTop + alvo.clientHeight >= alvo.scrollHeight - 2,
+        marcador: !!(seletorFim && localizar(document, seletorFim, metodoFim, false)),
+        perdida: false,
+    };
+};
+const atual = estado();
+if (atual.novos || atual.marcador) return cb(atual);
+const limite = setTimeout(() => { coleta.avisar = null; cb(estado()); }, timeout);
+coleta.avisar = () => { clearTimeout(limite); coleta.avisar = null; cb(estado()); };
+"""
+
+COLETA_PARAR = """
+if (window.__coleta) { window.__coleta.observer.disconnect(); delete window.__coleta; }
+"""
+
+# arguments[0]: URL
+# Marca o documento atual antes de navegar, para não confundi-lo com a nova página ainda não carregada
+NAVEGAR_ABA = """
+window.__abaNavegando = true;
+window.location.href = arguments[0];
+"""
+
+# arguments[0]: política ('load', 'domcontentloaded' ou 'selector') | arguments[1]: seletor | arguments[2]: método
+# Devolve true quando o novo documento da aba atende a política
+ABA_PRONTA = _LOCALIZAR + """
+const [politica, seletor, metodo] = arguments;
+if (window.__abaNavegando || location.href === 'about:blank') return false;
+if (politica === 'load') return document.readyState === 'complete';
+if (document.readyState === 'loading') return false;
+return politica !== 'selector' || !!localizar(document, seletor, metodo, false);
+"""
+
+# Função JS (seletor, metodo, condicao, todos, timeoutMs) => Promise
+# Resolve com o elemento (ou lista) assim que a condição for atendida, observando o DOM
+# com MutationObserver e, como garantia, verificando a cada `intervalo` ms.
+ESPERAR_ELEMENTO_FN = """(seletor, metodo, condicao, todos, timeout, intervalo) => new Promise((resolve, reject) => {
+""" + _LOCALIZAR + """
+    const pronto = el => {
+        if (!el) return false;
+        if (condicao === 'presence' || condicao === 'text_in') return true;
+        const visivel = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        if (condicao === 'visibled') return visivel;
+        if (condicao === 'selected') return !!(el.selected || el.checked);
+        return visivel && !el.disabled;
+    };
+    const verificar = () => {
+        if (todos) {
+            const els = localizar(document, seletor, metodo, true).filter(pronto);
+            return els.length ? els : null;
+        }
+        const el = localizar(document, seletor, metodo, false);
+        return pronto(el) ? el : null;
+    };
+    const inicial = verificar();
+    if (inicial) return resolve(inicial);
+    let observer, relogio, limite;
+    const fim = () => { observer.disconnect(); clearInterval(relogio); clearTimeout(limite); };
+    const checar = () => { const r = verificar(); if (r) { fim(); resolve(r); } };
+    observer = new MutationObserver(checar);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    relogio = setInterval(checar, intervalo || 100);
+    limite = setTimeout(() => { fim(); reject(new Error('timeout')); }, timeout);
+})"""
+
+# Versão para execute_async_script de ESPERAR_ELEMENTO_FN; devolve null no timeout
+ESPERAR_ELEMENTO = """
+const cb = arguments[arguments.length - 1];
+(""" + ESPERAR_ELEMENTO_FN + """)(...Array.from(arguments).slice(0, -1)).then(cb, () => cb(null));
+"""
+
+# arguments[0]: trecho esperado da URL | arguments[1]: timeout em ms
+# Devolve true quando a URL contém o alvo, false no timeout e null se a página for descarregada
+ESPERAR_URL = """
+const [alvo, timeout] = arguments;
+const cb = arguments[arguments.length - 1];
+if (location.href.includes(alvo)) return cb(true);
+const {pushState, replaceState} = history;
+let relogio, limite;
+const fim = r => {
+    clearInterval(relogio); clearTimeout(limite);
+    history.pushState = pushState; history.replaceState = replaceState;
+    removeEventListener('popstate', checar); removeEventListener('hashchange', checar); removeEventListener('pagehide', sair);
+    cb(r);
+};
+const checar = () => { if (location.href.includes(alvo)) fim(true); };
+const sair = () => fim(null);
+history.pushState = function () { pushState.apply(this, arguments); checar(); };
+history.replaceState = function () { replaceState.apply(this, arguments); checar(); };
+addEventListener('popstate', checar); addEventListener('hashchange', checar); addEventListener('pagehide', sair);
+relogio = setInterval(checar, 50);
+limite = setTimeout(() => fim(false), timeout);
+"""
+
+# arguments[0]: timeout em ms | Resolve quando o DOMContentLoaded já ocorreu
+ESPERAR_DOM = """
+const [timeout] = arguments;
+const cb = arguments[arguments.length - 1];
+if (document.readyState !== 'loading') return cb(performance.now());
+const limite = setTimeout(() => cb(null), timeout);
+document.addEventListener('DOMContentLoaded', () => { clearTimeout(limite); cb(performance.now()); }, {once: true});
+"""
+
+# arguments[0]: ms sem atividade de rede | arguments[1]: timeout em ms
+# Conta fetch/XHR em andamento e novos recursos (Resource Timing); resolve com performance.now()
+# quando a página passa `ocioso` ms sem nenhuma atividade, ou null no timeout.
+ESPERAR_REDE_OCIOSA = """
+const [ocioso, timeout] = arguments;
+const cb = arguments[arguments.length - 1];
+let ativos = 0, ultimo = performance.now();
+const marcar = () => { ultimo = performance.now(); };
+const {fetch: fetchOriginal} = window;
+const {send: sendOriginal} = XMLHttpRequest.prototype;
+window.fetch = function () {
+    ativos++; marcar();
+    return fetchOriginal.apply(this, arguments).finally(() => { ativos--; marcar(); });
+};
+XMLHttpRequest.prototype.send = function () {
+    ativos++; marcar();
+    this.addEventListener('loadend', () => { ativos--; marcar(); }, {once: true});
+    return sendOriginal.apply(this, arguments);
+};
+const observer = new PerformanceObserver(marcar);
+observer.observe({type: 'resource', buffered: false});
+const inicio = performance.now();
+const fim = r => {
+    clearInterval(relogio);
+    observer.disconnect();
+    window.fetch = fetchOriginal;
+    XMLHttpRequest.prototype.send = sendOriginal;
+    cb(r);
+};
+const relogio = setInterval(() => {
+    const agora = performance.now();
+    if (document.readyState === 'complete' && ativos <= 0 && agora - ultimo >= ocioso) fim(agora);
+    else if (agora - inicio >= timeout) fim(null);
+}, Math.min(50, ocioso));
+"""
+
+# Tempos da Navigation Timing API, em ms desde o início da navegação (null se ainda não ocorreu)
+TEMPOS_NAVEGACAO = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return null;
+const valor = v => v > 0 ? v : null;
+return {
+    ttfb: valor(nav.responseStart),
+    dom_content_loaded: valor(nav.domContentLoadedEventEnd),
+    load: valor(nav.loadEventEnd),
+};
+"""
+
+# Status HTTP da navegação (Chrome 109+) e indícios de captcha/desafio anti-bot na página
+VERIFICAR_BLOQUEIO = """
+const nav = performance.getEntriesByType('navigation')[0];
+const captcha = !!document.querySelector(
+    'iframe[src*="recaptcha"], iframe[src*="hcaptcha"], iframe[src*="challenges.cloudflare.com"], ' +
+    '#challenge-form, #cf-challenge-running, .g-recaptcha, .h-captcha, .cf-turnstile')
+    || /^(just a moment|attention required|access denied)/i.test(document.title);
+return {status: nav && nav.responseStatus ? nav.responseStatus : null, captcha: captcha};
+"""
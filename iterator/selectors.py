@@ -0,0 +1,296 @@
+"""
+Módulo com o registro de seletores compilados.
+
+Os seletores nomeados (de utils/elements.py ou de um YAML) são validados e
+compilados uma única vez em objetos Locator imutáveis, com a estratégia do
+Selenium e as condições de espera já resolvidas, e são usados nos métodos da
+Interation como '@nome'. Seletores avulsos são compilados sob demanda e mantidos
+em cache; como os navegadores aceitam CSS que o cssselect não conhece (flags de
+atributo, :not com seletores compostos, :focus-visible, etc.), um CSS avulso que
+não passa na validação só gera um aviso e a palavra final fica com o navegador.
+"""
+import functools
+from collections import OrderedDict
+
+import yaml
+from cssselect import GenericTranslator, SelectorError
+from lxml import etree
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from utils import elements
+from utils.logger_config import logger
+
+METODOS = {
+    'css': By.CSS_SELECTOR,
+    'id': By.ID,
+    'xpath': By.XPATH,
+    'name': By.NAME
+}
+
+CONDICOES = {
+    'clickable': EC.element_to_be_clickable,
+    'selected': EC.element_located_to_be_selected,
+    'presence': EC.presence_of_element_located,
+    'visibled': EC.visibility_of_element_located
+}
+
+CONDICOES_TODOS = {
+    'clickable': EC.element_to_be_clickable,
+    'selected': EC.element_located_to_be_selected,
+    'presence': EC.presence_of_all_elements_located,
+    'visibled': EC.visibility_of_all_elements_located
+}
+
+
+class Locator:
+    """Seletor compilado e imutável."""
+
+    __slots__ = ('nome', 'seletor', 'metodo', 'by', '_condicoes', '_condicoes_todos')
+
+    def __init__(self, seletor: str, metodo='xpath', nome=None):
+        """
+        Inicializa um objeto Locator.
+
+        Args:
+            seletor (str): Seletor do elemento.
+            metodo (str): Método de localização ('xpath', 'css', 'id' ou 'name') (padrão: 'xpath').
+            nome (str): Nome do seletor no registro (padrão: None, seletor avulso).
+        """
+        if metodo not in METODOS:
+            raise ValueError(f"Método de localização '{metodo}' inválido. Opções: {', '.join(METODOS)}.")
+        validar(seletor, metodo, estrito=nome is not None)
+
+        localizador = (METODOS[metodo], seletor)
+        valores = {
+            'nome': nome,
+            'seletor': seletor,
+            'metodo': metodo,
+            'by': METODOS[metodo],
+            '_condicoes': {chave: condicao(localizador) for chave, condicao in CONDICOES.items()},
+            '_condicoes_todos': {chave: condicao(localizador) for chave, condicao in CONDICOES_TODOS.items()},
+        }
+        for atributo, valor in valores.items():
+            object.__setattr__(self, atributo, valor)
+
+    def __setattr__(self, atributo, valor):
+        raise AttributeError('Locator é imutável.')
+
+    def __repr__(self):
+        return f'Locator(nome={self.nome!r}, seletor={self.seletor!r}, metodo={self.metodo!r})'
+
+    def condicao(self, element_is: str, todos=False):
+        """
+        Retorna a condição de espera já compilada.
+
+        Args:
+            element_is (str): Condição esperada do elemento.
+            todos (bool): Condição para todos os elementos correspondentes (padrão: False).
+
+        Returns:
+            callable: Condição do Selenium para WebDriverWait/WaitEngine.
+        """
+        if element_is == 'text_in':
+            raise ValueError("A condição 'text_in' exige um texto; use EC.text_to_be_present_in_element diretamente.")
+        condicoes = self._condicoes_todos if todos else self._condicoes
+        try:
+            return condicoes[element_is]
+        except KeyError:
+            raise ValueError(f"Condição '{element_is}' inválida. Opções: {', '.join(condicoes)}.")
+
+
+def validar(seletor: str, metodo: str, estrito=True):
+    """
+    Valida a sintaxe de um seletor XPath ou CSS.
+
+    Args:
+        seletor (str): Seletor do elemento.
+        metodo (str): Método de localização.
+        estrito (bool): Rejeita CSS que o cssselect não entende; sem estrito, só registra um aviso,
+            já que o navegador pode aceitar o seletor (padrão: True).
+    """
+    if not isinstance(seletor, str) or not seletor:
+        raise ValueError(f'Seletor inválido: {seletor!r}.')
+    try:
+        if metodo == 'xpath':
+            etree.XPath(seletor)
+        elif metodo == 'css':
+            GenericTranslator().css_to_xpath(seletor)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"Seletor {metodo} inválido '{seletor}': {e}")
+    except SelectorError as e:
+        if estrito:
+            raise ValueError(f"Seletor {metodo} inválido '{seletor}': {e}")
+        logger.warning(f"Seletor css '{seletor}' não reconhecido na validação local ({e}); será avaliado pelo navegador.")
+
+
+@functools.lru_cache(maxsize=1024)
+def compilar(seletor: str, metodo='xpath') -> Locator:
+    """
+    Compila (com cache) um seletor avulso.
+
+    Args:
+        seletor (str): Seletor do elemento.
+        metodo (str): Método de localização (padrão: 'xpath').
+
+    Returns:
+        Locator: Seletor compilado.
+    """
+    return Locator(seletor, metodo)
+
+
+class SelectorRegistry:
+    """Registro de seletores nomeados, referenciados como '@nome'."""
+
+    PREFIXO = '@'
+
+    def __init__(self, seletores=None):
+        """
+        Inicializa um objeto SelectorRegistry.
+
+        Args:
+            seletores (dict): Mapeamento nome -> seletor (str, usa xpath) ou dict {'seletor', 'metodo'} (padrão: None).
+        """
+        self._locators = {}
+        if seletores:
+            self.adicionar(seletores)
+
+    @classmethod
+    def from_elements(cls, modulo=elements):
+        """
+        Cria o registro a partir dos dicionários XPATH e CSS de utils/elements.py.
+
+        Args:
+            modulo: Módulo com os dicionários XPATH e CSS (padrão: utils.elements).
+
+        Returns:
+            SelectorRegistry: Registro carregado.
+        """
+        registro = cls()
+        registro.adicionar({nome: {'seletor': s, 'metodo': 'xpath'} for nome, s in getattr(modulo, 'XPATH', {}).items()})
+        registro.adicionar({nome: {'seletor': s, 'metodo': 'css'} for nome, s in getattr(modulo, 'CSS', {}).items()})
+        return registro
+
+    @classmethod
+    def from_yaml(cls, caminho: str):
+        """
+        Cria o registro a partir de um arquivo YAML.
+
+        Exemplo de arquivo:
+            botao_login: '//button[@type="submit"]'
+            campo_busca: {seletor: 'input[name=q]', metodo: css}
+
+        Args:
+            caminho (str): Caminho do arquivo YAML.
+
+        Returns:
+            SelectorRegistry: Registro carregado.
+        """
+        with open(caminho, 'r', encoding='utf-8') as file:
+            return cls(yaml.safe_load(file) or {})
+
+    def adicionar(self, seletores: dict):
+        """
+        Valida, compila e adiciona seletores ao registro.
+
+        Todos os seletores são validados antes; se algum for inválido nada é adicionado.
+
+        Args:
+            seletores (dict): Mapeamento nome -> seletor (str) ou dict {'seletor', 'metodo'}.
+        """
+        novos, erros = {}, []
+        for nome, definicao in seletores.items():
+            if isinstance(definicao, str):
+                definicao = {'seletor': definicao}
+            try:
+                novos[nome] = Locator(definicao.get('seletor'), definicao.get('metodo', 'xpath'), nome)
+            except ValueError as e:
+                erros.append(f'{nome}: {e}')
+        if erros:
+            raise ValueError('Seletores inválidos:\n' + '\n'.join(erros))
+        self._locators.update(novos)
+
+    def __contains__(self, nome):
+        return nome in self._locators
+
+    def __getitem__(self, nome) -> Locator:
+        return self._locators[nome]
+
+    def __len__(self):
+        return len(self._locators)
+
+    def resolver(self, tag: str, metodo='xpath') -> Locator:
+        """
+        Retorna o Locator de um nome do registro ('@nome') ou compila o seletor avulso.
+
+        Um texto sem o prefixo é sempre tratado como seletor, mesmo que coincida com um nome do registro.
+
+        Args:
+            tag (str | Locator): '@nome' do registro, seletor avulso ou Locator já compilado.
+            metodo (str): Método de localização do seletor avulso (padrão: 'xpath').
+
+        Returns:
+            Locator: Seletor compilado.
+        """
+        if isinstance(tag, Locator):
+            return tag
+        if isinstance(tag, str) and tag.startswith(self.PREFIXO):
+            nome = tag[len(self.PREFIXO):]
+            if nome not in self._locators:
+                raise ValueError(f"Seletor '{nome}' não encontrado no registro.")
+            return self._locators[nome]
+        return compilar(tag, metodo)
+
+
+class ElementCache:
+    """Cache LRU dos últimos elementos resolvidos na página atual."""
+
+    def __init__(self, capacidade=64):
+        """
+        Inicializa um objeto ElementCache.
+
+        Args:
+            capacidade (int): Quantidade máxima de elementos guardados (padrão: 64).
+        """
+        self.capacidade = capacidade
+        self._elementos = OrderedDict()
+
+    def get(self, chave):
+        elemento = self._elementos.get(chave)
+        if elemento is not None:
+            self._elementos.move_to_end(chave)
+        return elemento
+
+    def put(self, chave, elemento):
+        self._elementos[chave] = elemento
+        self._elementos.move_to_end(chave)
+        while len(self._elementos) > self.capacidade:
+            self._elementos.popitem(last=False)
+
+    def invalidar(self, chave=None):
+        """
+        Remove um elemento do cache, ou todos quando chave for None.
+
+        Args:
+            chave: Chave do elemento (padrão: None).
+        """
+        if chave is None:
+            self._elementos.clear()
+        else:
+            self._elementos.pop(chave, None)
+
+
+_registro_padrao = None
+
+
+def registro_padrao() -> SelectorRegistry:
+    """
+    Retorna o registro carregado de utils/elements.py, criado no primeiro uso.
+
+    Returns:
+        SelectorRegistry: Registro padrão.
+    """
+    global _registro_padrao
+    if _registro_padrao is None:
+        _registro_padrao = SelectorRegistry.from_elements()
+    return _registro_padrao
@@ -0,0 +1,224 @@
+"""
+Módulo com o pool de abas de uma única sessão do navegador.
+
+Em vez de um navegador por tarefa, N abas da mesma sessão processam a fila:
+a navegação de cada aba é disparada sem bloquear (window.location), e enquanto
+umas carregam, as que já estão prontas são processadas. Cada aba guarda o seu
+próprio contexto (cache de elementos, tarefa e tempos), e a troca de janela só
+é enviada ao driver quando a aba ativa realmente muda.
+
+Funciona melhor com Driver(page_load_strategy='none' ou 'eager'); com 'normal'
+as páginas continuam carregando em paralelo, mas a verificação de uma aba
+ainda carregando espera o evento load.
+"""
+import time
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from driver.health import sessao_morta
+from iterator import scripts
+from iterator.selectors import ElementCache
+from utils.logger_config import logger
+
+POLITICAS = {None: 'load', 'load': 'load', 'domcontentloaded': 'domcontentloaded', 'selector': 'selector'}
+
+# Marca o fim da entrada, já que None pode ser uma tarefa válida
+_FIM = object()
+
+
+def ler_pagina(interacao, tarefa):
+    """
+    Tarefa padrão: retorna URL final e título da aba.
+
+    Args:
+        interacao (Interation): Interação posicionada na aba.
+        tarefa (str | dict): URL ou dicionário com a chave 'url'.
+
+    Returns:
+        dict: URL final e título da página.
+    """
+    return {'url': interacao.driver.current_url, 'titulo': interacao.driver.title}
+
+
+class _Aba:
+    """Contexto de uma aba do pool."""
+
+    __slots__ = ('handle', 'cache', 'tarefa', 'inicio', 'paginas')
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.cache = ElementCache()
+        self.tarefa = None
+        self.inicio = 0.0
+        self.paginas = 0
+
+
+class TabPool:
+    """Pool de abas de uma sessão do navegador processando tarefas intercaladas."""
+
+    def __init__(self, interacao, abas=4, pronto=None, seletor=None, metodo='xpath', tempo=30, intervalo=0.05):
+        """
+        Inicializa um objeto TabPool.
+
+        Args:
+            interacao (Interation): Interação ligada ao navegador.
+            abas (int): Quantidade de abas usadas, incluindo a atual (padrão: 4).
+            pronto (str): Quando a aba está pronta: None/'load', 'domcontentloaded' ou 'selector' (padrão: None).
+            seletor (str): Seletor esperado pela política 'selector' (padrão: None).
+            metodo (str): Método de localização do seletor (padrão: 'xpath').
+            tempo (int): Tempo máximo de carregamento de cada página em segundos (padrão: 30).
+            intervalo (float): Pausa quando nenhuma aba está pronta, em segundos (padrão: 0.05).
+        """
+        if pronto not in POLITICAS:
+            raise ValueError(f"Política de prontidão '{pronto}' inválida. Opções: {', '.join(str(p) for p in POLITICAS)}.")
+        if pronto == 'selector' and not seletor:
+            raise ValueError("A política 'selector' exige o parâmetro seletor.")
+
+        self.interacao = interacao
+        self.driver = interacao.driver
+        self.politica = POLITICAS[pronto]
+        self.locator = interacao.seletores.resolver(seletor, metodo) if seletor else None
+        self.tempo = tempo
+        self.intervalo = intervalo
+
+        self._original = self.driver.current_window_handle
+        self._cache_original = interacao.cache
+        self._atual = self._original
+        self._abas = [_Aba(self._original)]
+        perfil = getattr(self.driver, 'perfil_recursos', None)
+        for _ in range(abas - 1):
+            self.driver.switch_to.new_window('tab')
+            if perfil:
+                # O bloqueio de recursos do CDP vale por aba
+                perfil.aplicar_chrome(self.driver)
+            self._abas.append(_Aba(self.driver.current_window_handle))
+        self._atual = self._abas[-1].handle
+        self._metricas = {'paginas': 0, 'falhas': 0, 'trocas': 0, 'tempo_carregamento': 0.0, 'tempo_ocioso': 0.0}
+
+    def _ativar(self, aba):
+        """
+        Torna a aba ativa no driver, só enviando o comando se ela ainda não for a atual.
+
+        Args:
+            aba (_Aba): Aba a ativar.
+        """
+        if self._atual != aba.handle:
+            self.driver.switch_to.window(aba.handle)
+            self._atual = aba.handle
+            self._metricas['trocas'] += 1
+        self.interacao.cache = aba.cache
+
+    def _iniciar(self, aba, tarefa):
+        self._ativar(aba)
+        aba.cache.invalidar()
+        aba.tarefa = tarefa
+        aba.inicio = time.perf_counter()
+        url = tarefa['url'] if isinstance(tarefa, dict) else tarefa
+        self.driver.execute_script(scripts.NAVEGAR_ABA, url)
+
+    def _pronta(self, aba):
+        self._ativar(aba)
+        return self.driver.execute_script(scripts.ABA_PRONTA, self.politica,
+                                          self.locator.seletor if self.locator else None,
+                                          self.locator.metodo if self.locator else None)
+
+    def run(self, tarefas, tarefa=ler_pagina):
+        """
+        Processa as tarefas distribuindo-as entre as abas.
+
+        Os resultados saem na ordem em que as páginas ficam prontas, não na ordem da entrada.
+
+        Exemplo de uso:
+            for url, resultado, erro in TabPool(bot, abas=6, pronto='domcontentloaded').run(urls, extrair_produto):
+                ...
+
+        Args:
+            tarefas (iterable): URLs ou dicionários com a chave 'url'.
+            tarefa (callable): Função (interacao, tarefa) -> resultado executada com a aba já carregada
+                (padrão: ler_pagina).
+
+        Yields:
+            tuple: (tarefa, resultado, erro), com erro None em caso de sucesso.
+        """
+        fila = iter(tarefas)
+        livres = deque(self._abas)
+        ocupadas = deque()
+
+        while True:
+            # Dispara a navegação em todas as abas livres
+            while livres:
+                proxima = next(fila, _FIM)
+                if proxima is _FIM:
+                    break
+                aba = livres.popleft()
+                self._iniciar(aba, proxima)
+                ocupadas.append(aba)
+
+            if not ocupadas:
+                return
+
+            # Processa a primeira aba pronta, verificando em rodízio
+            processada = False
+            for _ in range(len(ocupadas)):
+                aba = ocupadas.popleft()
+                erro = resultado = None
+                try:
+                    if not self._pronta(aba):
+                        if time.perf_counter() - aba.inicio < self.tempo:
+                            ocupadas.append(aba)
+                            continue
+                        self.driver.execute_script('window.stop();')
+                        raise TimeoutException(f'Página não ficou pronta em {self.tempo} segundos.')
+                    self._metricas['tempo_carregamento'] += time.perf_counter() - aba.inicio
+                    resultado = tarefa(self.interacao, aba.tarefa)
+                except Exception as e:
+                    # Um erro da tarefa do usuário vira o erro desta página; só a perda da sessão encerra o run
+                    erro = f'{type(e).__name__}: {e}'
+                    logger.warning(f'Aba {aba.handle}: falha em {aba.tarefa}: {erro}')
+                    if sessao_morta(e):
+                        raise
+
+                self._metricas['falhas' if erro else 'paginas'] += 1
+                aba.paginas += 1
+                livres.append(aba)
+                processada = True
+                yield aba.tarefa, resultado, erro
+                break
+
+            if not processada:
+                inicio = time.perf_counter()
+                time.sleep(self.intervalo)
+                self._metricas['tempo_ocioso'] += time.perf_counter() - inicio
+
+    def metricas(self):
+        """
+        Retorna as métricas do pool de abas.
+
+        Returns:
+            dict: Páginas, falhas, trocas de aba, tempo médio de carregamento e tempo ocioso.
+        """
+        metricas = dict(self._metricas)
+        metricas['carregamento_medio'] = metricas['tempo_carregamento'] / metricas['paginas'] if metricas['paginas'] else 0.0
+        metricas['paginas_por_aba'] = {aba.handle: aba.paginas for aba in self._abas}
+        return metricas
+
+    def close(self):
+        """
+        Fecha as abas abertas pelo pool e volta para a aba original.
+        """
+        for aba in self._abas[1:]:
+            try:
+                self._ativar(aba)
+                self.driver.close()
+            except WebDriverException:
+                pass
+        self.driver.switch_to.window(self._original)
+        self._atual = self._original
+        self.interacao.cache = self._cache_original
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,266 @@
+"""
+Módulo com o motor de esperas da Interation.
+
+No modo 'evento' a espera é feita dentro da página (MutationObserver e
+listeners de URL) em um único execute_async_script, que retorna assim que a
+condição é atendida. No modo 'polling', ou quando o script não pode ser usado
+(ex.: navegação durante a espera), a condição é verificada com intervalo
+adaptativo: começa curto e cresce até o intervalo configurado.
+"""
+import time
+
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+
+from driver.health import sessao_morta
+from iterator import scripts
+
+# Condições que o script da página sabe verificar
+CONDICOES_EVENTO = ('clickable', 'presence', 'visibled', 'selected')
+
+# Timeout de script padrão das sessões W3C, em segundos
+SCRIPT_TIMEOUT_PADRAO = 30
+
+# Trechos das mensagens do chromedriver/geckodriver quando o documento é trocado durante um script
+MENSAGENS_NAVEGACAO = (
+    'unload',
+    'navigat',
+    'execution context was destroyed',
+    'cannot find context with specified id',
+)
+
+
+def documento_trocado(erro):
+    """
+    Verifica se o erro de um script de espera indica só que a página navegou durante a espera.
+
+    Sessões mortas, janelas fechadas e erros reais do script não contam: devem ser propagados
+    em vez de virar polling ou nova tentativa.
+
+    Args:
+        erro (WebDriverException): Exceção levantada pelo execute_async_script.
+
+    Returns:
+        bool: True se vale repetir a espera no novo documento.
+    """
+    if sessao_morta(erro):
+        return False
+    mensagem = str(erro).lower()
+    return any(trecho in mensagem for trecho in MENSAGENS_NAVEGACAO)
+
+
+class WaitEngine:
+    """Motor de esperas por evento, com fallback para polling adaptativo."""
+
+    def __init__(self, driver, modo='evento', intervalo=0.5, intervalo_minimo=0.05):
+        """
+        Inicializa um objeto WaitEngine.
+
+        Args:
+            driver: Objeto WebDriver do Selenium.
+            modo (str): 'evento' ou 'polling' (padrão: 'evento').
+            intervalo (float): Intervalo máximo do polling em segundos (padrão: 0.5).
+            intervalo_minimo (float): Intervalo inicial do polling em segundos (padrão: 0.05).
+        """
+        if modo not in ('evento', 'polling'):
+            raise ValueError(f"Modo de espera '{modo}' não suportado. Use 'evento' ou 'polling'.")
+
+        self.driver = driver
+        self.modo = modo
+        self.intervalo = intervalo
+        self.intervalo_minimo = intervalo_minimo
+        self._script_timeout = SCRIPT_TIMEOUT_PADRAO
+        self._estatisticas = {}
+
+    def elemento(self, tag, metodo, element_is, tempo, condicao, todos=False):
+        """
+        Espera um elemento (ou todos os elementos) atender à condição.
+
+        Args:
+            tag (str): Identificador do elemento.
+            metodo (str): Método de localização ('xpath', 'css', 'id' ou 'name').
+            element_is (str): Condição esperada do elemento.
+            tempo (float): Tempo máximo de espera em segundos.
+            condicao (callable): Condição do Selenium usada no polling.
+            todos (bool): Espera todos os elementos correspondentes (padrão: False).
+
+        Returns:
+            O valor retornado pela condição (WebElement, lista ou bool).
+        """
+        nome = 'find_all' if todos else 'find'
+        inicio = time.perf_counter()
+        limite = time.monotonic() + tempo
+
+        if self.modo == 'evento' and element_is in CONDICOES_EVENTO:
+            self._garantir_script_timeout(tempo)
+            try:
+                resultado = self.driver.execute_async_script(
+                    scripts.ESPERAR_ELEMENTO, tag, metodo, element_is, todos, int(tempo * 1000), int(self.intervalo * 1000))
+            except WebDriverException as e:
+                if not documento_trocado(e):
+                    raise
+                # A página foi descarregada durante a espera: continua por polling
+                resultado = None
+                if time.monotonic() < limite:
+                    return self._poll(nome, condicao, limite - time.monotonic(), inicio)
+            if not resultado:
+                self._registrar(nome, 'evento', inicio, False)
+                raise TimeoutException(f"Elemento '{tag}' não atendeu à condição '{element_is}' dentro de {tempo} segundos.")
+            self._registrar(nome, 'evento', inicio, True)
+            return resultado
+
+        return self._poll(nome, condicao, tempo, inicio)
+
+    def url(self, target_url, tempo):
+        """
+        Espera até que a URL do navegador contenha a URL alvo.
+
+        Args:
+            target_url (str): URL alvo que estamos esperando.
+            tempo (float): Tempo máximo de espera em segundos.
+
+        Returns:
+            bool: True quando a URL corresponde ao alvo.
+        """
+        inicio = time.perf_counter()
+        limite = time.monotonic() + tempo
+
+        if self.modo == 'polling':
+            return self._poll('url', lambda d: target_url in d.current_url, tempo, inicio)
+
+        self._garantir_script_timeout(tempo)
+        while True:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                resultado = self.driver.execute_async_script(scripts.ESPERAR_URL, target_url, int(restante * 1000))
+            except WebDriverException as e:
+                if not documento_trocado(e):
+                    raise
+                resultado = None
+            if resultado:
+                self._registrar('url', 'evento', inicio, True)
+                return True
+            if resultado is False:
+                break
+            # Houve navegação: confere a nova URL e volta a escutar
+            if target_url in self.driver.current_url:
+                self._registrar('url', 'evento', inicio, True)
+                return True
+
+        self._registrar('url', 'evento', inicio, False)
+        raise TimeoutException(f"A URL não correspondeu à URL alvo '{target_url}' dentro do tempo limite de {tempo} segundos.")
+
+    def script(self, nome, script, tempo, *args):
+        """
+        Executa um script assíncrono de espera, repetindo-o se a página navegar no meio.
+
+        O script recebe `args` seguidos do tempo restante em ms e deve devolver null no timeout.
+
+        Args:
+            nome (str): Tipo da espera, usado nas estatísticas.
+            script (str): Script para execute_async_script.
+            tempo (float): Tempo máximo de espera em segundos.
+            *args: Argumentos repassados ao script antes do timeout.
+
+        Returns:
+            O valor devolvido pelo script.
+        """
+        inicio = time.perf_counter()
+        limite = time.monotonic() + tempo
+        self._garantir_script_timeout(tempo)
+        while True:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                resultado = self.driver.execute_async_script(script, *args, int(restante * 1000))
+            except WebDriverException as e:
+                if not documento_trocado(e):
+                    raise
+                # Documento trocado durante a espera: tenta de novo no novo documento
+                time.sleep(min(self.intervalo_minimo, max(restante, 0)))
+                continue
+            if resultado is None:
+                break
+            self._registrar(nome, 'evento', inicio, True)
+            return resultado
+
+        self._registrar(nome, 'evento', inicio, False)
+        raise TimeoutException(f'Condição de {nome} não atendida dentro de {tempo} segundos.')
+
+    def _poll(self, nome, condicao, tempo, inicio):
+        """
+        Verifica a condição com intervalo adaptativo até ela ser atendida.
+
+        Args:
+            nome (str): Tipo da espera, usado nas estatísticas.
+            condicao (callable): Função que recebe o driver e retorna um valor verdadeiro quando atendida.
+            tempo (float): Tempo máximo de espera em segundos.
+            inicio (float): Instante (perf_counter) em que a espera começou.
+
+        Returns:
+            O valor retornado pela condição.
+        """
+        limite = time.monotonic() + tempo
+        intervalo = self.intervalo_minimo
+        while True:
+            try:
+                resultado = condicao(self.driver)
+                if resultado:
+                    self._registrar(nome, 'polling', inicio, True)
+                    return resultado
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                self._registrar(nome, 'polling', inicio, False)
+                raise TimeoutException(f'Condição de {nome} não atendida dentro de {tempo:.1f} segundos.')
+            time.sleep(min(intervalo, restante))
+            intervalo = min(intervalo * 1.5, self.intervalo)
+
+    def _garantir_script_timeout(self, tempo):
+        """
+        Aumenta o timeout de scripts da sessão para caber a espera, se necessário.
+
+        Args:
+            tempo (float): Tempo da espera em segundos.
+        """
+        necessario = tempo + 2
+        if necessario > self._script_timeout:
+            self.driver.set_script_timeout(necessario)
+            self._script_timeout = necessario
+
+    def _registrar(self, nome, modo, inicio, sucesso):
+        """
+        Registra a duração de uma espera.
+
+        Args:
+            nome (str): Tipo da espera.
+            modo (str): 'evento' ou 'polling'.
+            inicio (float): Instante (perf_counter) em que a espera começou.
+            sucesso (bool): Se a condição foi atendida.
+        """
+        duracao = time.perf_counter() - inicio
+        estatistica = self._estatisticas.setdefault(nome, {
+            'quantidade': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0, 'evento': 0, 'polling': 0})
+        estatistica['quantidade'] += 1
+        estatistica['total'] += duracao
+        estatistica['max'] = max(estatistica['max'], duracao)
+        estatistica[modo] += 1
+        if not sucesso:
+            estatistica['timeouts'] += 1
+
+    def estatisticas(self):
+        """
+        Retorna o tempo gasto nas esperas, por tipo.
+
+        Returns:
+            dict: Para cada tipo ('find', 'find_all', 'url'): quantidade, total, média, máximo,
+            timeouts e quantas esperas foram resolvidas por evento ou por polling.
+        """
+        resultado = {}
+        for nome, estatistica in self._estatisticas.items():
+            resultado[nome] = dict(estatistica, media=estatistica['total'] / estatistica['quantidade'])
+        return resultado
@@ -5,8 +5,8 @@ def main():
     config_path = 'config/config.yaml'
 
     bot = Bot(config_path)
-    bot.load_page('https://www.google.com')
-    bot.sleep(10)
+    tempos = bot.load_page('https://www.google.com', pronto='networkidle')
+    logger.info(f"Página pronta em {tempos['total']:.0f} ms (TTFB {tempos['ttfb']} ms, load {tempos['load']} ms)")
     bot.quit()
 
 if __name__ == '__main__':
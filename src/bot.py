@@ -3,40 +3,83 @@ from selenium.common.exceptions import WebDriverException, NoSuchElementExceptio
 
 from driver.driver import Driver
 from iterator.iteration import Interation
+from src.flows import carregar_fluxos
+from src.sink import ResultSink
 from utils.logger_config import logger
 
 class Bot(Interation):
     """Classe que define um bot para interação automatizada com páginas da web."""
 
-    def __init__(self, config_path):
+    def __init__(self, config_path, pool=None, saida=None):
         """
         Inicializa um objeto Bot.
 
         Args:
-            log_file (bool): Define se os registros serão salvos em um arquivo de log (padrão: True).
+            config_path (str): Caminho do arquivo de configuração YAML.
+            pool (DriverPool): Pool de navegadores de onde a sessão será emprestada (padrão: None, cria um Driver novo).
+            saida (str | ResultSink): Arquivo (ou ResultSink) onde self.sink grava os registros coletados;
+                é fechado junto com o bot (padrão: None, sem saída).
         """
-        
-        self.driver = Driver(
-            browser='chrome',
-            headless=False,
-            incognito=False,
-            download_path='',
-            desabilitar_carregamento_imagem=False
-        ).driver
+        self.pool = pool
+        self.sink = ResultSink(saida) if isinstance(saida, str) else saida
+
+        if pool is not None:
+            self.driver = pool.acquire()
+        else:
+            self.driver = Driver(
+                browser='chrome',
+                headless=False,
+                incognito=False,
+                download_path='',
+                desabilitar_carregamento_imagem=False
+            ).driver
 
         # Carrega dados do arquivo de configuração
         with open(config_path, 'r') as file:
             config = yaml.safe_load(file)
         configuracoes = config['Configuracao']
         self.configura = configuracoes['config']
+        self.fluxos = carregar_fluxos(config.get('Fluxos') or {})
 
         super().__init__(self.driver)
 
+    def run_flow(self, nome, entradas):
+        """
+        Executa um fluxo declarado na seção 'Fluxos' do arquivo de configuração.
+
+        Args:
+            nome (str): Nome do fluxo.
+            entradas (iterable): Entradas do fluxo; com self.sink, cada resultado também é gravado na saída.
+
+        Yields:
+            tuple: (entrada, resultado, erro), com erro None em caso de sucesso.
+        """
+        if nome not in self.fluxos:
+            raise ValueError(f"Fluxo '{nome}' não encontrado. Disponíveis: {', '.join(self.fluxos) or 'nenhum'}.")
+        return self.fluxos[nome].run(self, entradas, sink=self.sink)
+
     def close(self):
-        """Fecha o driver do Selenium."""
+        """Fecha o driver do Selenium ou devolve a sessão ao pool."""
 
-        logger.info("Fechando navegador")
-        self.driver.quit()
+        if self.sink is not None:
+            self.sink.close()
+
+        if self.driver is None:
+            return
+
+        if self.pool is not None:
+            logger.info("Devolvendo navegador ao pool")
+            self.pool.release(self.driver)
+        else:
+            logger.info("Fechando navegador")
+            self.driver.quit()
+        self.driver = None
+
+    def quit(self):
+        """Encerra o bot, respeitando o pool de navegadores quando houver."""
 
-    def __del__(self):
         self.close()
+
+    def __del__(self):
+        if getattr(self, 'driver', None) is not None:
+            self.close()
@@ -0,0 +1,202 @@
+"""
+Módulo com o checkpoint das execuções em SQLite.
+
+Guarda cada tarefa com o seu status e resultado, para que uma execução longa
+interrompida (queda do navegador, do processo ou da máquina) seja retomada
+só com as tarefas que faltam. Cada tarefa é identificada por uma chave estável,
+então adicionar a mesma tarefa de novo ou gravar o mesmo resultado duas vezes
+não gera duplicatas.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+PENDENTE = 'pendente'
+CONCLUIDA = 'concluida'
+FALHA = 'falha'
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    chave TEXT PRIMARY KEY,
+    ordem INTEGER NOT NULL,
+    tarefa TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    resultado TEXT,
+    erro TEXT,
+    atualizado_em REAL
+);
+CREATE INDEX IF NOT EXISTS tarefas_status ON tarefas (status, ordem);
+"""
+
+
+def chave_tarefa(tarefa):
+    """
+    Retorna a chave estável de uma tarefa.
+
+    Usa o campo 'id' dos dicionários quando existir; senão, o hash do conteúdo.
+
+    Args:
+        tarefa (str | dict): URL ou dicionário da tarefa.
+
+    Returns:
+        str: Chave da tarefa.
+    """
+    if isinstance(tarefa, dict) and 'id' in tarefa:
+        return str(tarefa['id'])
+    conteudo = json.dumps(tarefa, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+class Checkpoint:
+    """Registro persistente do progresso das tarefas."""
+
+    def __init__(self, caminho='checkpoint.db', chave=chave_tarefa):
+        """
+        Inicializa um objeto Checkpoint.
+
+        Args:
+            caminho (str): Arquivo SQLite do checkpoint (padrão: 'checkpoint.db').
+            chave (callable): Função tarefa -> chave estável (padrão: chave_tarefa).
+        """
+        self.caminho = caminho
+        self.chave = chave
+        self._local = threading.local()
+        with self._conexao() as conexao:
+            conexao.executescript(_ESQUEMA)
+
+    def _conexao(self):
+        """
+        Retorna a conexão SQLite da thread atual.
+
+        Returns:
+            sqlite3.Connection: Conexão em modo WAL.
+        """
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+        return conexao
+
+    def adicionar(self, tarefas, lote=1000):
+        """
+        Registra as tarefas como pendentes; tarefas já registradas são ignoradas.
+
+        Args:
+            tarefas (iterable): URLs ou dicionários de tarefa.
+            lote (int): Tarefas gravadas por transação (padrão: 1000).
+
+        Returns:
+            int: Quantidade de tarefas novas.
+        """
+        conexao = self._conexao()
+        ordem = conexao.execute('SELECT COALESCE(MAX(ordem), 0) FROM tarefas').fetchone()[0]
+        novas, pendentes = 0, []
+
+        def gravar():
+            with conexao:
+                cursor = conexao.executemany(
+                    'INSERT OR IGNORE INTO tarefas (chave, ordem, tarefa) VALUES (?, ?, ?)', pendentes)
+            pendentes.clear()
+            return cursor.rowcount
+
+        for tarefa in tarefas:
+            ordem += 1
+            pendentes.append((self.chave(tarefa), ordem, json.dumps(tarefa, ensure_ascii=False, default=str)))
+            if len(pendentes) >= lote:
+                novas += gravar()
+        if pendentes:
+            novas += gravar()
+        return novas
+
+    def pendentes(self, refazer_falhas=True):
+        """
+        Percorre as tarefas que ainda não foram concluídas, na ordem em que foram adicionadas.
+
+        Args:
+            refazer_falhas (bool): Inclui as tarefas que falharam nas execuções anteriores (padrão: True).
+
+        Yields:
+            str | dict: Tarefa pendente.
+        """
+        status = (PENDENTE, FALHA) if refazer_falhas else (PENDENTE,)
+        ultima = 0
+        while True:
+            # Paginado pela ordem, para não segurar um cursor aberto enquanto o checkpoint é atualizado
+            linhas = self._conexao().execute(
+                f"SELECT ordem, tarefa FROM tarefas WHERE status IN ({','.join('?' * len(status))}) AND ordem > ? "
+                'ORDER BY ordem LIMIT 500', (*status, ultima)).fetchall()
+            if not linhas:
+                return
+            for ultima, tarefa in linhas:
+                yield json.loads(tarefa)
+
+    def concluir(self, tarefa, resultado):
+        """
+        Marca a tarefa como concluída com o seu resultado.
+
+        Args:
+            tarefa (str | dict): Tarefa executada.
+            resultado: Resultado serializável em JSON.
+
+        Returns:
+            bool: True se a tarefa foi concluída agora, False se já estava concluída.
+        """
+        conexao = self._conexao()
+        with conexao:
+            cursor = conexao.execute(
+                'UPDATE tarefas SET status = ?, resultado = ?, erro = NULL, tentativas = tentativas + 1, atualizado_em = ? '
+                'WHERE chave = ? AND status != ?',
+                (CONCLUIDA, json.dumps(resultado, ensure_ascii=False, default=str), time.time(), self.chave(tarefa), CONCLUIDA))
+        return cursor.rowcount > 0
+
+    def falhar(self, tarefa, erro):
+        """
+        Marca a tarefa como falha; ela volta a ser executada em uma retomada.
+
+        Args:
+            tarefa (str | dict): Tarefa executada.
+            erro (str): Descrição do erro.
+        """
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute(
+                'UPDATE tarefas SET status = ?, erro = ?, tentativas = tentativas + 1, atualizado_em = ? '
+                'WHERE chave = ? AND status != ?',
+                (FALHA, erro, time.time(), self.chave(tarefa), CONCLUIDA))
+
+    def resultados(self):
+        """
+        Percorre os resultados das tarefas concluídas.
+
+        Yields:
+            tuple: (tarefa, resultado).
+        """
+        for tarefa, resultado in self._conexao().execute(
+                'SELECT tarefa, resultado FROM tarefas WHERE status = ? ORDER BY ordem', (CONCLUIDA,)):
+            yield json.loads(tarefa), json.loads(resultado)
+
+    def resumo(self):
+        """
+        Retorna a quantidade de tarefas por status.
+
+        Returns:
+            dict: {'pendente', 'concluida', 'falha', 'total'}.
+        """
+        contagem = dict(self._conexao().execute('SELECT status, COUNT(*) FROM tarefas GROUP BY status').fetchall())
+        resumo = {status: contagem.get(status, 0) for status in (PENDENTE, CONCLUIDA, FALHA)}
+        resumo['total'] = sum(resumo.values())
+        return resumo
+
+    def close(self):
+        """
+        Fecha a conexão da thread atual.
+        """
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
@@ -0,0 +1,328 @@
+"""
+Módulo com o fetcher híbrido HTTP/navegador.
+
+Tenta primeiro uma requisição HTTP simples (sessão requests com pool de
+conexões, cookies e user-agent do WebDriver) e só usa o navegador quando um
+seletor obrigatório não é encontrado ou a página parece depender de
+JavaScript. A decisão é aprendida por domínio.
+"""
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.logger_config import logger
+
+# Indícios de que o HTML servido precisa de JavaScript para ter conteúdo
+MARCADORES_JS = (
+    re.compile(r'<noscript[^>]*>[^<]*(enable|habilite|ative)[^<]*javascript', re.I),
+    re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.I),
+    re.compile(r'cf-browser-verification|challenge-platform|Just a moment\.\.\.', re.I),
+)
+
+# Texto visível mínimo para considerar que a página veio renderizada do servidor
+TEXTO_MINIMO = 200
+
+# Escaladas seguidas para o domínio passar a ir direto ao navegador
+LIMITE_ESCALADAS = 3
+
+# Validade, em segundos, da decisão de ir direto ao navegador; depois dela o HTTP é testado de novo
+VALIDADE_DECISAO = 24 * 60 * 60
+
+
+class Resultado:
+    """Resultado de um fetch; faltando lista os campos obrigatórios que nem o navegador encontrou."""
+
+    __slots__ = ('url', 'html', 'via', 'valores', 'faltando')
+
+    def __init__(self, url, html, via, valores, faltando=()):
+        self.url = url
+        self.html = html
+        self.via = via
+        self.valores = valores
+        self.faltando = list(faltando)
+
+    def __repr__(self):
+        return f'Resultado(url={self.url!r}, via={self.via!r}, valores={self.valores!r}, faltando={self.faltando!r})'
+
+
+class HybridFetcher:
+    """Busca páginas por HTTP e escala para o navegador quando necessário."""
+
+    def __init__(self, driver=None, driver_factory=None, timeout=15, pool_maxsize=10, cache_path=None,
+                 validade_decisao=VALIDADE_DECISAO):
+        """
+        Inicializa um objeto HybridFetcher.
+
+        Args:
+            driver: WebDriver já aberto, usado nas escaladas e como fonte de cookies/user-agent (padrão: None).
+            driver_factory (callable): Função sem argumentos que cria o WebDriver na primeira escalada,
+                quando driver não for informado (padrão: None).
+            timeout (int): Timeout das requisições HTTP e da espera pelos campos no navegador, em segundos (padrão: 15).
+            pool_maxsize (int): Conexões mantidas por host no pool HTTP (padrão: 10).
+            cache_path (str): Arquivo JSON onde as decisões por domínio são persistidas (padrão: None).
+            validade_decisao (float): Segundos até um domínio que vai direto ao navegador ser testado por
+                HTTP de novo (padrão: VALIDADE_DECISAO, 24 horas).
+        """
+        self.driver = driver
+        self.driver_factory = driver_factory
+        self.timeout = timeout
+        self.cache_path = cache_path
+        self.validade_decisao = validade_decisao
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._dominios = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as file:
+                for dominio, decisao in json.load(file).items():
+                    # Caches antigos guardam só a decisão, sem a data; contam como tomadas agora
+                    if isinstance(decisao, str):
+                        decisao = {'decisao': decisao, 'em': time.time()}
+                    estado = self._estado(dominio)
+                    estado['decisao'], estado['decidido_em'] = decisao['decisao'], decisao['em']
+
+        if driver is not None:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """
+        Copia user-agent e cookies do WebDriver para a sessão HTTP.
+        """
+        if self.driver is None:
+            return
+        self.session.headers['User-Agent'] = self.driver.execute_script('return navigator.userAgent;')
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+    def fetch(self, url: str, campos: dict = None, metodo='xpath'):
+        """
+        Busca uma página e extrai os campos, por HTTP ou pelo navegador.
+
+        Cada campo pode ser:
+            - str: seletor (XPATH/CSS de utils/elements.py), retornando o texto do primeiro elemento;
+            - tuple: (seletor, atributo);
+            - dict: {'seletor', 'atributo', 'metodo', 'multiplo', 'opcional'}.
+        Um campo não opcional sem correspondência no HTML faz o fetch escalar para o navegador.
+        Erros de rede e respostas HTTP >= 400 não escalam (o navegador receberia o mesmo erro), exceto
+        páginas de desafio anti-bot reconhecidas em MARCADORES_JS.
+
+        Args:
+            url (str): URL da página.
+            campos (dict): Mapeamento nome do campo -> seletor (padrão: None, só o HTML).
+            metodo (str): Método padrão dos seletores, 'xpath' ou 'css' (padrão: 'xpath').
+
+        Returns:
+            Resultado: HTML, valores extraídos, por onde a página foi obtida ('http' ou 'browser') e os
+                campos obrigatórios não encontrados mesmo pelo navegador (em faltando).
+
+        Raises:
+            requests.RequestException: Erro de rede ou resposta HTTP >= 400 que não é um desafio anti-bot.
+        """
+        campos = campos or {}
+        dominio = urlparse(url).netloc
+        estado = self._estado(dominio)
+        self._expirar(dominio)
+
+        if estado['decisao'] != 'browser':
+            motivo = None
+            resposta = self.session.get(url, timeout=self.timeout)
+            if resposta.status_code >= 400:
+                if not any(marcador.search(resposta.text) for marcador in MARCADORES_JS):
+                    resposta.raise_for_status()
+                motivo = f'HTTP {resposta.status_code} com desafio anti-bot'
+            elif self._precisa_js(resposta.text):
+                motivo = 'heurística de JavaScript'
+            else:
+                valores, faltando = self._extrair(resposta.text, campos, metodo)
+                if faltando:
+                    motivo = f"seletor ausente: {', '.join(faltando)}"
+
+            if motivo is None:
+                self._registrar(dominio, 'http')
+                return Resultado(resposta.url, resposta.text, 'http', valores)
+            logger.debug(f'Escalando {url} para o navegador ({motivo}).')
+            self._registrar(dominio, 'escalada')
+
+        return self._fetch_navegador(url, campos, metodo, dominio)
+
+    def _fetch_navegador(self, url, campos, metodo, dominio):
+        """
+        Busca a página pelo navegador e sincroniza os cookies de volta para a sessão HTTP.
+        """
+        if self.driver is None:
+            if self.driver_factory is None:
+                raise RuntimeError(f'A página {url} precisa do navegador, mas nenhum driver foi configurado.')
+            self.driver = self.driver_factory()
+
+        self.driver.get(url)
+        # Espera os campos obrigatórios serem renderizados antes de ler o HTML
+        lido = {}
+
+        def completo(driver):
+            lido['html'] = driver.page_source
+            lido['valores'], lido['faltando'] = self._extrair(lido['html'], campos, metodo)
+            return not lido['faltando']
+
+        try:
+            WebDriverWait(self.driver, self.timeout, poll_frequency=0.25).until(completo)
+        except TimeoutException:
+            logger.warning(f"Campos obrigatórios não encontrados em {url} após {self.timeout}s no navegador: "
+                           f"{', '.join(lido['faltando'])}.")
+        self.sincronizar()
+        self._registrar(dominio, 'browser')
+        return Resultado(self.driver.current_url, lido['html'], 'browser', lido['valores'], lido['faltando'])
+
+    @staticmethod
+    def _precisa_js(conteudo: str):
+        """
+        Heurística: a página depende de JavaScript para mostrar o conteúdo?
+
+        Args:
+            conteudo (str): HTML recebido.
+
+        Returns:
+            bool: True se algum marcador de renderização no cliente for encontrado.
+        """
+        if any(marcador.search(conteudo) for marcador in MARCADORES_JS):
+            return True
+        try:
+            arvore = lxml_html.fromstring(conteudo)
+        except (ValueError, lxml_html.etree.ParserError):
+            return True
+        for no in arvore.xpath('//script|//style|//noscript|//template'):
+            no.drop_tree()
+        return len(' '.join(arvore.text_content().split())) < TEXTO_MINIMO
+
+    @staticmethod
+    def _extrair(conteudo: str, campos: dict, metodo: str):
+        """
+        Extrai os campos do HTML.
+
+        Returns:
+            tuple: (valores, nomes dos campos obrigatórios sem correspondência).
+        """
+        valores, faltando = {}, []
+        if not campos:
+            return valores, faltando
+        arvore = lxml_html.fromstring(conteudo)
+
+        for nome, campo in campos.items():
+            if isinstance(campo, str):
+                campo = {'seletor': campo}
+            elif isinstance(campo, (tuple, list)):
+                campo = {'seletor': campo[0], 'atributo': campo[1]}
+
+            metodo_campo = campo.get('metodo', metodo)
+            if metodo_campo == 'css':
+                encontrados = arvore.cssselect(campo['seletor'])
+            else:
+                encontrados = arvore.xpath(campo['seletor'])
+                if not isinstance(encontrados, list):
+                    encontrados = [encontrados]
+
+            atributo = campo.get('atributo', 'text')
+            lidos = [HybridFetcher._ler(el, atributo) for el in encontrados]
+            if not lidos and not campo.get('opcional', False):
+                faltando.append(nome)
+            valores[nome] = lidos if campo.get('multiplo', False) else (lidos[0] if lidos else None)
+        return valores, faltando
+
+    @staticmethod
+    def _ler(el, atributo):
+        # Resultados de XPath como '@href' ou 'text()' já são strings
+        if isinstance(el, str):
+            return str(el).strip()
+        if atributo == 'text':
+            return ' '.join(el.text_content().split())
+        if atributo == 'html':
+            return lxml_html.tostring(el, encoding='unicode')
+        return el.get(atributo)
+
+    def _estado(self, dominio):
+        with self._lock:
+            return self._dominios.setdefault(dominio, {
+                'decisao': None, 'decidido_em': None, 'http': 0, 'browser': 0, 'escaladas': 0, 'escaladas_seguidas': 0})
+
+    def _expirar(self, dominio):
+        """
+        Volta a testar o HTTP em um domínio cuja decisão 'browser' passou da validade.
+
+        Uma única escalada no novo teste basta para o domínio voltar ao navegador.
+        """
+        with self._lock:
+            estado = self._dominios[dominio]
+            if estado['decisao'] != 'browser' or time.time() - estado['decidido_em'] < self.validade_decisao:
+                return
+            estado['decisao'] = None
+            estado['escaladas_seguidas'] = LIMITE_ESCALADAS - 1
+        logger.info(f'Decisão do domínio {dominio} expirou; testando HTTP de novo.')
+    def _registrar(self, dominio, evento):
+        """
+        Atualiza os contadores do domínio e aprende a decisão HTTP/navegador.
+
+        Args:
+            dominio (str): Domínio da URL.
+            evento (str): 'http', 'escalada' ou 'browser'.
+        """
+        with self._lock:
+            estado = self._dominios[dominio]
+            anterior = estado['decisao']
+            if evento == 'http':
+                estado['http'] += 1
+                estado['escaladas_seguidas'] = 0
+                estado['decisao'] = 'http'
+            elif evento == 'escalada':
+                estado['escaladas'] += 1
+                estado['escaladas_seguidas'] += 1
+                if estado['escaladas_seguidas'] >= LIMITE_ESCALADAS:
+                    estado['decisao'] = 'browser'
+                    logger.info(f'Domínio {dominio} passará a ser buscado direto pelo navegador.')
+            else:
+                estado['browser'] += 1
+            mudou = estado['decisao'] != anterior
+            if mudou:
+                estado['decidido_em'] = time.time()
+        if mudou:
+            self._salvar()
+
+    def _salvar(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            decisoes = {d: {'decisao': e['decisao'], 'em': e['decidido_em']} for d, e in self._dominios.items() if e['decisao']}
+        with open(self.cache_path, 'w', encoding='utf-8') as file:
+            json.dump(decisoes, file, indent=2)
+
+    def estatisticas(self):
+        """
+        Retorna os contadores por domínio e a taxa de acerto do modo HTTP.
+
+        Returns:
+            dict: {'dominios': {...}, 'http': n, 'browser': n, 'hit_rate': fração de páginas servidas só por HTTP}.
+        """
+        with self._lock:
+            dominios = {d: dict(e) for d, e in self._dominios.items()}
+        http = sum(e['http'] for e in dominios.values())
+        browser = sum(e['browser'] for e in dominios.values())
+        total = http + browser
+        return {'dominios': dominios, 'http': http, 'browser': browser, 'hit_rate': http / total if total else 0.0}
+
+    def close(self):
+        """
+        Encerra a sessão HTTP. O WebDriver continua aberto.
+        """
+        self.session.close()
@@ -0,0 +1,561 @@
+"""
+Módulo com os fluxos declarativos em YAML.
+
+Um fluxo é uma lista de passos (navigate, fill, click, wait, extract, paginate,
+loop) escrita em YAML, sem código Python. O fluxo é validado uma única vez, ao
+ser carregado, e compilado em um plano de ações em que passos vizinhos são
+agrupados em uma só chamada ao navegador:
+
+    - fills seguidos viram um único fill_form (um script para todos os campos);
+    - fill seguido de click com 'no_script: true': o clique vai no mesmo script do
+      preenchimento, sem esperar o elemento ficar clicável (sem a opção, o click
+      continua sendo uma ação separada, que espera o botão habilitar ou aparecer);
+    - navigate seguido de wait: load_page com a política de prontidão 'selector';
+    - wait seguido de extract da mesma lista: o extract já espera as linhas;
+    - extracts de campos avulsos seguidos viram um único extract_fields;
+    - paginate cujo único passo é um extract de lista vira o extract paginado.
+
+Os valores em texto aceitam campos da entrada entre chaves ({termo}), e o fluxo
+é executado para cada entrada de uma lista, um arquivo ou uma fila do JobRunner.
+
+Exemplo (fluxos.yaml, ou a seção 'Fluxos' do config.yaml):
+
+    busca:
+      entradas: [termo]
+      metodo: css
+      passos:
+        - navigate: https://www.loja.com.br/
+        - fill: {'#busca': '{termo}'}
+        - click: '#buscar'
+        - wait: li.produto
+        - extract:
+            linha: li.produto
+            campos: {nome: h2, preco: .preco, link: [a, href]}
+            proxima: a.proxima
+            max_paginas: 3
+          salvar_em: produtos
+
+Uso:
+    python -m src.flows fluxos.yaml busca entradas.jsonl --workers 4 --saida produtos.jsonl
+    python -m src.flows fluxos.yaml busca --plano
+"""
+import argparse
+import json
+import string
+
+import yaml
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from driver.health import sessao_morta
+from iterator import scripts
+from iterator.selectors import validar
+from utils.logger_config import logger
+
+# Passos aceitos e as opções de cada um, além do valor principal
+PASSOS = {
+    'navigate': {'pronto', 'seletor', 'tempo', 'metodo'},
+    'fill': {'metodo', 'teclado', 'tempo'},
+    'click': {'metodo', 'tempo', 'no_script'},
+    'wait': {'metodo', 'tempo', 'estado'},
+    'extract': {'metodo', 'tempo', 'salvar_em'},
+    'paginate': {'metodo', 'tempo'},
+    'loop': set(),
+}
+CHAVES_EXTRACT = {'linha', 'campos', 'proxima', 'max_paginas'}
+CHAVES_PAGINATE = {'proxima', 'max_paginas', 'linhas', 'passos'}
+CHAVES_LOOP = {'sobre', 'como', 'passos'}
+POLITICAS_PRONTO = (None, 'domcontentloaded', 'selector', 'networkidle')
+
+_FORMATADOR = string.Formatter()
+
+
+def _campos_modelo(texto):
+    """
+    Retorna os nomes usados entre chaves em um texto de modelo.
+    """
+    if not isinstance(texto, str):
+        return set()
+    return {nome.split('.')[0].split('[')[0] for _, nome, _, _ in _FORMATADOR.parse(texto) if nome}
+
+
+def _preencher(valor, contexto):
+    """
+    Substitui os campos {nome} de um valor (texto, lista ou dicionário) pelos valores do contexto.
+    """
+    if isinstance(valor, str):
+        return valor.format_map(contexto) if '{' in valor else valor
+    if isinstance(valor, list):
+        return [_preencher(v, contexto) for v in valor]
+    if isinstance(valor, dict):
+        return {_preencher(k, contexto): _preencher(v, contexto) for k, v in valor.items()}
+    return valor
+
+
+class Acao:
+    """Ação do plano compilado, com os passos do YAML que a originaram."""
+
+    __slots__ = ('tipo', 'params', 'origem', 'passos')
+
+    def __init__(self, tipo, params, origem, passos=None):
+        self.tipo = tipo
+        self.params = params
+        self.origem = origem
+        self.passos = passos
+
+    def __repr__(self):
+        return f'Acao({self.tipo}, passos {self.origem})'
+
+    def descrever(self, nivel=0):
+        """
+        Descreve a ação e as ações internas, uma por linha.
+
+        Returns:
+            str: Descrição legível do plano.
+        """
+        origem = ', '.join(str(o) for o in self.origem)
+        linhas = [f"{'  ' * nivel}{self.tipo} <- passo(s) {origem}"]
+        for acao in self.passos or []:
+            linhas.append(acao.descrever(nivel + 1))
+        return '\n'.join(linhas)
+
+
+class Flow:
+    """Fluxo declarativo validado e compilado em um plano de ações."""
+
+    def __init__(self, nome, definicao):
+        """
+        Inicializa um objeto Flow, validando e compilando a definição.
+
+        Args:
+            nome (str): Nome do fluxo.
+            definicao (dict | list): Definição com 'passos' (e opcionalmente 'entradas', 'metodo' e 'tempo'),
+                ou diretamente a lista de passos.
+        """
+        if isinstance(definicao, list):
+            definicao = {'passos': definicao}
+        if not isinstance(definicao, dict):
+            raise ValueError(f"Fluxo '{nome}': a definição deve ser um mapeamento com 'passos'.")
+
+        self.nome = nome
+        self.entradas = definicao.get('entradas')
+        self.metodo = definicao.get('metodo', 'xpath')
+        self.tempo = definicao.get('tempo', 15)
+        self.passos = definicao.get('passos')
+
+        erros = []
+        desconhecidas = set(definicao) - {'entradas', 'metodo', 'tempo', 'passos'}
+        if desconhecidas:
+            erros.append(f"chaves desconhecidas: {', '.join(sorted(desconhecidas))}")
+        if not isinstance(self.passos, list) or not self.passos:
+            erros.append("'passos' deve ser uma lista não vazia")
+        else:
+            nomes = set(self.entradas) if self.entradas is not None else None
+            self._validar(self.passos, nomes, [], erros)
+        if erros:
+            raise ValueError(f"Fluxo '{nome}' inválido:\n  - " + '\n  - '.join(erros))
+
+        self.plano = self._compilar(self.passos, [])
+
+    # Validação
+
+    def _validar(self, passos, nomes, caminho, erros):
+        """
+        Valida uma lista de passos, acumulando as mensagens de erro.
+
+        Args:
+            passos (list): Passos do YAML.
+            nomes (set | None): Campos disponíveis para os modelos {nome}; None desliga a verificação.
+            caminho (list): Posição da lista de passos no fluxo, para as mensagens.
+            erros (list): Lista onde os erros são acumulados.
+        """
+        for i, passo in enumerate(passos, 1):
+            local = '.'.join(str(p) for p in caminho + [i])
+            if not isinstance(passo, dict):
+                erros.append(f'passo {local}: deve ser um mapeamento, recebido {passo!r}')
+                continue
+            acoes = [chave for chave in passo if chave in PASSOS]
+            if len(acoes) != 1:
+                erros.append(f"passo {local}: deve ter exatamente uma ação entre {', '.join(PASSOS)}")
+                continue
+            acao = acoes[0]
+            valor = passo[acao]
+            local = f'{local} ({acao})'
+            extras = set(passo) - {acao} - PASSOS[acao]
+            if extras:
+                erros.append(f"passo {local}: opções desconhecidas: {', '.join(sorted(extras))}")
+
+            metodo = passo.get('metodo', self.metodo)
+            if metodo not in ('xpath', 'css', 'id', 'name'):
+                erros.append(f"passo {local}: método '{metodo}' inválido")
+                continue
+
+            def seletor(texto, descricao='seletor'):
+                if not isinstance(texto, str) or not texto:
+                    erros.append(f'passo {local}: {descricao} deve ser um texto não vazio')
+                    return
+                modelo(texto)
+                if '{' not in texto and not texto.startswith('@') and metodo in ('xpath', 'css'):
+                    try:
+                        validar(texto, metodo, estrito=False)
+                    except ValueError as e:
+                        erros.append(f'passo {local}: {e}')
+
+            def modelo(texto):
+                if nomes is None:
+                    return
+                try:
+                    faltando = _campos_modelo(texto) - nomes
+                except ValueError as e:
+                    erros.append(f'passo {local}: modelo inválido {texto!r}: {e}')
+                    return
+                if faltando:
+                    erros.append(f"passo {local}: campos não declarados em 'entradas': {', '.join(sorted(faltando))}")
+
+            if acao == 'navigate':
+                if not isinstance(valor, str) or not valor:
+                    erros.append(f'passo {local}: a URL deve ser um texto não vazio')
+                else:
+                    modelo(valor)
+                if passo.get('pronto') not in POLITICAS_PRONTO:
+                    erros.append(f"passo {local}: pronto '{passo.get('pronto')}' inválido")
+                if passo.get('pronto') == 'selector':
+                    seletor(passo.get('seletor'), "'seletor' da política 'selector'")
+            elif acao == 'fill':
+                if not isinstance(valor, dict) or not valor:
+                    erros.append(f'passo {local}: deve ser um mapeamento seletor -> valor')
+                    continue
+                for campo, conteudo in valor.items():
+                    seletor(campo)
+                    for texto in conteudo if isinstance(conteudo, list) else [conteudo]:
+                        modelo(texto)
+                teclado = passo.get('teclado', [])
+                if not isinstance(teclado, list):
+                    erros.append(f"passo {local}: 'teclado' deve ser uma lista de seletores do preenchimento")
+                else:
+                    faltando = [campo for campo in teclado if not isinstance(campo, str) or campo not in valor]
+                    if faltando:
+                        erros.append(f"passo {local}: seletores de 'teclado' fora do preenchimento: "
+                                     f"{', '.join(map(str, faltando))}")
+            elif acao in ('click', 'wait'):
+                seletor(valor)
+                if not isinstance(passo.get('no_script', False), bool):
+                    erros.append(f"passo {local}: 'no_script' deve ser true ou false")
+            elif acao == 'extract':
+                self._validar_extract(valor, local, seletor, erros)
+            elif acao == 'paginate':
+                if not isinstance(valor, dict) or set(valor) - CHAVES_PAGINATE:
+                    erros.append(f"passo {local}: deve ser um mapeamento com {', '.join(sorted(CHAVES_PAGINATE))}")
+                    continue
+                seletor(valor.get('proxima'), "'proxima'")
+                if valor.get('linhas') is not None:
+                    seletor(valor['linhas'], "'linhas'")
+                if not isinstance(valor.get('passos'), list) or not valor['passos']:
+                    erros.append(f"passo {local}: 'passos' deve ser uma lista não vazia")
+                else:
+                    self._validar(valor['passos'], nomes, caminho + [i], erros)
+            elif acao == 'loop':
+                if not isinstance(valor, dict) or set(valor) - CHAVES_LOOP or not valor.get('sobre'):
+                    erros.append(f"passo {local}: deve ser um mapeamento com 'sobre', 'passos' e opcionalmente 'como'")
+                    continue
+                if nomes is not None and valor['sobre'] not in nomes:
+                    erros.append(f"passo {local}: '{valor['sobre']}' não declarado em 'entradas'")
+                if not isinstance(valor.get('passos'), list) or not valor['passos']:
+                    erros.append(f"passo {local}: 'passos' deve ser uma lista não vazia")
+                else:
+                    internos = None if nomes is None else nomes | {valor.get('como', 'item')}
+                    self._validar(valor['passos'], internos, caminho + [i], erros)
+
+    @staticmethod
+    def _validar_extract(valor, local, seletor, erros):
+        if not isinstance(valor, dict) or set(valor) - CHAVES_EXTRACT:
+            erros.append(f"passo {local}: deve ser um mapeamento com {', '.join(sorted(CHAVES_EXTRACT))}")
+            return
+        campos = valor.get('campos')
+        if not isinstance(campos, dict) or not campos:
+            erros.append(f"passo {local}: 'campos' deve ser um mapeamento não vazio")
+            return
+        if valor.get('linha') is not None:
+            seletor(valor['linha'], "'linha'")
+        elif valor.get('proxima') is not None:
+            erros.append(f"passo {local}: 'proxima' exige 'linha'")
+        if valor.get('proxima') is not None:
+            seletor(valor['proxima'], "'proxima'")
+        for nome, campo in campos.items():
+            if isinstance(campo, (list, tuple)):
+                if len(campo) != 2:
+                    erros.append(f"passo {local}: campo '{nome}' deve ser [seletor, atributo]")
+            elif isinstance(campo, dict):
+                if set(campo) - {'seletor', 'atributo', 'metodo', 'multiplo'}:
+                    erros.append(f"passo {local}: campo '{nome}' com chaves desconhecidas")
+            elif not isinstance(campo, str):
+                erros.append(f"passo {local}: campo '{nome}' deve ser seletor, [seletor, atributo] ou mapeamento")
+
+    # Compilação
+
+    def _compilar(self, passos, caminho):
+        """
+        Converte os passos em ações e agrupa as vizinhas que podem ir na mesma chamada.
+
+        Args:
+            passos (list): Passos já validados.
+            caminho (list): Posição da lista de passos no fluxo.
+
+        Returns:
+            list: Ações do plano.
+        """
+        plano = []
+        for i, passo in enumerate(passos, 1):
+            origem = ['.'.join(str(p) for p in caminho + [i])]
+            acao = next(chave for chave in passo if chave in PASSOS)
+            valor = passo[acao]
+            metodo = passo.get('metodo', self.metodo)
+            tempo = passo.get('tempo', self.tempo)
+            anterior = plano[-1] if plano else None
+
+            if acao == 'navigate':
+                plano.append(Acao('load_page', {'url': valor, 'pronto': passo.get('pronto'), 'seletor': passo.get('seletor'),
+                                                'metodo': metodo, 'tempo': passo.get('tempo', 30)}, origem))
+
+            elif acao == 'fill':
+                campos = {campo: {'valor': conteudo, 'metodo': metodo} for campo, conteudo in valor.items()}
+                for campo in passo.get('teclado', []):
+                    campos[campo]['teclado'] = True
+                if anterior is not None and anterior.tipo == 'fill_form' and anterior.params['clicar'] is None:
+                    anterior.params['campos'].update(campos)
+                    anterior.origem += origem
+                else:
+                    plano.append(Acao('fill_form', {'campos': campos, 'tempo': tempo, 'clicar': None, 'metodo': metodo}, origem))
+
+            elif acao == 'click':
+                # O clique no script do preenchimento não espera o elemento ficar clicável, então só é
+                # agrupado quando o passo pede
+                if (passo.get('no_script') and anterior is not None and anterior.tipo == 'fill_form'
+                        and anterior.params['clicar'] is None):
+                    anterior.params['clicar'] = valor
+                    anterior.params['metodo_clicar'] = metodo
+                    anterior.origem += origem
+                else:
+                    plano.append(Acao('click', {'tag': valor, 'metodo': metodo, 'tempo': tempo}, origem))
+
+            elif acao == 'wait':
+                estado = passo.get('estado', 'presence')
+                if (anterior is not None and anterior.tipo == 'load_page' and anterior.params['pronto'] is None
+                        and estado == 'presence'):
+                    anterior.params.update(pronto='selector', seletor=valor, metodo=metodo, tempo=max(anterior.params['tempo'], tempo))
+                    anterior.origem += origem
+                else:
+                    plano.append(Acao('wait_for', {'tag': valor, 'metodo': metodo, 'tempo': tempo, 'estado': estado}, origem))
+
+            elif acao == 'extract':
+                if valor.get('linha') is None:
+                    campos = {nome: self._com_metodo(campo, metodo) for nome, campo in valor['campos'].items()}
+                    if anterior is not None and anterior.tipo == 'extract_fields':
+                        anterior.params['campos'].update(campos)
+                        anterior.origem += origem
+                    else:
+                        plano.append(Acao('extract_fields', {'campos': campos}, origem))
+                    continue
+                if (anterior is not None and anterior.tipo == 'wait_for' and anterior.params['estado'] == 'presence'
+                        and anterior.params['tag'] == valor['linha'] and anterior.params['metodo'] == metodo):
+                    # O extract já espera as linhas estarem presentes
+                    plano.pop()
+                    origem = anterior.origem + origem
+                plano.append(Acao('extract', {
+                    'linha': valor['linha'], 'campos': valor['campos'], 'metodo': metodo, 'tempo': tempo,
+                    'proxima': valor.get('proxima'), 'max_paginas': valor.get('max_paginas'),
+                    'salvar_em': passo.get('salvar_em', 'itens')}, origem))
+
+            elif acao == 'paginate':
+                internos = self._compilar(valor['passos'], caminho + [i])
+                unico = internos[0] if len(internos) == 1 else None
+                if unico is not None and unico.tipo == 'extract' and unico.params['proxima'] is None:
+                    unico.params.update(proxima=valor['proxima'], max_paginas=valor.get('max_paginas'))
+                    unico.origem = origem + unico.origem
+                    plano.append(unico)
+                else:
+                    plano.append(Acao('paginate', {'proxima': valor['proxima'], 'max_paginas': valor.get('max_paginas'),
+                                                   'linhas': valor.get('linhas'), 'metodo': metodo, 'tempo': tempo},
+                                      origem, internos))
+
+            elif acao == 'loop':
+                plano.append(Acao('loop', {'sobre': valor['sobre'], 'como': valor.get('como', 'item')}, origem,
+                                  self._compilar(valor['passos'], caminho + [i])))
+        return plano
+
+    @staticmethod
+    def _com_metodo(campo, metodo):
+        """
+        Fixa o método do passo em um campo de extract_fields, para que extracts agrupados mantenham os seus.
+        """
+        if isinstance(campo, str):
+            return {'seletor': campo, 'metodo': metodo}
+        if isinstance(campo, (list, tuple)):
+            return {'seletor': campo[0], 'atributo': campo[1], 'metodo': metodo}
+        return {'metodo': metodo, **campo}
+
+    def descrever(self):
+        """
+        Descreve o plano compilado.
+
+        Returns:
+            str: Uma ação por linha, com os passos do YAML que ela cobre.
+        """
+        return '\n'.join(acao.descrever() for acao in self.plano)
+
+    # Execução
+
+    def executar(self, interacao, entrada=None):
+        """
+        Executa o fluxo para uma entrada.
+
+        Args:
+            interacao (Interation): Interação ligada ao navegador.
+            entrada (dict | str): Valores usados nos modelos {nome}; um valor que não é dicionário
+                fica disponível como {entrada} (padrão: None).
+
+        Returns:
+            dict: Campos extraídos com extract de campos avulsos e as listas dos extracts de linhas.
+        """
+        contexto = dict(entrada) if isinstance(entrada, dict) else {'entrada': entrada}
+        resultado = {}
+        self._executar_plano(interacao, self.plano, contexto, resultado)
+        return resultado
+
+    def __call__(self, interacao, entrada=None):
+        return self.executar(interacao, entrada)
+
+    def _executar_plano(self, interacao, plano, contexto, resultado):
+        for acao in plano:
+            p = acao.params
+            if acao.tipo == 'load_page':
+                interacao.load_page(_preencher(p['url'], contexto), pronto=p['pronto'], tempo=p['tempo'],
+                                    seletor=_preencher(p['seletor'], contexto), metodo=p['metodo'])
+            elif acao.tipo == 'fill_form':
+                interacao.fill_form(_preencher(p['campos'], contexto), tempo=p['tempo'],
+                                    clicar=_preencher(p['clicar'], contexto), metodo=p.get('metodo_clicar', p['metodo']))
+            elif acao.tipo == 'click':
+                interacao.click(_preencher(p['tag'], contexto), p['metodo'], p['tempo'])
+            elif acao.tipo == 'wait_for':
+                interacao.wait_for(_preencher(p['tag'], contexto), p['tempo'], p['metodo'], p['estado'])
+            elif acao.tipo == 'extract_fields':
+                resultado.update(interacao.extract_fields(_preencher(p['campos'], contexto)))
+            elif acao.tipo == 'extract':
+                registros = interacao.extract(_preencher(p['linha'], contexto), p['campos'], p['tempo'], p['metodo'],
+                                              proxima=p['proxima'], max_paginas=p['max_paginas'])
+                resultado.setdefault(p['salvar_em'], []).extend(registros)
+            elif acao.tipo == 'paginate':
+                self._paginar(interacao, acao, contexto, resultado)
+            elif acao.tipo == 'loop':
+                valores = contexto.get(p['sobre']) or []
+                for valor in valores if isinstance(valores, list) else [valores]:
+                    self._executar_plano(interacao, acao.passos, {**contexto, p['como']: valor}, resultado)
+
+    def _paginar(self, interacao, acao, contexto, resultado):
+        """
+        Executa as ações internas em cada página, clicando em 'proxima' até acabar ou atingir max_paginas.
+        """
+        p = acao.params
+        proxima = interacao.seletores.resolver(p['proxima'], p['metodo'])
+        linhas = interacao.seletores.resolver(p['linhas'], p['metodo']) if p['linhas'] else None
+
+        def assinatura(driver):
+            if linhas is not None:
+                return driver.execute_script(scripts.ASSINATURA_LINHAS, linhas.seletor, linhas.metodo)
+            return driver.execute_script('return location.href + document.body.innerHTML.length;')
+
+        pagina = 0
+        while True:
+            self._executar_plano(interacao, acao.passos, contexto, resultado)
+            pagina += 1
+            if p['max_paginas'] is not None and pagina >= p['max_paginas']:
+                return
+
+            anterior = assinatura(interacao.driver)
+            if not interacao.driver.execute_script(scripts.CLICAR_PROXIMA, proxima.seletor, proxima.metodo):
+                return
+            interacao.cache.invalidar()
+            try:
+                WebDriverWait(interacao.driver, p['tempo']).until(lambda d: assinatura(d) != anterior)
+            except TimeoutException:
+                return
+
+    def run(self, interacao, entradas, sink=None):
+        """
+        Executa o fluxo para cada entrada, na mesma sessão.
+
+        Falhas de uma entrada são registradas e a execução segue; se a sessão do navegador
+        morrer, a exceção é propagada.
+
+        Args:
+            interacao (Interation): Interação ligada ao navegador.
+            entradas (iterable): Entradas do fluxo.
+            sink (ResultSink): Onde gravar {'entrada', 'resultado', 'erro'} de cada entrada (padrão: None).
+
+        Yields:
+            tuple: (entrada, resultado, erro), com erro None em caso de sucesso.
+        """
+        for entrada in entradas:
+            resultado, erro = None, None
+            try:
+                resultado = self.executar(interacao, entrada)
+            except (WebDriverException, ValueError, KeyError) as e:
+                if sessao_morta(e):
+                    raise
+                erro = f'{type(e).__name__}: {e}'
+                logger.warning(f"Fluxo '{self.nome}' falhou para {entrada}: {erro}")
+            if sink is not None:
+                sink.write({'entrada': entrada, 'resultado': resultado, 'erro': erro})
+            yield entrada, resultado, erro
+
+
+def carregar_fluxos(origem):
+    """
+    Carrega, valida e compila os fluxos de um arquivo YAML ou de um dicionário.
+
+    O arquivo pode conter os fluxos no nível principal ou na seção 'Fluxos' (como no config.yaml).
+
+    Args:
+        origem (str | dict): Caminho do YAML ou mapeamento nome -> definição.
+
+    Returns:
+        dict: Mapeamento nome -> Flow.
+    """
+    if isinstance(origem, str):
+        with open(origem, 'r', encoding='utf-8') as file:
+            origem = yaml.safe_load(file) or {}
+    if 'Fluxos' in origem:
+        origem = origem['Fluxos'] or {}
+    return {nome: Flow(nome, definicao) for nome, definicao in origem.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Executa um fluxo declarativo em YAML para uma lista de entradas.')
+    parser.add_argument('arquivo', help='Arquivo YAML com os fluxos.')
+    parser.add_argument('fluxo', help='Nome do fluxo.')
+    parser.add_argument('entradas', nargs='?', help='Arquivo com uma entrada (objeto JSON ou texto) por linha.')
+    parser.add_argument('--plano', action='store_true', help='Mostra o plano compilado e sai.')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--saida', default='resultados.jsonl')
+    parser.add_argument('--checkpoint', help='Arquivo SQLite para retomar a execução de onde parou.')
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    fluxos = carregar_fluxos(args.arquivo)
+    if args.fluxo not in fluxos:
+        parser.error(f"Fluxo '{args.fluxo}' não encontrado. Disponíveis: {', '.join(fluxos)}.")
+    fluxo = fluxos[args.fluxo]
+    if args.plano or not args.entradas:
+        print(fluxo.descrever())
+        return
+
+    from src.runner import JobRunner, ler_tarefas
+
+    runner = JobRunner(tarefa=fluxo, workers=args.workers, saida=args.saida, checkpoint=args.checkpoint,
+                       browser=args.browser, headless=args.headless)
+    print(json.dumps(runner.run(ler_tarefas(args.entradas)), indent=2, ensure_ascii=False, default=str))
+
+
+if __name__ == '__main__':
+    main()
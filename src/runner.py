@@ -0,0 +1,329 @@
+"""
+Módulo com o executor de tarefas em paralelo.
+
+Distribui uma fila de URLs/tarefas entre vários navegadores, cada worker
+com o seu próprio WebDriver, e grava os resultados à medida que chegam.
+Com um checkpoint, o progresso fica salvo em SQLite e uma execução interrompida
+é retomada do ponto em que parou.
+
+Uso:
+    python -m src.runner urls.txt --workers 4 --modo thread --saida resultados.jsonl
+    python -m src.runner urls.txt --checkpoint execucao.db
+    python -m src.runner urls.txt --workers 8 --taxa 2 --sessoes-dominio 3
+"""
+import argparse
+import functools
+import json
+import multiprocessing
+import queue
+import threading
+import time
+
+from driver.driver import Driver
+from driver.health import sessao_morta, sessao_viva
+from iterator.iteration import Interation
+from src.checkpoint import Checkpoint
+from src.scheduler import DomainScheduler, LimiteDominio
+from src.sink import ResultSink
+from utils.logger_config import definir_contexto, logger
+
+_FIM = None
+
+# Intervalo, em segundos, entre as verificações de workers que morreram sem avisar
+INTERVALO_VERIFICACAO = 5
+
+
+def carregar_pagina(interacao: Interation, tarefa):
+    """
+    Tarefa padrão: carrega a página e retorna URL final e título.
+
+    Args:
+        interacao (Interation): Interação ligada ao navegador do worker.
+        tarefa (str | dict): URL ou dicionário com a chave 'url'.
+
+    Returns:
+        dict: URL final e título da página.
+    """
+    url = tarefa['url'] if isinstance(tarefa, dict) else tarefa
+    interacao.load_page(url)
+    return {'url': interacao.driver.current_url, 'titulo': interacao.driver.title}
+
+
+def ler_tarefas(caminho: str):
+    """
+    Lê as tarefas de um arquivo, uma por linha.
+
+    Linhas iniciadas com '{' são lidas como JSON; as demais como URL.
+    Linhas vazias e iniciadas com '#' são ignoradas.
+
+    Args:
+        caminho (str): Caminho do arquivo de tarefas.
+
+    Yields:
+        str | dict: Tarefa lida.
+    """
+    with open(caminho, 'r', encoding='utf-8') as file:
+        for linha in file:
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+            yield json.loads(linha) if linha.startswith('{') else linha
+
+
+def _worker(worker_id, entrada, saida, tarefa, tentativas, backoff, driver_kwargs, agendador=None):
+    """
+    Laço de um worker: cria um navegador e processa tarefas até receber o sinal de fim.
+
+    Args:
+        worker_id (int): Identificador do worker.
+        entrada: Fila de tarefas.
+        saida: Fila de resultados.
+        tarefa (callable): Função executada para cada item da fila.
+        tentativas (int): Número máximo de tentativas por item.
+        backoff (float): Base, em segundos, do atraso exponencial entre tentativas.
+        driver_kwargs (dict): Argumentos repassados para a classe Driver.
+        agendador (DomainScheduler): Agendador de acessos por domínio compartilhado (padrão: None).
+    """
+    definir_contexto(worker=worker_id)
+    inicio = time.perf_counter()
+    ocupado = 0.0
+    reinicios = 0
+    interacao = None
+
+    def encerrar(interacao):
+        try:
+            interacao.quit()
+        except Exception:
+            pass
+
+    try:
+        while True:
+            item = entrada.get()
+            if item is _FIM:
+                break
+
+            comeco = time.perf_counter()
+            resultado, erro = None, None
+            for tentativa in range(1, tentativas + 1):
+                try:
+                    if interacao is not None and not sessao_viva(interacao.driver):
+                        # Navegador caiu entre tarefas: reinicia sem esperar o timeout do próximo comando
+                        logger.warning(f'Worker {worker_id}: sessão do navegador perdida, reiniciando.')
+                        encerrar(interacao)
+                        interacao = None
+                        reinicios += 1
+                    if interacao is None:
+                        interacao = Interation(Driver(**driver_kwargs).driver, agendador=agendador)
+                    resultado = tarefa(interacao, item)
+                    erro = None
+                    break
+                except Exception as e:
+                    erro = f'{type(e).__name__}: {e}'
+                    logger.warning(f'Worker {worker_id}: tentativa {tentativa}/{tentativas} falhou para {item}: {erro}')
+                    if interacao is not None and (sessao_morta(e) or not sessao_viva(interacao.driver)):
+                        # Sessão morta: recria o navegador na próxima tentativa
+                        encerrar(interacao)
+                        interacao = None
+                        reinicios += 1
+                    if tentativa < tentativas:
+                        time.sleep(backoff * 2 ** (tentativa - 1))
+
+            duracao = time.perf_counter() - comeco
+            ocupado += duracao
+            saida.put(('resultado', worker_id, item, resultado, erro, duracao))
+    finally:
+        if interacao is not None:
+            encerrar(interacao)
+        saida.put(('fim', worker_id, ocupado, time.perf_counter() - inicio, reinicios))
+
+
+class JobRunner:
+    """Classe para executar tarefas em vários navegadores em paralelo."""
+
+    def __init__(self, tarefa=carregar_pagina, workers=2, modo='thread', tentativas=3, backoff=2.0, saida='resultados.jsonl',
+                 checkpoint=None, agendador=None, **driver_kwargs):
+        """
+        Inicializa um objeto JobRunner.
+
+        Args:
+            tarefa (callable): Função (interacao, item) -> resultado executada para cada item (padrão: carregar_pagina).
+                No modo 'process' deve ser definida no nível de módulo.
+            workers (int): Quantidade de navegadores em paralelo (padrão: 2).
+            modo (str): 'thread' ou 'process' (padrão: 'thread').
+            tentativas (int): Número máximo de tentativas por item (padrão: 3).
+            backoff (float): Base, em segundos, do atraso exponencial entre tentativas (padrão: 2.0).
+            saida (str | ResultSink): Arquivo onde os resultados são gravados, no formato da extensão
+                (.jsonl, .csv, .parquet, .db), ou um ResultSink já configurado (padrão: 'resultados.jsonl').
+            checkpoint (str | Checkpoint): Arquivo SQLite (ou objeto Checkpoint) com o progresso; tarefas já
+                concluídas em execuções anteriores são puladas. Uma tarefa só conta como concluída depois que o
+                seu resultado foi gravado na saída; se a execução cair entre as duas etapas, a tarefa é refeita
+                e a sua linha pode aparecer duas vezes (padrão: None).
+            agendador (DomainScheduler): Agendador que limita os acessos por domínio de todos os workers; no modo
+                'process' precisa de backend SQLite para os limites valerem entre os processos (padrão: None).
+            **driver_kwargs: Argumentos repassados para a classe Driver.
+        """
+        if modo not in ('thread', 'process'):
+            raise ValueError(f"Modo '{modo}' não suportado. Use 'thread' ou 'process'.")
+
+        self.tarefa = tarefa
+        self.workers = workers
+        self.modo = modo
+        self.tentativas = tentativas
+        self.backoff = backoff
+        self.saida = saida
+        self.checkpoint = Checkpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        self.agendador = agendador
+        self.driver_kwargs = driver_kwargs
+
+    def run(self, tarefas):
+        """
+        Executa todas as tarefas e grava os resultados incrementalmente.
+
+        Args:
+            tarefas (iterable): URLs ou dicionários de tarefa (lista, gerador, etc.).
+
+        Returns:
+            dict: Métricas da execução (sucessos, falhas, workers perdidos, páginas/min e utilização por worker).
+        """
+        if self.modo == 'process':
+            entrada, saida, executor = multiprocessing.Queue(self.workers * 2), multiprocessing.Queue(), multiprocessing.Process
+        else:
+            entrada, saida, executor = queue.Queue(self.workers * 2), queue.Queue(), threading.Thread
+
+        processos = [
+            executor(target=_worker, daemon=True,
+                     args=(i, entrada, saida, self.tarefa, self.tentativas, self.backoff, self.driver_kwargs, self.agendador))
+            for i in range(self.workers)
+        ]
+        for processo in processos:
+            processo.start()
+
+        inicio = time.perf_counter()
+        metricas = {'sucessos': 0, 'falhas': 0, 'workers': {}, 'workers_perdidos': 0}
+
+        # Alimenta a fila em uma thread separada para não travar a gravação dos resultados.
+        # Os sinais de fim são sempre enviados, mesmo se a leitura das tarefas falhar; a
+        # exceção é guardada e relançada por run() depois que os workers terminam.
+        falhas = []
+
+        def alimentar():
+            try:
+                pendentes = tarefas
+                if self.checkpoint is not None:
+                    self.checkpoint.adicionar(tarefas)
+                    metricas['ja_concluidas'] = self.checkpoint.resumo()['concluida']
+                    pendentes = self.checkpoint.pendentes()
+                    logger.info(f"Checkpoint: {metricas['ja_concluidas']} tarefas já concluídas serão puladas.")
+                for item in pendentes:
+                    entrada.put(item)
+            except BaseException as e:
+                logger.error(f'Falha ao ler as tarefas: {type(e).__name__}: {e}')
+                falhas.append(e)
+            finally:
+                for _ in processos:
+                    entrada.put(_FIM)
+
+        threading.Thread(target=alimentar, daemon=True).start()
+
+        finalizados = 0
+        suspeitos = set()
+        sink = self.saida if isinstance(self.saida, ResultSink) else ResultSink(self.saida)
+        try:
+            while finalizados < len(processos):
+                try:
+                    mensagem = saida.get(timeout=INTERVALO_VERIFICACAO)
+                except queue.Empty:
+                    # Um processo morto pelo sistema (falta de memória, segfault) nunca envia 'fim'
+                    for worker_id, processo in enumerate(processos):
+                        if worker_id in metricas['workers'] or processo.is_alive():
+                            continue
+                        if worker_id not in suspeitos:
+                            # O 'fim' pode ainda estar a caminho na fila: confirma na próxima verificação
+                            suspeitos.add(worker_id)
+                            continue
+                        logger.error(f'Worker {worker_id} terminou sem avisar (código de saída {processo.exitcode}); '
+                                     f'a tarefa que ele executava foi perdida.')
+                        metricas['workers'][worker_id] = {'tempo_ocupado': 0.0, 'utilizacao': 0.0, 'reinicios': 0,
+                                                          'codigo_saida': processo.exitcode}
+                        metricas['workers_perdidos'] += 1
+                        finalizados += 1
+                    continue
+                if mensagem[0] == 'fim':
+                    _, worker_id, ocupado, total, reinicios = mensagem
+                    metricas['workers'][worker_id] = {
+                        'tempo_ocupado': ocupado,
+                        'utilizacao': ocupado / total if total else 0.0,
+                        'reinicios': reinicios,
+                    }
+                    finalizados += 1
+                    continue
+
+                _, worker_id, item, resultado, erro, duracao = mensagem
+                metricas['sucessos' if erro is None else 'falhas'] += 1
+                ao_gravar = None
+                if self.checkpoint is not None:
+                    if erro is not None:
+                        self.checkpoint.falhar(item, erro)
+                    else:
+                        # A tarefa só é marcada como concluída depois que o lote com a sua linha foi
+                        # gravado; se a execução cair antes, ela é refeita na retomada
+                        ao_gravar = functools.partial(self.checkpoint.concluir, item, resultado)
+                sink.write({
+                    'tarefa': item,
+                    'worker': worker_id,
+                    'resultado': resultado,
+                    'erro': erro,
+                    'duracao': round(duracao, 3),
+                }, ao_gravar=ao_gravar)
+        finally:
+            sink.close()
+        metricas['saida'] = sink.metricas()
+        if self.agendador is not None:
+            metricas['dominios'] = self.agendador.metricas()
+
+        for processo in processos:
+            processo.join()
+        if falhas:
+            raise falhas[0]
+        if metricas['workers_perdidos'] == len(processos):
+            raise RuntimeError('Todos os workers terminaram inesperadamente; as tarefas restantes não foram executadas.')
+
+        decorrido = time.perf_counter() - inicio
+        metricas['tempo_total'] = decorrido
+        metricas['paginas_por_minuto'] = metricas['sucessos'] / (decorrido / 60) if decorrido else 0.0
+        logger.info(f"Execução concluída: {metricas['sucessos']} sucessos, {metricas['falhas']} falhas, "
+                    f"{metricas['paginas_por_minuto']:.1f} páginas/min.")
+        for worker_id, dados in sorted(metricas['workers'].items()):
+            logger.info(f"Worker {worker_id}: utilização de {dados['utilizacao']:.0%}.")
+        return metricas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Executa uma fila de URLs em vários navegadores em paralelo.')
+    parser.add_argument('arquivo', help='Arquivo com uma URL (ou objeto JSON) por linha.')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--modo', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--tentativas', type=int, default=3)
+    parser.add_argument('--backoff', type=float, default=2.0)
+    parser.add_argument('--saida', default='resultados.jsonl')
+    parser.add_argument('--checkpoint', help='Arquivo SQLite para retomar a execução de onde parou.')
+    parser.add_argument('--taxa', type=float, help='Requisições por segundo por domínio (liga o agendador).')
+    parser.add_argument('--sessoes-dominio', type=int, default=2, help='Sessões simultâneas por domínio.')
+    parser.add_argument('--agendador', help='Arquivo SQLite para compartilhar os limites entre processos.')
+    parser.add_argument('--browser', default='chrome')
+    parser.add_argument('--headless', action='store_true')
+    args = parser.parse_args()
+
+    agendador = None
+    if args.taxa or args.agendador:
+        limite = LimiteDominio(taxa=args.taxa or 1.0, max_sessoes=args.sessoes_dominio)
+        agendador = DomainScheduler(padrao=limite, backend=args.agendador)
+
+    runner = JobRunner(workers=args.workers, modo=args.modo, tentativas=args.tentativas,
+                       backoff=args.backoff, saida=args.saida, checkpoint=args.checkpoint, agendador=agendador,
+                       browser=args.browser, headless=args.headless)
+    runner.run(ler_tarefas(args.arquivo))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,499 @@
+"""
+Módulo com o agendador de acessos por domínio.
+
+Todas as sessões do processo pedem uma vaga ao agendador antes de carregar uma
+página. Cada domínio tem um balde de fichas (taxa de requisições por segundo
+com rajada) e um limite de sessões simultâneas; os pedidos de um domínio são
+atendidos por prioridade e, com o mesmo nível, por ordem de chegada. Respostas
+429/503 ou captchas reduzem a taxa do domínio pela metade e pausam os acessos;
+a taxa volta a subir aos poucos depois de uma sequência de sucessos.
+
+Com um arquivo SQLite como backend, o estado dos domínios é compartilhado entre
+processos (ex.: JobRunner no modo 'process'); as prioridades continuam valendo
+dentro de cada processo.
+"""
+import heapq
+import itertools
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from utils.logger_config import logger
+
+# Status HTTP tratados como pedido do servidor para desacelerar
+STATUS_LIMITE = (429, 503)
+
+
+class LimiteDominio:
+    """Limites de acesso de um domínio."""
+
+    __slots__ = ('taxa', 'rajada', 'max_sessoes')
+
+    def __init__(self, taxa=1.0, rajada=2, max_sessoes=2):
+        """
+        Inicializa um objeto LimiteDominio.
+
+        Args:
+            taxa (float): Requisições por segundo (padrão: 1.0).
+            rajada (int): Requisições permitidas de uma vez após um período ocioso (padrão: 2).
+            max_sessoes (int): Sessões carregando páginas do domínio ao mesmo tempo (padrão: 2).
+        """
+        self.taxa = taxa
+        self.rajada = max(1, rajada)
+        self.max_sessoes = max_sessoes
+
+    def __repr__(self):
+        return f'LimiteDominio(taxa={self.taxa}, rajada={self.rajada}, max_sessoes={self.max_sessoes})'
+
+
+def _tentar(estado, limite, agora):
+    """
+    Tenta consumir uma ficha do domínio.
+
+    Args:
+        estado (dict): Estado do domínio (tokens, atualizado, ativas, taxa, pausa_ate); alterado no lugar.
+        limite (LimiteDominio): Limites do domínio.
+        agora (float): Instante atual.
+
+    Returns:
+        float | None: 0 se a vaga foi obtida, segundos até a próxima ficha, ou None se o limite
+        de sessões simultâneas foi atingido.
+    """
+    if agora < estado['pausa_ate']:
+        return estado['pausa_ate'] - agora
+    if estado['ativas'] >= limite.max_sessoes:
+        return None
+    estado['tokens'] = min(limite.rajada, estado['tokens'] + (agora - estado['atualizado']) * estado['taxa'])
+    estado['atualizado'] = agora
+    if estado['tokens'] < 1:
+        return (1 - estado['tokens']) / estado['taxa']
+    estado['tokens'] -= 1
+    estado['ativas'] += 1
+    return 0
+
+
+def _novo_estado(limite, agora):
+    return {'tokens': float(limite.rajada), 'atualizado': agora, 'ativas': 0, 'taxa': limite.taxa,
+            'pausa_ate': 0.0, 'sucessos': 0}
+
+
+class _EstadoMemoria:
+    """Estado dos domínios em memória, para as sessões de um processo."""
+
+    relogio = staticmethod(time.monotonic)
+
+    def __init__(self):
+        self._estados = {}
+
+    def tentar(self, dominio, limite):
+        agora = self.relogio()
+        estado = self._estados.setdefault(dominio, _novo_estado(limite, agora))
+        return _tentar(estado, limite, agora)
+
+    def liberar(self, dominio):
+        estado = self._estados[dominio]
+        estado['ativas'] = max(0, estado['ativas'] - 1)
+
+    def ajustar(self, dominio, limite, funcao):
+        agora = self.relogio()
+        funcao(self._estados.setdefault(dominio, _novo_estado(limite, agora)), agora)
+
+    def estado(self, dominio):
+        return dict(self._estados.get(dominio, {}))
+
+
+class _EstadoSQLite:
+    """Estado dos domínios em SQLite, compartilhado entre processos.
+
+    As vagas ocupadas são registradas com prazo de validade, para que um processo que morreu
+    segurando vagas não bloqueie o domínio para sempre.
+    """
+
+    relogio = staticmethod(time.time)
+
+    _ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS dominios (
+        dominio TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        atualizado REAL NOT NULL,
+        taxa REAL NOT NULL,
+        pausa_ate REAL NOT NULL,
+        sucessos INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS vagas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dominio TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        expira REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS vagas_dominio ON vagas (dominio, expira);
+    """
+
+    def __init__(self, caminho, validade=300):
+        """
+        Args:
+            caminho (str): Arquivo SQLite compartilhado.
+            validade (float): Tempo máximo, em segundos, que uma vaga fica ocupada sem ser liberada.
+        """
+        self.caminho = caminho
+        self.validade = validade
+        self._local = threading.local()
+        self._vagas = {}
+        with self._conexao() as conexao:
+            conexao.executescript(self._ESQUEMA)
+
+    def __getstate__(self):
+        return {'caminho': self.caminho, 'validade': self.validade}
+
+    def __setstate__(self, estado):
+        self.__init__(estado['caminho'], estado['validade'])
+
+    def _conexao(self):
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            self._local.conexao = conexao
+        return conexao
+
+    @contextmanager
+    def _transacao(self):
+        conexao = self._conexao()
+        conexao.execute('BEGIN IMMEDIATE')
+        try:
+            yield conexao
+            conexao.execute('COMMIT')
+        except BaseException:
+            conexao.execute('ROLLBACK')
+            raise
+
+    def _ler(self, conexao, dominio, limite, agora):
+        linha = conexao.execute('SELECT tokens, atualizado, taxa, pausa_ate, sucessos FROM dominios WHERE dominio = ?',
+                                (dominio,)).fetchone()
+        estado = _novo_estado(limite, agora)
+        if linha is not None:
+            estado.update(zip(('tokens', 'atualizado', 'taxa', 'pausa_ate', 'sucessos'), linha))
+        estado['ativas'] = conexao.execute('SELECT COUNT(*) FROM vagas WHERE dominio = ? AND expira > ?',
+                                           (dominio, agora)).fetchone()[0]
+        return estado
+
+    def _gravar(self, conexao, dominio, estado):
+        conexao.execute('INSERT OR REPLACE INTO dominios (dominio, tokens, atualizado, taxa, pausa_ate, sucessos) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        (dominio, estado['tokens'], estado['atualizado'], estado['taxa'], estado['pausa_ate'], estado['sucessos']))
+
+    def tentar(self, dominio, limite):
+        agora = self.relogio()
+        with self._transacao() as conexao:
+            estado = self._ler(conexao, dominio, limite, agora)
+            espera = _tentar(estado, limite, agora)
+            self._gravar(conexao, dominio, estado)
+            if espera == 0:
+                cursor = conexao.execute('INSERT INTO vagas (dominio, pid, expira) VALUES (?, ?, ?)',
+                                         (dominio, os.getpid(), agora + self.validade))
+                self._vagas.setdefault(dominio, []).append(cursor.lastrowid)
+        return espera
+
+    def liberar(self, dominio):
+        vagas = self._vagas.get(dominio)
+        if not vagas:
+            return
+        with self._transacao() as conexao:
+            conexao.execute('DELETE FROM vagas WHERE id = ?', (vagas.pop(),))
+
+    def ajustar(self, dominio, limite, funcao):
+        agora = self.relogio()
+        with self._transacao() as conexao:
+            estado = self._ler(conexao, dominio, limite, agora)
+            funcao(estado, agora)
+            self._gravar(conexao, dominio, estado)
+
+    def estado(self, dominio):
+        with self._transacao() as conexao:
+            return self._ler(conexao, dominio, LimiteDominio(), self.relogio())
+
+
+class DomainScheduler:
+    """Agendador de acessos por domínio compartilhado pelas sessões."""
+
+    def __init__(self, limites=None, padrao=None, backend=None, reducao=0.5, taxa_minima=0.05, pausa=5.0,
+                 recuperar_apos=20, intervalo=0.05):
+        """
+        Inicializa um objeto DomainScheduler.
+
+        Exemplo de uso:
+            agendador = DomainScheduler({'loja.com.br': LimiteDominio(taxa=2, max_sessoes=4)}, backend='agendador.db')
+            bot = Interation(driver, agendador=agendador)
+            bot.load_page('https://www.loja.com.br/produtos', prioridade=10)
+
+        Args:
+            limites (dict): Limites por domínio, compartilhados com os seus subdomínios (padrão: None).
+            padrao (LimiteDominio): Limites dos domínios não listados (padrão: None, LimiteDominio()).
+            backend (str): Arquivo SQLite para compartilhar o estado entre processos (padrão: None, em memória).
+            reducao (float): Fator aplicado à taxa do domínio a cada penalização (padrão: 0.5).
+            taxa_minima (float): Menor taxa, em requisições por segundo, após as reduções (padrão: 0.05).
+            pausa (float): Pausa mínima, em segundos, dos acessos ao domínio após uma penalização (padrão: 5.0).
+            recuperar_apos (int): Sucessos seguidos para a taxa subir um passo de volta ao limite (padrão: 20).
+            intervalo (float): Intervalo máximo entre verificações de vaga, em segundos (padrão: 0.05).
+        """
+        self.limites = dict(limites or {})
+        self.padrao = padrao or LimiteDominio()
+        self.backend = backend
+        self.reducao = reducao
+        self.taxa_minima = taxa_minima
+        self.pausa = pausa
+        self.recuperar_apos = recuperar_apos
+        self.intervalo = intervalo
+        self._iniciar()
+
+    def _iniciar(self):
+        self._estados = _EstadoSQLite(self.backend) if self.backend else _EstadoMemoria()
+        self._condicao = threading.Condition()
+        self._filas = {}
+        self._sequencia = itertools.count()
+        self._metricas = {}
+
+    def __getstate__(self):
+        # Travas e filas não atravessam processos; o estado compartilhado fica no backend
+        if not self.backend:
+            logger.warning('DomainScheduler sem backend copiado para outro processo: os limites não serão compartilhados.')
+        return {chave: valor for chave, valor in self.__dict__.items()
+                if chave not in ('_estados', '_condicao', '_filas', '_sequencia', '_metricas')}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._iniciar()
+
+    def dominio(self, url):
+        """
+        Retorna o domínio que controla os acessos a uma URL.
+
+        Se a URL pertencer a um domínio configurado em `limites` (ou a um subdomínio dele), é esse
+        domínio; senão, o host da URL sem 'www.'.
+
+        Args:
+            url (str): URL da página.
+
+        Returns:
+            str: Domínio.
+        """
+        host = (urlparse(url).hostname or '').lower()
+        partes = host.split('.')
+        for i in range(len(partes)):
+            if '.'.join(partes[i:]) in self.limites:
+                return '.'.join(partes[i:])
+        return host[4:] if host.startswith('www.') else host
+
+    def limite(self, dominio):
+        """
+        Retorna os limites de um domínio.
+
+        Args:
+            dominio (str): Domínio retornado por dominio().
+
+        Returns:
+            LimiteDominio: Limites aplicados.
+        """
+        return self.limites.get(dominio, self.padrao)
+
+    def _metrica(self, dominio):
+        return self._metricas.setdefault(dominio, {'requisicoes': 0, 'penalizacoes': 0, 'falhas': 0,
+                                                   'esperas': deque(maxlen=1000), 'espera_total': 0.0})
+
+    def adquirir(self, url, prioridade=0, timeout=None):
+        """
+        Espera uma vaga para acessar o domínio da URL.
+
+        Args:
+            url (str): URL que será carregada.
+            prioridade (int): Pedidos de maior prioridade do mesmo domínio são atendidos antes (padrão: 0).
+            timeout (float): Tempo máximo de espera em segundos (padrão: None, espera indefinidamente).
+
+        Returns:
+            str: Domínio reservado, a ser passado para liberar().
+        """
+        dominio = self.dominio(url)
+        limite = self.limite(dominio)
+        inicio = time.monotonic()
+        pedido = (-prioridade, next(self._sequencia))
+
+        with self._condicao:
+            fila = self._filas.setdefault(dominio, [])
+            heapq.heappush(fila, pedido)
+            try:
+                while True:
+                    if fila[0] == pedido:
+                        espera = self._estados.tentar(dominio, limite)
+                        if espera == 0:
+                            break
+                    else:
+                        espera = None
+                    restante = None if timeout is None else timeout - (time.monotonic() - inicio)
+                    if restante is not None and restante <= 0:
+                        raise TimeoutError(f"Sem vaga para '{dominio}' em {timeout} segundos.")
+                    if espera is None and self.backend:
+                        # Vagas liberadas por outros processos não notificam a condição
+                        espera = self.intervalo
+                    if restante is not None:
+                        espera = restante if espera is None else min(espera, restante)
+                    self._condicao.wait(espera)
+            finally:
+                fila.remove(pedido)
+                heapq.heapify(fila)
+                self._condicao.notify_all()
+
+            decorrido = time.monotonic() - inicio
+            metrica = self._metrica(dominio)
+            metrica['requisicoes'] += 1
+            metrica['esperas'].append(decorrido)
+            metrica['espera_total'] += decorrido
+        return dominio
+
+    def liberar(self, dominio):
+        """
+        Libera a vaga obtida em adquirir().
+
+        Args:
+            dominio (str): Domínio retornado por adquirir().
+        """
+        with self._condicao:
+            self._estados.liberar(dominio)
+            self._condicao.notify_all()
+
+    @contextmanager
+    def reservar(self, url, prioridade=0, timeout=None):
+        """
+        Ocupa uma vaga do domínio durante o bloco with.
+
+        Args:
+            url (str): URL que será carregada.
+            prioridade (int): Prioridade do pedido (padrão: 0).
+            timeout (float): Tempo máximo de espera em segundos (padrão: None).
+
+        Yields:
+            str: Domínio reservado.
+        """
+        dominio = self.adquirir(url, prioridade, timeout)
+        try:
+            yield dominio
+        finally:
+            self.liberar(dominio)
+
+    def penalizar(self, url, motivo='', retry_after=None):
+        """
+        Reduz a taxa do domínio e pausa os acessos após um bloqueio (429/503/captcha).
+
+        Args:
+            url (str): URL que recebeu o bloqueio.
+            motivo (str): Descrição do bloqueio, para o log (padrão: '').
+            retry_after (float): Pausa pedida pelo servidor em segundos (padrão: None, usa a pausa configurada).
+        """
+        dominio = self.dominio(url)
+        limite = self.limite(dominio)
+
+        def reduzir(estado, agora):
+            estado['taxa'] = max(self.taxa_minima, estado['taxa'] * self.reducao)
+            estado['tokens'] = 0.0
+            estado['sucessos'] = 0
+            estado['pausa_ate'] = max(estado['pausa_ate'], agora + max(retry_after or 0, self.pausa))
+
+        with self._condicao:
+            self._estados.ajustar(dominio, limite, reduzir)
+            self._metrica(dominio)['penalizacoes'] += 1
+        logger.warning(f"Domínio '{dominio}' desacelerado ({motivo or 'bloqueio'}): "
+                       f"taxa {self._estados.estado(dominio).get('taxa', 0):.2f} req/s.")
+
+    def sucesso(self, url):
+        """
+        Registra um acesso bem-sucedido; após uma sequência de sucessos a taxa sobe em direção ao limite.
+
+        Args:
+            url (str): URL carregada.
+        """
+        dominio = self.dominio(url)
+        limite = self.limite(dominio)
+
+        def recuperar(estado, _):
+            if estado['taxa'] >= limite.taxa:
+                return
+            estado['sucessos'] += 1
+            if estado['sucessos'] >= self.recuperar_apos:
+                estado['taxa'] = min(limite.taxa, estado['taxa'] + limite.taxa * 0.1)
+                estado['sucessos'] = 0
+
+        with self._condicao:
+            self._estados.ajustar(dominio, limite, recuperar)
+
+    def registrar(self, url, status=None, captcha=False, erro=False):
+        """
+        Registra o resultado de um acesso, penalizando o domínio em 429/503 ou captcha.
+
+        Args:
+            url (str): URL carregada.
+            status (int): Status HTTP da resposta, se conhecido (padrão: None).
+            captcha (bool): Se a página exibiu captcha ou desafio anti-bot (padrão: False).
+            erro (bool): Se o carregamento falhou (timeout, erro de navegação); sem bloqueio identificado,
+                a falha é contada nas métricas mas não conta como sucesso (padrão: False).
+
+        Returns:
+            bool: True se o acesso foi tratado como bloqueio.
+        """
+        if captcha or status in STATUS_LIMITE:
+            self.penalizar(url, 'captcha' if captcha else f'status {status}')
+            return True
+        if erro:
+            with self._condicao:
+                self._metrica(self.dominio(url))['falhas'] += 1
+            return False
+        self.sucesso(url)
+        return False
+
+    def metricas(self):
+        """
+        Retorna as estatísticas por domínio.
+
+        Returns:
+            dict: Por domínio: requisições, penalizações, falhas de carregamento, espera média, p95 e máxima na fila (s),
+            taxa atual (req/s), vagas ocupadas e pedidos aguardando.
+        """
+        resultado = {}
+        with self._condicao:
+            for dominio, metrica in self._metricas.items():
+                esperas = sorted(metrica['esperas'])
+                estado = self._estados.estado(dominio)
+                resultado[dominio] = {
+                    'requisicoes': metrica['requisicoes'],
+                    'penalizacoes': metrica['penalizacoes'],
+                    'falhas': metrica['falhas'],
+                    'espera_media': metrica['espera_total'] / metrica['requisicoes'] if metrica['requisicoes'] else 0.0,
+                    'espera_p95': esperas[int(0.95 * (len(esperas) - 1))] if esperas else 0.0,
+                    'espera_max': esperas[-1] if esperas else 0.0,
+                    'espera_mediana': statistics.median(esperas) if esperas else 0.0,
+                    'taxa': estado.get('taxa'),
+                    'ativas': estado.get('ativas', 0),
+                    'na_fila': len(self._filas.get(dominio, [])),
+                }
+        return resultado
+
+
+_agendador = None
+_lock = threading.Lock()
+
+
+def agendador_padrao():
+    """
+    Retorna o agendador compartilhado pelas sessões do processo, criado no primeiro uso.
+
+    Returns:
+        DomainScheduler: Agendador com os limites padrão.
+    """
+    global _agendador
+    with _lock:
+        if _agendador is None:
+            _agendador = DomainScheduler()
+        return _agendador
@@ -0,0 +1,388 @@
+"""
+Módulo com a gravação contínua dos resultados coletados.
+
+Os bots chamam sink.write(registro) à medida que extraem os dados; os registros
+vão para uma fila limitada e uma thread de fundo os grava em lotes (JSON-lines,
+CSV, Parquet ou SQLite), sem acumular tudo em memória e sem perder o que já foi
+coletado se a execução cair. Quando a gravação não acompanha a coleta, a fila
+enche e write() passa a bloquear (back-pressure) em vez de crescer sem limite.
+"""
+import csv
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from utils.logger_config import logger
+
+_FIM = None
+
+
+def _valor_simples(valor):
+    """
+    Converte listas e dicionários em texto JSON para formatos tabulares.
+    """
+    if isinstance(valor, (dict, list, tuple)):
+        return json.dumps(valor, ensure_ascii=False, default=str)
+    return valor
+
+
+class EscritorJSONL:
+    """Grava os registros em JSON-lines."""
+
+    extensao = '.jsonl'
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._file = open(caminho, 'a', encoding='utf-8')
+
+    def escrever(self, registros):
+        self._file.write(''.join(json.dumps(r, ensure_ascii=False, default=str) + '\n' for r in registros))
+        self._file.flush()
+
+    def tamanho(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class EscritorCSV:
+    """
+    Grava os registros em CSV; as colunas são as chaves do primeiro registro do arquivo.
+
+    Chaves que aparecem só em registros posteriores não cabem no cabeçalho já gravado:
+    são ignoradas, com um aviso por coluna.
+    """
+
+    extensao = '.csv'
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        self._file = open(caminho, 'a', encoding='utf-8', newline='')
+        self._writer = None
+        self._ignoradas = set()
+        if not novo:
+            with open(caminho, 'r', encoding='utf-8', newline='') as file:
+                colunas = next(csv.reader(file), [])
+            self._writer = csv.DictWriter(self._file, colunas, extrasaction='ignore')
+
+    def escrever(self, registros):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, list(registros[0]), extrasaction='ignore')
+            self._writer.writeheader()
+        novas = {c for r in registros for c in r} - set(self._writer.fieldnames) - self._ignoradas
+        if novas:
+            self._ignoradas |= novas
+            logger.warning(f"CSV: colunas fora do cabeçalho de {self.caminho} serão ignoradas: {', '.join(sorted(novas))}")
+        self._writer.writerows({k: _valor_simples(v) for k, v in r.items()} for r in registros)
+        self._file.flush()
+
+    def tamanho(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class EscritorParquet:
+    """
+    Grava os registros em Parquet, um row group por lote (requer pyarrow).
+
+    Um arquivo Parquet não aceita acréscimos: se o arquivo já existir (por exemplo, ao retomar
+    uma execução pelo checkpoint), a gravação segue em uma nova parte, 'nome.part1.parquet',
+    'nome.part2.parquet', etc., sem apagar as linhas já gravadas.
+    """
+
+    extensao = '.parquet'
+
+    def __init__(self, caminho):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("O formato 'parquet' requer o pacote pyarrow (pip install pyarrow).")
+        self._pa = pyarrow
+        base, extensao = os.path.splitext(caminho)
+        parte = 0
+        while os.path.exists(caminho) and os.path.getsize(caminho) > 0:
+            parte += 1
+            caminho = f'{base}.part{parte}{extensao}'
+        if parte:
+            logger.info(f'{base}{extensao} já existe; gravando em {caminho}')
+        self.caminho = caminho
+        self._writer = None
+        self._schema = None
+        self._texto = []
+        self._ignoradas = set()
+
+    def escrever(self, registros):
+        pa = self._pa
+        linhas = [{k: _valor_simples(v) for k, v in r.items()} for r in registros]
+        if self._writer is None:
+            # O schema do arquivo é fixado no primeiro lote; colunas só com None (como 'erro'
+            # antes da primeira falha) viram texto, em vez do tipo null do pyarrow
+            schema = pa.Table.from_pylist(linhas).schema
+            self._schema = pa.schema([pa.field(c.name, pa.string()) if pa.types.is_null(c.type) else c for c in schema])
+            self._texto = [c.name for c in self._schema if pa.types.is_string(c.type)]
+            self._writer = pa.parquet.ParquetWriter(self.caminho, self._schema)
+
+        novas = {c for linha in linhas for c in linha} - set(self._schema.names) - self._ignoradas
+        if novas:
+            self._ignoradas |= novas
+            logger.warning(f"Parquet: colunas fora do schema do primeiro lote serão ignoradas: {', '.join(sorted(novas))}")
+        for linha in linhas:
+            for coluna in self._texto:
+                valor = linha.get(coluna)
+                if valor is not None and not isinstance(valor, str):
+                    linha[coluna] = str(valor)
+        self._writer.write_table(pa.Table.from_pylist(linhas, schema=self._schema))
+
+    def tamanho(self):
+        return os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class EscritorSQLite:
+    """Grava os registros em uma tabela SQLite com inserções em lote; colunas novas são adicionadas."""
+
+    extensao = '.db'
+
+    def __init__(self, caminho, tabela='resultados'):
+        self.caminho = caminho
+        self.tabela = tabela
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._colunas = [linha[1] for linha in self._conexao.execute(f'PRAGMA table_info("{tabela}")')]
+
+    def _garantir_colunas(self, registros):
+        novas = []
+        for registro in registros:
+            novas.extend(c for c in registro if c not in self._colunas and c not in novas)
+        if not novas:
+            return
+        if not self._colunas:
+            colunas = ', '.join(f'"{c}"' for c in novas)
+            self._conexao.execute(f'CREATE TABLE "{self.tabela}" ({colunas})')
+        else:
+            for coluna in novas:
+                self._conexao.execute(f'ALTER TABLE "{self.tabela}" ADD COLUMN "{coluna}"')
+        self._colunas.extend(novas)
+
+    def escrever(self, registros):
+        with self._conexao:
+            self._garantir_colunas(registros)
+            colunas = ', '.join(f'"{c}"' for c in self._colunas)
+            self._conexao.executemany(
+                f'INSERT INTO "{self.tabela}" ({colunas}) VALUES ({", ".join("?" * len(self._colunas))})',
+                [tuple(_valor_simples(r.get(c)) for c in self._colunas) for r in registros])
+
+    def tamanho(self):
+        return os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+
+    def close(self):
+        self._conexao.close()
+
+
+FORMATOS = {
+    'jsonl': EscritorJSONL,
+    'csv': EscritorCSV,
+    'parquet': EscritorParquet,
+    'sqlite': EscritorSQLite,
+}
+
+# Extensões reconhecidas quando o formato não é informado
+EXTENSOES = {'.jsonl': 'jsonl', '.json': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.parquet': 'parquet',
+             '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite'}
+
+
+class ResultSink:
+    """Gravação em lotes, em uma thread de fundo, dos registros coletados."""
+
+    def __init__(self, caminho, formato=None, lote=500, intervalo=1.0, max_fila=10000, rotacionar_mb=None):
+        """
+        Inicializa um objeto ResultSink.
+
+        Exemplo de uso:
+            with ResultSink('produtos.csv', rotacionar_mb=100) as sink:
+                for produto in bot.harvest('li.produto', campos):
+                    sink.write(produto)
+
+        Args:
+            caminho (str): Arquivo de saída.
+            formato (str): 'jsonl', 'csv', 'parquet' ou 'sqlite' (padrão: None, deduzido da extensão).
+            lote (int): Registros gravados de uma vez (padrão: 500).
+            intervalo (float): Tempo máximo, em segundos, que um registro espera na fila antes de ser gravado
+                mesmo com o lote incompleto (padrão: 1.0).
+            max_fila (int): Registros pendentes aceitos antes de write() bloquear (padrão: 10000).
+            rotacionar_mb (float): Tamanho do arquivo, em MB, a partir do qual um novo arquivo numerado
+                é iniciado (padrão: None, sem rotação).
+        """
+        base, extensao = os.path.splitext(caminho)
+        formato = formato or EXTENSOES.get(extensao.lower())
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de saída '{formato}' inválido. Opções: {', '.join(FORMATOS)}.")
+
+        self.caminho = caminho
+        self.formato = formato
+        self.lote = lote
+        self.intervalo = intervalo
+        self.limite_rotacao = int(rotacionar_mb * 1024 * 1024) if rotacionar_mb else None
+        self.arquivos = []
+        self._base, self._extensao = base, extensao or FORMATOS[formato].extensao
+
+        self._fila = queue.Queue(max_fila)
+        self._erro = None
+        self._trava = threading.Lock()
+        self._metricas = {'registros': 0, 'lotes': 0, 'tempo_escrita': 0.0, 'tempo_bloqueado': 0.0, 'bloqueios': 0}
+        self._inicio = time.perf_counter()
+        self._escritor = self._abrir(caminho)
+        self._thread = threading.Thread(target=self._gravar, name='result-sink', daemon=True)
+        self._thread.start()
+
+    def _abrir(self, caminho):
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        escritor = FORMATOS[self.formato](caminho)
+        self.arquivos.append(escritor.caminho)
+        return escritor
+
+    def _rotacionar(self):
+        """
+        Fecha o arquivo atual e passa a gravar no próximo arquivo numerado.
+        """
+        self._escritor.close()
+        caminho = f'{self._base}-{len(self.arquivos):04d}{self._extensao}'
+        logger.info(f'Saída rotacionada para {caminho}')
+        self._escritor = self._abrir(caminho)
+
+    def write(self, registro, timeout=None, ao_gravar=None):
+        """
+        Enfileira um registro para gravação; bloqueia se a fila estiver cheia.
+
+        Args:
+            registro (dict): Registro a gravar.
+            timeout (float): Tempo máximo de bloqueio em segundos (padrão: None, espera indefinidamente).
+            ao_gravar (callable): Função sem argumentos chamada pela thread de gravação depois que o lote
+                com o registro foi gravado no arquivo; não é chamada se a gravação falhar (padrão: None).
+        """
+        if self._erro is not None:
+            raise RuntimeError('A gravação dos resultados falhou.') from self._erro
+        item = (registro, ao_gravar)
+        try:
+            self._fila.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        inicio = time.perf_counter()
+        self._fila.put(item, timeout=timeout)
+        with self._trava:
+            self._metricas['bloqueios'] += 1
+            self._metricas['tempo_bloqueado'] += time.perf_counter() - inicio
+
+    def write_many(self, registros):
+        """
+        Enfileira vários registros para gravação.
+
+        Args:
+            registros (iterable): Registros a gravar.
+        """
+        for registro in registros:
+            self.write(registro)
+
+    def _gravar(self):
+        """
+        Laço da thread de gravação: junta os registros em lotes e grava.
+        """
+        fim = False
+        while not fim:
+            pendentes = []
+            primeiro = self._fila.get()
+            if primeiro is _FIM:
+                fim = True
+            else:
+                pendentes.append(primeiro)
+                limite = time.perf_counter() + self.intervalo
+                while len(pendentes) < self.lote:
+                    restante = limite - time.perf_counter()
+                    try:
+                        registro = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    if registro is _FIM:
+                        fim = True
+                        break
+                    pendentes.append(registro)
+
+            if pendentes and self._erro is None:
+                try:
+                    inicio = time.perf_counter()
+                    self._escritor.escrever([registro for registro, _ in pendentes])
+                    if self.limite_rotacao and self._escritor.tamanho() >= self.limite_rotacao:
+                        self._rotacionar()
+                    with self._trava:
+                        self._metricas['registros'] += len(pendentes)
+                        self._metricas['lotes'] += 1
+                        self._metricas['tempo_escrita'] += time.perf_counter() - inicio
+                except Exception as e:
+                    logger.error(f'Falha ao gravar {len(pendentes)} registros em {self._escritor.caminho}: {e}')
+                    self._erro = e
+                else:
+                    for _, ao_gravar in pendentes:
+                        if ao_gravar is None:
+                            continue
+                        try:
+                            ao_gravar()
+                        except Exception as e:
+                            logger.error(f'Falha no retorno de gravação: {type(e).__name__}: {e}')
+
+            for _ in range(len(pendentes) + fim):
+                self._fila.task_done()
+
+    def flush(self):
+        """
+        Espera até que todos os registros enfileirados tenham sido gravados.
+        """
+        self._fila.join()
+        if self._erro is not None:
+            raise RuntimeError('A gravação dos resultados falhou.') from self._erro
+
+    def metricas(self):
+        """
+        Retorna as métricas de gravação.
+
+        Returns:
+            dict: Registros e lotes gravados, registros/s, tempo de escrita, bloqueios por back-pressure,
+            tempo bloqueado, registros pendentes na fila e arquivos gerados.
+        """
+        with self._trava:
+            metricas = dict(self._metricas)
+        decorrido = time.perf_counter() - self._inicio
+        metricas['registros_por_segundo'] = metricas['registros'] / decorrido if decorrido else 0.0
+        metricas['pendentes'] = self._fila.qsize()
+        metricas['arquivos'] = list(self.arquivos)
+        return metricas
+
+    def close(self):
+        """
+        Grava os registros pendentes e fecha o arquivo.
+        """
+        if not self._thread.is_alive():
+            return
+        self._fila.put(_FIM)
+        self._thread.join()
+        self._escritor.close()
+        if self._erro is not None:
+            raise RuntimeError('A gravação dos resultados falhou.') from self._erro
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
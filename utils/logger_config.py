@@ -1,55 +1,271 @@
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import time
+from datetime import datetime
+
 import colorlog
 
-def setup_logger(log_file="app.log"):
+# Campos de contexto (ex.: sessão, worker) anexados a cada registro da thread/tarefa atual
+_contexto = contextvars.ContextVar('contexto_log', default={})
+
+_listener = None
+
+
+def definir_contexto(**campos):
+    """
+    Define campos de contexto para os logs da thread/tarefa atual.
+
+    Exemplo de uso:
+        definir_contexto(worker=3, sessao=driver.session_id)
+    """
+    _contexto.set({**_contexto.get(), **campos})
+
+
+def limpar_contexto():
+    """Remove os campos de contexto da thread/tarefa atual."""
+    _contexto.set({})
+
+
+class _ContextoFilter(logging.Filter):
+    """Copia o contexto atual para o registro, na thread que gerou o log."""
+
+    def filter(self, record):
+        record.contexto = _contexto.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como uma linha JSON."""
+
+    def format(self, record):
+        dados = {
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        dados.update(getattr(record, 'contexto', {}))
+        if record.exc_info:
+            dados['exception'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class _LoteMixin:
+    """Grava os registros em lote: flush a cada N registros ou T segundos."""
+
+    def _iniciar_lote(self, lote, intervalo):
+        self.lote = lote
+        self.intervalo = intervalo
+        self._pendentes = 0
+        self._ultimo_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.flush()
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._pendentes += 1
+            if self._pendentes >= self.lote or time.monotonic() - self._ultimo_flush >= self.intervalo:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        super().flush()
+        self._pendentes = 0
+        self._ultimo_flush = time.monotonic()
+
+
+class BatchRotatingFileHandler(_LoteMixin, logging.handlers.RotatingFileHandler):
+    """Arquivo com rotação por tamanho e gravação em lote."""
+
+    def __init__(self, filename, max_bytes=0, backup_count=0, lote=100, intervalo=1.0, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self._iniciar_lote(lote, intervalo)
+
+
+class BatchTimedRotatingFileHandler(_LoteMixin, logging.handlers.TimedRotatingFileHandler):
+    """Arquivo com rotação por tempo e gravação em lote."""
+
+    def __init__(self, filename, when='midnight', backup_count=0, lote=100, intervalo=1.0, encoding='utf-8'):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding=encoding, delay=True)
+        self._iniciar_lote(lote, intervalo)
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """QueueListener que descarrega os lotes pendentes sempre que a fila esvazia."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block=False)
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block=block)
+
+
+def setup_logger(log_file="app.log", modo='queue', json_lines=False, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 rotacao_tempo=None, lote=100, intervalo_flush=1.0, console=True):
     """
     Configura o logger para registrar logs coloridos no console
     e em um arquivo de log.
+
+    Args:
+        log_file (str): Arquivo de log; None desativa o arquivo (padrão: 'app.log').
+        modo (str): 'queue' grava em uma thread em segundo plano; 'sync' grava na thread que gerou o log (padrão: 'queue').
+        json_lines (bool): Grava o arquivo em JSON-lines, com os campos de contexto (padrão: False).
+        max_bytes (int): Tamanho máximo do arquivo antes da rotação; 0 desativa (padrão: 10 MB).
+        backup_count (int): Quantidade de arquivos rotacionados mantidos (padrão: 5).
+        rotacao_tempo (str): Rotação por tempo ('midnight', 'H', ...) no lugar da rotação por tamanho (padrão: None).
+        lote (int): Registros acumulados antes de gravar no disco (padrão: 100).
+        intervalo_flush (float): Tempo máximo, em segundos, entre gravações no disco (padrão: 1.0).
+        console (bool): Exibe os logs no console (padrão: True).
     """
-    
+    global _listener
+
     logger = logging.getLogger("logger")
     logger.setLevel(logging.DEBUG)
 
     # Evita duplicação de logs ao remover handlers existentes
+    antigos = list(logger.handlers)
+    if _listener is not None:
+        _listener.stop()
+        antigos += _listener.handlers
+        _listener = None
     if logger.hasHandlers():
         logger.handlers.clear()
+    for handler in antigos:
+        handler.close()
 
     # Evita propagação para o root logger
     logger.propagate = False
 
-    # Cria um handler para registrar em arquivo (sem cores)
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%d/%m/%Y %H:%M:%S'
-    )
-
-    file_handler.setFormatter(file_formatter)
-
-    # Cria um handler para exibir no console (com cores)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-
-    # Define as cores para cada nível de log usando colorlog
-    color_formatter = colorlog.ColoredFormatter(
-        "%(asctime)s - %(log_color)s%(levelname)s - %(message)s",
-        datefmt='%d/%m/%Y %H:%M:%S',
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'bold_red',
-        }
-    )
-    console_handler.setFormatter(color_formatter)
+    handlers = []
+
+    if log_file:
+        # Cria um handler para registrar em arquivo (sem cores)
+        if rotacao_tempo:
+            file_handler = BatchTimedRotatingFileHandler(log_file, rotacao_tempo, backup_count, lote, intervalo_flush)
+        else:
+            file_handler = BatchRotatingFileHandler(log_file, max_bytes, backup_count, lote, intervalo_flush)
+        file_handler.setLevel(logging.DEBUG)
+
+        if json_lines:
+            file_formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(levelname)s - %(message)s',
+                datefmt='%d/%m/%Y %H:%M:%S'
+            )
+
+        file_handler.setFormatter(file_formatter)
+        handlers.append(file_handler)
+
+    if console:
+        # Cria um handler para exibir no console (com cores)
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
 
-    # Adiciona os handlers ao logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+        # Define as cores para cada nível de log usando colorlog
+        color_formatter = colorlog.ColoredFormatter(
+            "%(asctime)s - %(log_color)s%(levelname)s - %(message)s",
+            datefmt='%d/%m/%Y %H:%M:%S',
+            log_colors={
+                'DEBUG': 'cyan',
+                'INFO': 'green',
+                'WARNING': 'yellow',
+                'ERROR': 'red',
+                'CRITICAL': 'bold_red',
+            }
+        )
+        console_handler.setFormatter(color_formatter)
+        handlers.append(console_handler)
+
+    if modo == 'queue':
+        # A thread que gerou o log só coloca o registro na fila; a gravação fica com o listener
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(_ContextoFilter())
+        logger.addHandler(queue_handler)
+        _listener = _QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    elif modo == 'sync':
+        for handler in handlers:
+            handler.addFilter(_ContextoFilter())
+            logger.addHandler(handler)
+    else:
+        raise ValueError(f"Modo de log '{modo}' inválido. Use 'queue' ou 'sync'.")
 
     return logger
 
-logger = setup_logger()
+
+def encerrar_logger():
+    """
+    Para a thread de gravação e descarrega os registros pendentes.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in logging.getLogger("logger").handlers:
+        handler.flush()
+
+
+def _antes_do_fork():
+    """
+    Descarrega os lotes pendentes, para o processo filho não herdar (e regravar) o buffer do pai.
+    """
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.flush()
+
+
+def _depois_do_fork_no_filho():
+    """
+    Passa o processo filho para o modo síncrono.
+
+    A thread do listener não sobrevive ao fork: sem isso, os registros do filho iriam para
+    uma fila que ninguém lê, acumulando em memória. Os lotes passam a ser gravados a cada
+    registro, porque os processos do multiprocessing terminam sem rodar o atexit.
+    """
+    global _listener
+    if _listener is None:
+        return
+    handlers, _listener = _listener.handlers, None
+    logger = logging.getLogger("logger")
+    logger.handlers.clear()
+    for handler in handlers:
+        if isinstance(handler, _LoteMixin):
+            handler.lote = 1
+        handler.addFilter(_ContextoFilter())
+        logger.addHandler(handler)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_antes_do_fork, after_in_child=_depois_do_fork_no_filho)
+
+
+class _ConfiguracaoPreguicosa(logging.Handler):
+    """Configura o logger com os padrões no primeiro registro, caso setup_logger não tenha sido chamado."""
+
+    def emit(self, record):
+        configurado = logging.getLogger("logger")
+        if self in configurado.handlers:
+            setup_logger()
+        configurado.handle(record)
+
+
+atexit.register(encerrar_logger)
+
+logger = logging.getLogger("logger")
+logger.setLevel(logging.DEBUG)
+logger.propagate = False
+if not logger.handlers:
+    logger.addHandler(_ConfiguracaoPreguicosa())